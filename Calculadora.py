@@ -1,150 +1,33 @@
 import ttkbootstrap as tb
 from ttkbootstrap.constants import *
 import math
-import json 
-import ast  
 from tkinter import messagebox, Toplevel, Text, Scrollbar, Listbox
 from tkinter import filedialog  
-import pdf_export
 import param_parser             
-
-# -------------------------------------------------------------------
-# Funções de Cálculo (Lógica Matemática - Inalterada)
-# ... (Todo o seu bloco de funções de mm1_rho a mm1k_Wq) ...
-# ----- M/M/1 -----
-def mm1_rho(lambd, mu):
-    return lambd / mu
-def mm1_p0(lambd, mu):
-    return 1 - (lambd / mu)
-def mm1_pn(lambd, mu, n):
-    rho = lambd / mu
-    return (1 - rho) * (rho ** n)
-def mm1_L(lambd, mu):
-    rho = lambd / mu
-    return rho / (1 - rho)
-def mm1_Lq(lambd, mu):
-    rho = lambd / mu
-    return (rho ** 2) / (1 - rho)
-def mm1_W(lambd, mu):
-    return 1.0 / (mu - lambd)
-def mm1_Wq(lambd, mu):
-    rho = lambd / mu
-    return rho / (mu - lambd)
-
-# ----- M/M/c -----
-def mmc_rho(lambd, mu, c):
-    return lambd / (c * mu)
-def mmc_p0(lambd, mu, c):
-    a = lambd / mu
-    rho_s = mmc_rho(lambd, mu, c)
-    if rho_s >= 1: return 0.0
-    sum_part = sum((a ** n) / math.factorial(n) for n in range(c))
-    last_part = (a ** c) / (math.factorial(c) * (1 - rho_s))
-    return 1.0 / (sum_part + last_part)
-def mmc_erlangC(lambd, mu, c):
-    a = lambd / mu
-    rho_s = mmc_rho(lambd, mu, c)
-    if rho_s >= 1: return 1.0
-    p0 = mmc_p0(lambd, mu, c)
-    numerator = (a ** c) / (math.factorial(c) * (1 - rho_s))
-    return numerator * p0
-def mmc_Lq(lambd, mu, c):
-    a = lambd / mu
-    rho_s = mmc_rho(lambd, mu, c)
-    if rho_s >= 1: return float('inf')
-    p0 = mmc_p0(lambd, mu, c)
-    numerator = (a ** c) * rho_s
-    denominator = math.factorial(c) * ((1 - rho_s) ** 2)
-    return (numerator / denominator) * p0
-def mmc_L(lambd, mu, c):
-    lq = mmc_Lq(lambd, mu, c)
-    return lq + (lambd / mu)
-def mmc_Wq(lambd, mu, c):
-    lq = mmc_Lq(lambd, mu, c)
-    return lq / lambd if lambd > 0 else float('inf')
-def mmc_W(lambd, mu, c):
-    wq = mmc_Wq(lambd, mu, c)
-    return wq + (1.0 / mu)
-
-# ----- M/M/∞ -----
-def mminf_rho(lambd, mu):
-    return lambd / mu
-def mminf_p0(lambd, mu):
-    a = lambd / mu
-    return math.exp(-a)
-def mminf_pn(lambd, mu, n):
-    a = lambd / mu
-    return math.exp(-a) * (a ** n) / math.factorial(n)
-def mminf_L(lambd, mu):
-    return lambd / mu
-def mminf_W(lambd, mu):
-    return 1.0 / mu
-
-# ----- M/M/1/K -----
-def mm1k_rho(lambd, mu):
-    return lambd / mu
-def mm1k_p0(lambd, mu, k):
-    rho = lambd / mu
-    if abs(rho - 1.0) < 1e-9:
-        return 1.0 / (k + 1)
-    else:
-        return (1 - rho) / (1 - rho ** (k + 1))
-def mm1k_pn(lambd, mu, k, n):
-    if n > k: return 0.0
-    rho = lambd / mu
-    p0 = mm1k_p0(lambd, mu, k)
-    return p0 * (rho ** n)
-def mm1k_pk(lambd, mu, k):
-    return mm1k_pn(lambd, mu, k, k)
-def mm1k_lambda_eff(lambd, mu, k):
-    pk = mm1k_pk(lambd, mu, k)
-    return lambd * (1 - pk)
-def mm1k_L(lambd, mu, k):
-    rho = lambd / mu
-    if abs(rho - 1.0) < 1e-9:
-        return k / 2.0
-    term1 = (1 - (k + 1) * (rho ** k) + k * (rho ** (k + 1)))
-    term2 = (1 - rho) * (1 - rho ** (k + 1))
-    return rho * (term1 / term2)
-def mm1k_Lq(lambd, mu, k):
-    L = mm1k_L(lambd, mu, k)
-    p0 = mm1k_p0(lambd, mu, k)
-    return L - (1 - p0)
-def mm1k_W(lambd, mu, k):
-    L = mm1k_L(lambd, mu, k)
-    lambda_eff = mm1k_lambda_eff(lambd, mu, k)
-    return L / lambda_eff if lambda_eff > 0 else float('inf')
-def mm1k_Wq(lambd, mu, k):
-    Lq = mm1k_Lq(lambd, mu, k)
-    lambda_eff = mm1k_lambda_eff(lambd, mu, k)
-    return Lq / lambda_eff if lambda_eff > 0 else float('inf')
-# -------------------------------------------------------------------
-
-# -------------------------------------------------------------------
-# Gerenciamento de Fórmulas Customizadas
-# -------------------------------------------------------------------
-CUSTOM_FORMULAS_FILE = "custom_formulas.json"
-ALLOWED_MATH = [
-    'log', 'log10', 'exp', 'sqrt', 'pow', 'factorial', 
-    'sin', 'cos', 'tan', 'asin', 'acos', 'atan', 
-    'pi', 'e'
-]
-ALLOWED_PARAMS = ['lambd', 'mu', 'c', 'k', 'n']
-
-def load_custom_formulas():
-    try:
-        with open(CUSTOM_FORMULAS_FILE, 'r') as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return []
-
-def save_custom_formulas(formulas):
+# A matemática e o motor de fórmulas vivem em 'queue_metrics' (sem GUI).
+# Os nomes são reexportados aqui para quem ainda importa de Calculadora.
+from queue_metrics.models import *  # mm1_*, mmc_*, ..., MODELS_CONFIG, solve_model
+from queue_metrics import formulas
+from queue_metrics.cache import cached_solve_model
+from queue_metrics.tasks import BackgroundTask
+from queue_metrics.dependencies import metric_rows, affected_rows, formula_row_id
+from queue_metrics.optimizer import program_for
+from queue_metrics.formulas import (
+    CUSTOM_FORMULAS_FILE, ALLOWED_MATH, ALLOWED_PARAMS, load_custom_formulas,
+)
+
+def save_custom_formulas(custom_formulas):
     try:
-        with open(CUSTOM_FORMULAS_FILE, 'w') as f:
-            json.dump(formulas, f, indent=4)
+        formulas.save_custom_formulas(custom_formulas)
     except IOError as e:
         messagebox.showerror("Erro ao Salvar", f"Não foi possível salvar as fórmulas: {e}")
 
+# Intervalo (ms) com que a GUI consulta a fila da tarefa em segundo plano.
+POLL_INTERVAL_MS = 50
+# Espera (ms) após a última digitação antes do recálculo automático.
+LIVE_DEBOUNCE_MS = 300
+COMPARISON_MODEL = "Comparativo (M/M/1 vs M/M/∞)"
+
 # -------------------------------------------------------------------
 # Textos de Ajuda (Parâmetros)
 # -------------------------------------------------------------------
@@ -167,81 +50,14 @@ PARAM_HELP_TEXT = {
               "* Exemplo: Se K = 10, o 11º cliente é rejeitado (perdido).",
     "n":      "Definição: Número de Clientes (n)\n\n"
               "Um valor inteiro usado para calcular P(n): a probabilidade de haver *exatamente* 'n' clientes no sistema em um dado momento.\n\n"
-              "* Exemplo: Se n = 5, você calculará P(5)."
-}
-
-# -------------------------------------------------------------------
-# Configuração dos Modelos
-# -------------------------------------------------------------------
-MODELS_CONFIG = {
-    "M/M/1": {
-        "params": {"lambda": "Taxa de Chegada (λ)", "mu": "Taxa de Serviço (μ)"},
-        "optional_params": {"n": "Valor de n para P(n)"},
-        "functions": [
-            ("ρ (Utilização)", mm1_rho, ["lambda", "mu"]),
-            ("P₀ (Prob. sistema vazio)", mm1_p0, ["lambda", "mu"]),
-            ("P(n) (Prob. de n clientes)", mm1_pn, ["lambda", "mu", "n"]),
-            ("L (Nº médio no sistema)", mm1_L, ["lambda", "mu"]),
-            ("Lq (Nº médio na fila)", mm1_Lq, ["lambda", "mu"]),
-            ("W (Tempo médio no sistema)", mm1_W, ["lambda", "mu"]),
-            ("Wq (Tempo médio na fila)", mm1_Wq, ["lambda", "mu"]),
-        ]
-    },
-    "M/M/c": {
-        "params": {"lambda": "Taxa de Chegada (λ)", "mu": "Taxa de Serviço (μ)", "c": "Nº de Servidores (c)"},
-        "optional_params": {},
-        "functions": [
-            ("ρ (Utilização por servidor)", mmc_rho, ["lambda", "mu", "c"]),
-            ("P₀ (Prob. sistema vazio)", mmc_p0, ["lambda", "mu", "c"]),
-            ("C(c, a) (Prob. de esperar / Erlang C)", mmc_erlangC, ["lambda", "mu", "c"]),
-            ("L (Nº médio no sistema)", mmc_L, ["lambda", "mu", "c"]),
-            ("Lq (Nº médio na fila)", mmc_Lq, ["lambda", "mu", "c"]),
-            ("W (Tempo médio no sistema)", mmc_W, ["lambda", "mu", "c"]),
-            ("Wq (Tempo médio na fila)", mmc_Wq, ["lambda", "mu", "c"]),
-        ]
-    },
-    "M/M/∞": {
-        "params": {"lambda": "Taxa de Chegada (λ)", "mu": "Taxa de Serviço (μ)"},
-        "optional_params": {"n": "Valor de n para P(n)"},
-        "functions": [
-            ("a = λ/μ (Intensidade de tráfego)", mminf_rho, ["lambda", "mu"]),
-            ("P₀ (Prob. sistema vazio)", mminf_p0, ["lambda", "mu"]),
-            ("P(n) (Prob. de n clientes)", mminf_pn, ["lambda", "mu", "n"]),
-            ("L (Nº médio no sistema)", mminf_L, ["lambda", "mu"]),
-            ("W (Tempo médio no sistema)", mminf_W, ["lambda", "mu"]),
-        ]
-    },
-    "M/M/1/K": {
-        "params": {"lambda": "Taxa de Chegada (λ)", "mu": "Taxa de Serviço (μ)", "k": "Capacidade do Sistema (K)"},
-        "optional_params": {"n": "Valor de n para P(n)"},
-        "functions": [
-            ("ρ = λ/μ (Intensidade de tráfego)", mm1k_rho, ["lambda", "mu"]),
-            ("P₀ (Prob. sistema vazio)", mm1k_p0, ["lambda", "mu", "k"]),
-            ("Pₖ (Prob. de perda/bloqueio)", mm1k_pk, ["lambda", "mu", "k"]),
-            ("P(n) (Prob. de n clientes)", mm1k_pn, ["lambda", "mu", "k", "n"]),
-            ("λ' (Taxa de chegada efetiva)", mm1k_lambda_eff, ["lambda", "mu", "k"]),
-            ("L (Nº médio no sistema)", mm1k_L, ["lambda", "mu", "k"]),
-            ("Lq (Nº médio na fila)", mm1k_Lq, ["lambda", "mu", "k"]),
-            ("W (Tempo médio no sistema)", mm1k_W, ["lambda", "mu", "k"]),
-            ("Wq (Tempo médio na fila)", mm1k_Wq, ["lambda", "mu", "k"]),
-        ]
-    },
-    "Comparativo (M/M/1 vs M/M/∞)": {
-        "params": {"lambda": "Taxa de Chegada (λ)", "mu": "Taxa de Serviço (μ)"},
-        "optional_params": {},
-        "functions": [] 
-    },
-    "Personalizado": {
-        "params": {}, 
-        "optional_params": {
-            "lambd": "Taxa de Chegada (λ) [use 'lambd']", 
-            "mu": "Taxa de Serviço (μ)", 
-            "c": "Nº de Servidores (c)",
-            "k": "Capacidade (K)",
-            "n": "Valor de n"
-        },
-        "functions": []
-    }
+              "* Exemplo: Se n = 5, você calculará P(5).",
+    "cs":     "Definição: Coeficiente de Variação do Serviço (cs)\n\n"
+              "É o desvio padrão do tempo de serviço dividido pela sua média (pode ser 0).\n\n"
+              "* cs = 0: serviço constante (determinístico); cs = 1: serviço exponencial.\n"
+              "* Se você tem o segundo momento E[S²]: cs² = μ² * E[S²] - 1.",
+    "ca":     "Definição: Coeficiente de Variação das Chegadas (ca)\n\n"
+              "É o desvio padrão do intervalo entre chegadas dividido pela sua média (pode ser 0).\n\n"
+              "* ca = 1: chegadas de Poisson; ca < 1: chegadas mais regulares (ex: agendadas)."
 }
 
 # -------------------------------------------------------------------
@@ -310,7 +126,7 @@ class AddFormulaWindow(Toplevel):
         
         super().__init__(parent)
         self.title("Adicionar Nova Fórmula Personalizada")
-        self.geometry("500x350")
+        self.geometry("500x380")
         self.transient(parent)
         self.grab_set()
         self.resizable(False, False)
@@ -332,7 +148,9 @@ class AddFormulaWindow(Toplevel):
         self.entry_expr = tb.Entry(frame, bootstyle="primary")
         self.entry_expr.grid(row=3, column=1, sticky="ew", padx=5, pady=15)
         
-        example_text = "Ex: (lambd / mu) / (1 - (lambd / mu))"
+        example_text = ("Ex: (lambd / mu) / (1 - (lambd / mu))\n"
+                        "Pode usar as métricas " + ", ".join(formulas.METRIC_NAMES) +
+                        " e outras fórmulas pelo nome (ex: c * 50 + Wq * lambd * 20)")
         tb.Label(frame, text=example_text, bootstyle="secondary", wraplength=300).grid(row=4, column=1, sticky="w", padx=5)
 
         save_button = tb.Button(frame, text="Validar e Salvar", command=self._save_formula, bootstyle="success")
@@ -350,38 +168,6 @@ class AddFormulaWindow(Toplevel):
         self.geometry(f'+{x}+{y}')
         self.wait_window(self)
 
-    def _validate_expression(self, expression, param_list):
-        """Valida a expressão matemática usando AST."""
-        try:
-            tree = ast.parse(expression, mode='eval')
-        except SyntaxError as e:
-            raise ValueError(f"Erro de sintaxe na expressão: {e}")
-
-        allowed_names = set(param_list) | set(ALLOWED_MATH)
-        
-        allowed_nodes = {
-            ast.Expression, ast.Call, ast.Name, ast.Load,
-            ast.BinOp, ast.UnaryOp, ast.Compare,
-            ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Mod, ast.Pow,
-            ast.USub, ast.UAdd,
-            ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE,
-            ast.Constant 
-        }
-
-        for node in ast.walk(tree):
-            if type(node) not in allowed_nodes:
-                raise ValueError(f"Operação não permitida: {type(node).__name__}")
-            
-            if isinstance(node, ast.Name):
-                if node.id not in allowed_names:
-                    raise ValueError(f"Nome não permitido: '{node.id}'")
-            
-            if isinstance(node, ast.Call):
-                if not isinstance(node.func, ast.Name) or node.func.id not in allowed_names:
-                    raise ValueError(f"Função não permitida: '{getattr(node.func, 'id', 'N/A')}'")
-        return True
-
-
     def _save_formula(self):
         name = self.entry_name.get().strip()
         params_str = self.entry_params.get().strip()
@@ -395,6 +181,9 @@ class AddFormulaWindow(Toplevel):
         if name in existing_names:
             messagebox.showerror("Erro", f"Uma fórmula com o nome '{name}' já existe.", parent=self)
             return
+        if name in formulas.RESERVED_NAMES:
+            messagebox.showerror("Erro", f"O nome '{name}' é reservado (parâmetro, função ou métrica).", parent=self)
+            return
 
         params_list = [p.strip() for p in params_str.split(',') if p.strip()]
         
@@ -403,8 +192,11 @@ class AddFormulaWindow(Toplevel):
                 messagebox.showerror("Erro", f"Parâmetro não permitido: '{p}'.\nPermitidos: {', '.join(ALLOWED_PARAMS)}", parent=self)
                 return
 
+        # Outras fórmulas só podem ser usadas pelo nome se ele for um identificador válido.
+        referable = sorted(n for n in existing_names if formulas.is_referenceable(n))
         try:
-            self._validate_expression(expr, params_list)
+            formulas.validate_expression(expr, params_list + list(formulas.METRIC_NAMES) + referable)
+            formulas.compile_expression(expr, tuple(referable))
         except ValueError as e:
             messagebox.showerror("Erro de Validação", f"Expressão inválida: {e}", parent=self)
             return
@@ -414,6 +206,12 @@ class AddFormulaWindow(Toplevel):
             "params": params_list,
             "expr": expr
         }
+
+        try:
+            formulas.check_references(self.app.custom_formulas + [new_formula])
+        except ValueError as e:
+            messagebox.showerror("Erro de Validação", str(e), parent=self)
+            return
         
         self.app.custom_formulas.append(new_formula)
         save_custom_formulas(self.app.custom_formulas)
@@ -495,6 +293,13 @@ class ManageFormulasWindow(Toplevel):
         selected_index = selected_indices[0]
         selected_name = self.listbox.get(selected_index)
         
+        references = formulas.formula_references(self.app.custom_formulas)
+        dependents = [label for label, refs in references.items() if selected_name in refs and label != selected_name]
+        if dependents:
+            messagebox.showerror("Erro", f"A fórmula '{selected_name}' é usada por: {', '.join(dependents)}.\n"
+                                         "Delete essas fórmulas antes.", parent=self)
+            return
+
         if not messagebox.askyesno("Confirmar", f"Tem certeza que quer deletar a fórmula '{selected_name}'?", parent=self):
             return
             
@@ -522,7 +327,12 @@ class QueueingCalculatorApp:
         self.root.minsize(700, 700) 
         
         self.param_widgets = {}
+        self.param_vars = {}
+        self.task = None  # BackgroundTask em andamento (cálculo ou exportação)
+        self.last_inputs = None  # Parâmetros dos valores exibidos na tabela (None = nenhum)
+        self.live_after = None  # Recálculo automático agendado (id do root.after)
         self.custom_formulas = load_custom_formulas() 
+        formulas.compile_formulas(self.custom_formulas)
         
         self._create_widgets()
 
@@ -574,8 +384,20 @@ class QueueingCalculatorApp:
         formula_btn_frame.grid_remove() 
         self.formula_btn_frame = formula_btn_frame 
 
-        calc_button = tb.Button(input_frame, text="Calcular Todas as Métricas", command=self._calculate_metrics, bootstyle="success")
-        calc_button.grid(row=5, column=0, columnspan=3, pady=(10, 5), sticky="ew") # Era 4
+        self.calc_button = tb.Button(input_frame, text="Calcular Todas as Métricas", command=self._calculate_metrics, bootstyle="success")
+        self.calc_button.grid(row=5, column=0, columnspan=3, pady=(10, 5), sticky="ew") # Era 4
+
+        # --- Andamento do cálculo em segundo plano (Linha 6) ---
+        self.progress_frame = tb.Frame(input_frame)
+        self.progress_frame.grid(row=6, column=0, columnspan=3, sticky="ew", pady=(5, 0))
+        self.progress_frame.columnconfigure(0, weight=1)
+        self.progress_label = tb.Label(self.progress_frame, text="")
+        self.progress_label.grid(row=0, column=0, columnspan=2, sticky="w", padx=5)
+        self.progress_bar = tb.Progressbar(self.progress_frame, mode="determinate", maximum=100, bootstyle="success-striped")
+        self.progress_bar.grid(row=1, column=0, sticky="ew", padx=5)
+        tb.Button(self.progress_frame, text="Cancelar", command=self._cancel_task, bootstyle="danger-outline").grid(
+            row=1, column=1, sticky="e", padx=(5, 5))
+        self.progress_frame.grid_remove() # Só aparece durante um cálculo
 
         output_frame = tb.Labelframe(main_frame, text="Resultados", padding="15", bootstyle="info")
         output_frame.grid(row=1, column=0, sticky="nsew", padx=10, pady=(10, 5))
@@ -716,6 +538,28 @@ class QueueingCalculatorApp:
             "* Consequência: Se o sistema está cheio (K clientes), novas chegadas são REJEITADAS (perdidas).\n"
             "* Ex: Uma linha de suporte com 'K' vagas de espera.\n"
             "* Estabilidade: Sempre estável.\n\n"
+            "--- M/M/c/K ---\n"
+            "Vários servidores com capacidade finita.\n"
+            "* c: 'c' servidores idênticos.\n"
+            "* K: Capacidade máxima do sistema (K ≥ c). Chegadas com o sistema cheio são perdidas.\n"
+            "* Ex: Central de atendimento com 'K - c' posições de espera.\n"
+            "* Estabilidade: Sempre estável.\n\n"
+            "--- M/M/c/c (Erlang B) ---\n"
+            "Sistema de perda pura: c servidores e nenhuma fila (K = c).\n"
+            "* Quem chega com todos os servidores ocupados é bloqueado.\n"
+            "* Ex: Troncos telefônicos, leitos, vagas de estacionamento.\n"
+            "* Estabilidade: Sempre estável.\n\n"
+            "--- M/G/1 e M/D/1 ---\n"
+            "Um servidor com tempo de serviço de distribuição qualquer.\n"
+            "* G: Serviço geral, descrito pela média (1/μ) e pelo coeficiente de variação cs.\n"
+            "* D: Serviço determinístico (tempo constante, cs = 0).\n"
+            "* Ex: Uma máquina com tempo de ciclo fixo, um guichê com atendimentos muito variados.\n"
+            "* Requer: λ < μ para ser estável.\n\n"
+            "--- G/G/c (Allen–Cunneen) ---\n"
+            "Aproximação para c servidores com chegadas e serviço quaisquer.\n"
+            "* Corrige o M/M/c pela variabilidade: ca (chegadas) e cs (serviço).\n"
+            "* Resultado aproximado; com c = 1 é a fórmula de Kingman.\n"
+            "* Requer: λ < (c * μ) para ser estável.\n\n"
             "--- Comparativo (M/M/1 vs M/M/∞) ---\n"
             "Uma ferramenta de análise (não um modelo padrão).\n"
             "* Objetivo: Compara o cenário de 1 servidor (M/M/1) contra um cenário ideal sem filas (M/M/∞) usando os mesmos λ e μ.\n"
@@ -773,6 +617,10 @@ class QueueingCalculatorApp:
             w.insert(END, "Wq (Tempo médio na fila):\n", "def")
             w.insert(END, "  Tempo médio apenas na fila (esperando).\n", "comment")
             w.insert(END, "  Wq = ρ / (μ - λ)\n\n", "formula")
+            w.insert(END, "Wq p95 / p99 (Percentis da espera):\n", "def")
+            w.insert(END, "  Tempo de espera que 95% / 99% dos clientes não ultrapassam.\n", "comment")
+            w.insert(END, "  P(Wq > t) = ρ * e^(-(μ - λ)t)\n", "formula")
+            w.insert(END, "  t_p = ln(ρ / (1 - p)) / (μ - λ)\n\n", "formula")
 
         elif model_key == "M/M/c":
             w.insert(END, "Definições (M/M/c)\n\n", "header")
@@ -800,6 +648,10 @@ class QueueingCalculatorApp:
             w.insert(END, "W (Tempo médio no sistema):\n", "def")
             w.insert(END, "  Tempo médio na fila + em atendimento.\n", "comment")
             w.insert(END, "  W = Wq + (1 / μ)\n\n", "formula")
+            w.insert(END, "Wq p95 / p99 (Percentis da espera):\n", "def")
+            w.insert(END, "  Tempo de espera que 95% / 99% dos clientes não ultrapassam.\n", "comment")
+            w.insert(END, "  P(Wq > t) = C(c,a) * e^(-(cμ - λ)t)\n", "formula")
+            w.insert(END, "  t_p = ln(C(c,a) / (1 - p)) / (cμ - λ)\n\n", "formula")
 
         elif model_key == "M/M/∞":
             w.insert(END, "Definições (M/M/∞)\n\n", "header")
@@ -852,6 +704,79 @@ class QueueingCalculatorApp:
             w.insert(END, "Wq (Tempo médio na fila):\n", "def")
             w.insert(END, "  Tempo médio na fila (para clientes que entram).\n", "comment")
             w.insert(END, "  Wq = Lq / λ'\n\n", "formula")
+            w.insert(END, "Wq p95 / p99 (Percentis da espera):\n", "def")
+            w.insert(END, "  Para quem entra: quem encontra n clientes espera n serviços.\n", "comment")
+            w.insert(END, "  P(Wq > t) = Σ_{n=1}^{k-1} [Pₙ / (1 - Pₖ)] * P(Erlang(n, μ) > t)\n", "formula")
+            w.insert(END, "  (percentil obtido numericamente)\n\n", "comment")
+
+        elif model_key == "M/M/c/K":
+            w.insert(END, "Definições (M/M/c/K)\n\n", "header")
+            w.insert(END, "ρ (Utilização oferecida por servidor):\n", "def")
+            w.insert(END, "  Pode ser > 1, pois o sistema é finito. a = λ / μ.\n", "comment")
+            w.insert(END, "  ρ = λ / (c * μ)\n\n", "formula")
+            w.insert(END, "P(n) (Prob. de n clientes):\n", "def")
+            w.insert(END, "  Probabilidade de haver 'n' clientes (para n ≤ K).\n", "comment")
+            w.insert(END, "  Pₙ = P₀ * aⁿ / n!                (n ≤ c)\n", "formula")
+            w.insert(END, "  Pₙ = P₀ * (aᶜ / c!) * ρⁿ⁻ᶜ       (c < n ≤ K)\n\n", "formula")
+            w.insert(END, "P₀ (Prob. sistema vazio):\n", "def")
+            w.insert(END, "  Calculado via Erlang B: Σ_{n≤c} Pₙ = P_c / B(c, a).\n", "comment")
+            w.insert(END, "  P₀ = [Σ_{n=0}^{c} aⁿ/n! + (aᶜ/c!) Σ_{j=1}^{K-c} ρʲ]⁻¹\n\n", "formula")
+            w.insert(END, "Pₖ (Prob. de perda/bloqueio):\n", "def")
+            w.insert(END, "  Probabilidade do sistema estar cheio (K clientes).\n", "comment")
+            w.insert(END, "  Pₖ = P₀ * (aᶜ / c!) * ρᴷ⁻ᶜ\n\n", "formula")
+            w.insert(END, "λ' (Taxa de chegada efetiva):\n", "def")
+            w.insert(END, "  λ' = λ * (1 - Pₖ)\n\n", "formula")
+            w.insert(END, "Lq (Nº médio na fila):\n", "def")
+            w.insert(END, "  Lq = Σ_{n=c+1}^{K} (n - c) * Pₙ\n\n", "formula")
+            w.insert(END, "L (Nº médio no sistema):\n", "def")
+            w.insert(END, "  Fila + nº médio de servidores ocupados.\n", "comment")
+            w.insert(END, "  L = Lq + λ' / μ\n\n", "formula")
+            w.insert(END, "W e Wq (Tempos médios, para clientes que entram):\n", "def")
+            w.insert(END, "  W = L / λ'\n  Wq = Lq / λ'\n", "formula")
+
+        elif model_key == "M/M/c/c (Erlang B)":
+            w.insert(END, "Definições (M/M/c/c - Erlang B)\n\n", "header")
+            w.insert(END, "a (Tráfego oferecido, em Erlangs):\n", "def")
+            w.insert(END, "  a = λ / μ\n\n", "formula")
+            w.insert(END, "B(c, a) (Prob. de bloqueio):\n", "def")
+            w.insert(END, "  Fração das chegadas que encontra os c servidores ocupados.\n", "comment")
+            w.insert(END, "  B(c, a) = (aᶜ / c!) / Σ_{n=0}^{c} aⁿ/n!\n", "formula")
+            w.insert(END, "  (calculado pela recorrência B(k) = a·B(k-1) / (k + a·B(k-1)))\n\n", "comment")
+            w.insert(END, "P(n) (Prob. de n servidores ocupados):\n", "def")
+            w.insert(END, "  Pₙ = (aⁿ / n!) / Σ_{j=0}^{c} aʲ/j!\n\n", "formula")
+            w.insert(END, "λ' (Taxa de chegada efetiva):\n", "def")
+            w.insert(END, "  λ' = λ * (1 - B(c, a))\n\n", "formula")
+            w.insert(END, "L (Nº médio de servidores ocupados):\n", "def")
+            w.insert(END, "  Não há fila: Lq = Wq = 0.\n", "comment")
+            w.insert(END, "  L = a * (1 - B(c, a))\n\n", "formula")
+            w.insert(END, "W (Tempo médio no sistema):\n", "def")
+            w.insert(END, "  W = 1 / μ\n", "formula")
+
+        elif model_key in ("M/G/1", "M/D/1"):
+            w.insert(END, f"Definições ({model_key})\n\n", "header")
+            w.insert(END, "ρ (Utilização):\n", "def")
+            w.insert(END, "  ρ = λ / μ   (requer ρ < 1)\n\n", "formula")
+            w.insert(END, "P₀ (Prob. sistema vazio):\n", "def")
+            w.insert(END, "  P₀ = 1 - ρ\n\n", "formula")
+            w.insert(END, "Lq (Nº médio na fila - Pollaczek–Khinchine):\n", "def")
+            w.insert(END, "  cs = desvio / média do tempo de serviço (no M/D/1, cs = 0).\n", "comment")
+            w.insert(END, "  Lq = ρ² * (1 + cs²) / (2 * (1 - ρ))\n\n", "formula")
+            w.insert(END, "L (Nº médio no sistema):\n", "def")
+            w.insert(END, "  L = Lq + ρ\n\n", "formula")
+            w.insert(END, "Wq e W (Tempos médios, pela Lei de Little):\n", "def")
+            w.insert(END, "  Wq = Lq / λ\n  W = Wq + 1 / μ\n", "formula")
+
+        elif model_key == "G/G/c (Allen–Cunneen)":
+            w.insert(END, "Definições (G/G/c - Allen–Cunneen)\n\n", "header")
+            w.insert(END, "ρ (Utilização por servidor):\n", "def")
+            w.insert(END, "  ρ = λ / (c * μ)   (requer ρ < 1)\n\n", "formula")
+            w.insert(END, "C(c, a) (Erlang C do M/M/c equivalente):\n", "def")
+            w.insert(END, "  Mesmo cálculo do modelo M/M/c, com a = λ / μ.\n\n", "comment")
+            w.insert(END, "Wq (Tempo médio na fila, aproximado):\n", "def")
+            w.insert(END, "  ca e cs: coeficientes de variação das chegadas e do serviço.\n", "comment")
+            w.insert(END, "  Wq ≈ [C(c, a) / (c * μ - λ)] * (ca² + cs²) / 2\n\n", "formula")
+            w.insert(END, "Lq, W e L:\n", "def")
+            w.insert(END, "  Lq = λ * Wq\n  W = Wq + 1 / μ\n  L = λ * W\n", "formula")
 
         elif model_key == "Comparativo (M/M/1 vs M/M/∞)":
             w.insert(END, "Definições (Comparativo)\n\n", "header")
@@ -866,7 +791,10 @@ class QueueingCalculatorApp:
             w.insert(END, "* Use o botão 'Adicionar Nova Fórmula' para criar a sua.\n"
                          "* As fórmulas salvas aparecerão em " + CUSTOM_FORMULAS_FILE + "\n"
                          "* Parâmetros disponíveis: " + ", ".join(ALLOWED_PARAMS) + "\n"
-                         "* Funções disponíveis: " + ", ".join(ALLOWED_MATH) + "\n", "comment")
+                         "* Funções disponíveis: " + ", ".join(ALLOWED_MATH) + "\n"
+                         "* Métricas disponíveis (M/M/c com λ, μ e c; c = 1 se vazio): "
+                         + ", ".join(formulas.METRIC_NAMES) + "\n"
+                         "* Outras fórmulas podem ser usadas pelo nome; referências circulares não são aceitas.\n", "comment")
         
         else:
             w.insert(END, "Selecione um modelo para ver as definições das métricas.", "comment")
@@ -874,11 +802,124 @@ class QueueingCalculatorApp:
         w.config(state=DISABLED)
 
 
+    # --- Execução em segundo plano ---
+    def _start_task(self, text, func, args, on_done, error_title="Erro"):
+        """Roda func(task, *args) numa thread e chama on_done(resultado) na thread do Tk."""
+        self._cancel_task()
+        self.task = BackgroundTask(func, *args).start()
+        self.progress_label.config(text=text)
+        self.progress_bar.config(value=0)
+        self.root.after(POLL_INTERVAL_MS, self._poll_task, self.task, on_done, error_title)
+
+    def _poll_task(self, task, on_done, error_title):
+        if task is not self.task:
+            return  # Cancelada ou substituída: o resultado é descartado
+        for message in task.poll():
+            kind = message[0]
+            if kind == "progress":
+                self.progress_bar.config(value=100 * message[1])
+                if message[2]:
+                    self.progress_label.config(text=message[2])
+                continue
+            self._finish_task()
+            if kind == "done":
+                on_done(message[1])
+            elif kind == "error":
+                messagebox.showerror(error_title, str(message[1]))
+            return
+        # Ainda rodando: só agora mostra o andamento (cálculos rápidos não piscam a tela)
+        self.progress_frame.grid()
+        self.calc_button.config(state=DISABLED)
+        self.export_button.config(state=DISABLED)
+        self.root.after(POLL_INTERVAL_MS, self._poll_task, task, on_done, error_title)
+
+    def _cancel_task(self):
+        if self.task is not None:
+            self.task.cancel()
+            self._finish_task()
+
+    def _finish_task(self):
+        self.task = None
+        self.progress_frame.grid_remove()
+        self.calc_button.config(state=NORMAL)
+        self.export_button.config(state=NORMAL)
+
+    # --- Cálculo e atualização da tabela ---
+    def _start_calc(self, model_key, param_values, row_ids=None):
+        """Calcula em segundo plano as linhas 'row_ids' (None = todas) e as atualiza na tabela."""
+        error_title = "Erro"
+        if model_key == "Personalizado":
+            func, args = self._run_custom_calc, (param_values, list(self.custom_formulas), row_ids)
+            text = "Avaliando fórmulas..."
+        elif model_key == COMPARISON_MODEL:
+            func, args = self._run_comparison_calc, (param_values,)
+            text, error_title = "Calculando...", "Erro no Cálculo Comparativo"
+        else:
+            func, args = self._run_standard_calc, (model_key, param_values, row_ids)
+            text = "Calculando..."
+        order = [row_id for row_id, _label, _params in metric_rows(model_key, self.custom_formulas)] \
+            if model_key != COMPARISON_MODEL else None
+
+        def on_done(updates):
+            self._apply_rows(updates, order)
+            # Se algo falhou (ex.: parâmetros inconsistentes), o próximo recálculo refaz tudo
+            failed = any(values is not None and str(values[-1]).startswith("Erro") for _row_id, values in updates)
+            self.last_inputs = None if failed else param_values
+        self._start_task(text, func, args, on_done, error_title)
+
+    def _apply_rows(self, updates, order=None):
+        """Atualiza no lugar as linhas [(row_id, valores)]; valores None removem a linha."""
+        tree = self.results_tree
+        order = order or [row_id for row_id, _values in updates]
+        for row_id, values in updates:
+            if values is None:
+                if tree.exists(row_id):
+                    tree.delete(row_id)
+            elif tree.exists(row_id):
+                if tuple(map(str, tree.item(row_id, "values"))) != tuple(map(str, values)):
+                    tree.item(row_id, values=values)
+            else:
+                index = sum(1 for other in order[:order.index(row_id)] if tree.exists(other))
+                tree.insert("", index, iid=row_id, values=values)
+        if tree.get_children():
+            self.export_button.grid()
+        else:
+            self.export_button.grid_remove()
+
+    def _schedule_live_recalc(self, *args):
+        if self.live_after is not None:
+            self.root.after_cancel(self.live_after)
+        self.live_after = self.root.after(LIVE_DEBOUNCE_MS, self._live_recalc)
+
+    def _live_recalc(self):
+        """Recálculo automático após a digitação: só as linhas cujos parâmetros mudaram."""
+        self.live_after = None
+        if self.task is not None:
+            self._schedule_live_recalc()  # Espera o cálculo (ou a exportação) em andamento
+            return
+        model_key = self.model_combo.get()
+        try:
+            param_values = self._read_param_values(model_key)
+        except ValueError:
+            return  # Entrada incompleta ou inválida: espera o usuário terminar de digitar
+        if model_key == COMPARISON_MODEL:
+            if 'lambda' not in param_values or 'mu' not in param_values or param_values == self.last_inputs:
+                return
+            row_ids = None
+        else:
+            row_ids = affected_rows(metric_rows(model_key, self.custom_formulas), self.last_inputs, param_values)
+            if not row_ids:
+                return
+        self._start_calc(model_key, param_values, row_ids)
+
     def _on_model_selected(self, event=None):
+        self._cancel_task()
         self.export_button.grid_remove()
         for widget in self.params_frame.winfo_children():
             widget.destroy()
         self.param_widgets.clear()
+        self.param_vars.clear()
+        self.last_inputs = None
         
         for item in self.results_tree.get_children():
             self.results_tree.delete(item)
@@ -919,9 +960,12 @@ class QueueingCalculatorApp:
         for key, label in all_params.items():
             tb.Label(self.params_frame, text=f"{label}:").grid(row=row, column=0, sticky="w", pady=4, padx=5)
             
-            entry = tb.Entry(self.params_frame)
+            var = tb.StringVar()
+            var.trace_add("write", self._schedule_live_recalc)
+            entry = tb.Entry(self.params_frame, textvariable=var)
             entry.grid(row=row, column=1, sticky="ew", pady=4, padx=5)
             self.param_widgets[key] = entry
+            self.param_vars[key] = var  # Mantém a referência (senão a variável do Tk é apagada)
             
             help_cmd = lambda k=key: self._show_param_help(k)
             help_btn = tb.Button(self.params_frame, text="?", command=help_cmd, bootstyle="info-outline", width=3)
@@ -931,107 +975,104 @@ class QueueingCalculatorApp:
         
         self._update_metric_help(model_key)
 
-    def _run_comparison_calc(self, param_values):
-        try:
-            lambd = param_values.get("lambda")
-            mu = param_values.get("mu")
-            
-            mm1_stable = True
-            if lambd >= mu:
-                mm1_stable = False
-                messagebox.showwarning("Aviso de Estabilidade", 
-                    f"M/M/1 é instável (λ >= μ). Os resultados para M/M/1 serão '∞' (Instável).")
-
-            def format_val(val_mm1, val_mminf, stable):
-                res_mm1 = f"{val_mm1:.6g}" if stable else "∞ (Instável)"
-                res_mminf = f"{val_mminf:.6g}"
-                return (res_mm1, res_mminf)
-
-            rho_mm1 = mm1_rho(lambd, mu)
-            rho_mminf = mminf_rho(lambd, mu)
-            val1, val2 = format_val(rho_mm1, rho_mminf, mm1_stable)
-            self.results_tree.insert("", "end", values=("ρ (Utilização/Intensidade)", val1, val2))
-            
-            l_mm1 = mm1_L(lambd, mu) if mm1_stable else float('inf')
-            l_mminf = mminf_L(lambd, mu)
-            val1, val2 = format_val(l_mm1, l_mminf, mm1_stable)
-            self.results_tree.insert("", "end", values=("L (Nº médio no sistema)", val1, val2))
-            
-            lq_mm1 = mm1_Lq(lambd, mu) if mm1_stable else float('inf')
-            lq_mminf = 0.0
-            val1, val2 = format_val(lq_mm1, lq_mminf, mm1_stable)
-            self.results_tree.insert("", "end", values=("Lq (Nº médio na fila)", val1, val2))
-            
-            w_mm1 = mm1_W(lambd, mu) if mm1_stable else float('inf')
-            w_mminf = mminf_W(lambd, mu)
-            val1, val2 = format_val(w_mm1, w_mminf, mm1_stable)
-            self.results_tree.insert("", "end", values=("W (Tempo médio no sistema)", val1, val2))
-
-            wq_mm1 = mm1_Wq(lambd, mu) if mm1_stable else float('inf')
-            wq_mminf = 0.0
-            val1, val2 = format_val(wq_mm1, wq_mminf, mm1_stable)
-            self.results_tree.insert("", "end", values=("Wq (Tempo médio na fila)", val1, val2))
-            
-            p0_mm1 = mm1_p0(lambd, mu) if mm1_stable else 0.0
-            p0_mminf = mminf_p0(lambd, mu)
-            self.results_tree.insert("", "end", values=("P₀ (Prob. sistema vazio)", f"{p0_mm1:.6g}" if mm1_stable else "0.0", f"{p0_mminf:.6g}"))
-
-        except Exception as e:
-            messagebox.showerror("Erro no Cálculo Comparativo", str(e))
-
-    def _run_standard_calc(self, config, param_values):
-        """Executa os cálculos para os 4 modelos padrão."""
-        for label, func, params_needed in config.get("functions", []):
-            try:
-                if not all(p in param_values for p in params_needed):
-                    continue
-                
-                args = [param_values[p] for p in params_needed]
-                result = func(*args)
-
-                if isinstance(result, float):
-                    if math.isinf(result): formatted_result = "∞ (Instável)"
-                    elif math.isnan(result): formatted_result = "Indefinido (NaN)"
-                    else: formatted_result = f"{result:.6g}"
-                else: formatted_result = str(result)
-                
-                self.results_tree.insert("", "end", values=(label, formatted_result))
-            
-            except Exception as e:
-                self.results_tree.insert("", "end", values=(label, f"Erro: {e}"))
-                
-    def _run_custom_calc(self, param_values):
-        """Executa os cálculos para o modelo Personalizado."""
+    def _run_comparison_calc(self, task, param_values):
+        """Linhas [(row_id, (métrica, M/M/1, M/M/∞))] do modo comparativo."""
+        rows = []
+        lambd = param_values.get("lambda")
+        mu = param_values.get("mu")
+        mm1_stable = lambd < mu
+
+        def format_val(val_mm1, val_mminf, stable):
+            res_mm1 = f"{val_mm1:.6g}" if stable else "∞ (Instável)"
+            res_mminf = f"{val_mminf:.6g}"
+            return (res_mm1, res_mminf)
+
+        rho_mm1 = mm1_rho(lambd, mu)
+        rho_mminf = mminf_rho(lambd, mu)
+        val1, val2 = format_val(rho_mm1, rho_mminf, mm1_stable)
+        rows.append(("ρ (Utilização/Intensidade)", val1, val2))
         
-        safe_scope = {}
-        for func_name in ALLOWED_MATH:
-            if hasattr(math, func_name):
-                safe_scope[func_name] = getattr(math, func_name)
+        l_mm1 = mm1_L(lambd, mu) if mm1_stable else float('inf')
+        l_mminf = mminf_L(lambd, mu)
+        val1, val2 = format_val(l_mm1, l_mminf, mm1_stable)
+        rows.append(("L (Nº médio no sistema)", val1, val2))
         
-        for key, value in param_values.items():
-            safe_scope[key] = value
-
-        for formula in self.custom_formulas:
-            label = formula["label"]
-            params_needed = formula["params"]
-            expr = formula["expr"]
-            
-            try:
-                if not all(p in param_values for p in params_needed):
-                    formatted_result = "Parâmetros Faltando"
-                else:
-                    result = eval(expr, {"__builtins__": {}}, safe_scope)
-                    
-                    if isinstance(result, float):
-                        if math.isinf(result): formatted_result = "∞ (Infinito)"
-                        elif math.isnan(result): formatted_result = "Indefinido (NaN)"
-                        else: formatted_result = f"{result:.6g}"
-                    else: formatted_result = str(result)
+        lq_mm1 = mm1_Lq(lambd, mu) if mm1_stable else float('inf')
+        lq_mminf = 0.0
+        val1, val2 = format_val(lq_mm1, lq_mminf, mm1_stable)
+        rows.append(("Lq (Nº médio na fila)", val1, val2))
+        
+        w_mm1 = mm1_W(lambd, mu) if mm1_stable else float('inf')
+        w_mminf = mminf_W(lambd, mu)
+        val1, val2 = format_val(w_mm1, w_mminf, mm1_stable)
+        rows.append(("W (Tempo médio no sistema)", val1, val2))
+
+        wq_mm1 = mm1_Wq(lambd, mu) if mm1_stable else float('inf')
+        wq_mminf = 0.0
+        val1, val2 = format_val(wq_mm1, wq_mminf, mm1_stable)
+        rows.append(("Wq (Tempo médio na fila)", val1, val2))
+        
+        p0_mm1 = mm1_p0(lambd, mu) if mm1_stable else 0.0
+        p0_mminf = mminf_p0(lambd, mu)
+        rows.append(("P₀ (Prob. sistema vazio)", f"{p0_mm1:.6g}" if mm1_stable else "0.0", f"{p0_mminf:.6g}"))
+        return [(f"comparison-{i}", row) for i, row in enumerate(rows)]
+
+    def _run_standard_calc(self, task, model_key, param_values, row_ids=None):
+        """Linhas [(métrica, (rótulo, valor))] dos modelos padrão; só as de 'row_ids', se dado.
+
+        Linhas cujos parâmetros não foram informados saem com valores None (são removidas).
+        """
+        config = MODELS_CONFIG[model_key]
+        functions = [f for f in config.get("functions", []) if row_ids is None or f[1] in row_ids]
+        rows = []
+        # Resolve o modelo uma única vez; cada linha apenas lê seu valor do resultado.
+        task.progress(0.0, f"Resolvendo {model_key}...")
+        try:
+            results = cached_solve_model(model_key, param_values)
+        except Exception as e:
+            return [(key, (label, f"Erro: {e}")) for label, key, params_needed in config.get("functions", [])]
+
+        for label, key, params_needed in functions:
+            if not all(p in param_values for p in params_needed):
+                rows.append((key, None))
+                continue
+
+            result = results.get(key)
+            if result is None: formatted_result = "Indefinido"
+            elif isinstance(result, float):
+                if math.isinf(result): formatted_result = "∞ (Instável)"
+                elif math.isnan(result): formatted_result = "Indefinido (NaN)"
+                else: formatted_result = f"{result:.6g}"
+            else: formatted_result = str(result)
+
+            rows.append((key, (label, formatted_result)))
+        return rows
                 
-                self.results_tree.insert("", "end", values=(label, formatted_result))
-            
-            except Exception as e:
-                self.results_tree.insert("", "end", values=(label, f"Erro: {e}"))
+    def _run_custom_calc(self, task, param_values, custom_formulas, row_ids=None):
+        """Linhas [(row_id, (fórmula, valor))] do modelo Personalizado; só as de 'row_ids', se dado.
+
+        As fórmulas são avaliadas juntas (program_for): subexpressões repetidas
+        entre elas são calculadas uma única vez por cenário.
+        """
+        rows = []
+        indices = [i for i in range(len(custom_formulas)) if row_ids is None or formula_row_id(i) in row_ids]
+        total = len(indices)
+        task.progress(0.0, f"Avaliando fórmulas (0/{total})...")
+        results = program_for(custom_formulas).iter_results(param_values, indices)
+        for done, (i, result) in enumerate(results, start=1):
+            label = custom_formulas[i]["label"]
+            if isinstance(result, KeyError):
+                formatted_result = "Parâmetros Faltando"
+            elif isinstance(result, Exception):
+                formatted_result = f"Erro: {result}"
+            elif isinstance(result, float):
+                if math.isinf(result): formatted_result = "∞ (Infinito)"
+                elif math.isnan(result): formatted_result = "Indefinido (NaN)"
+                else: formatted_result = f"{result:.6g}"
+            else: formatted_result = str(result)
+            rows.append((formula_row_id(i), (label, formatted_result)))
+            task.progress(done / total, f"Avaliando fórmulas ({done}/{total})...")
+        return rows
                 
     def _export_pdf(self):
         """Coleta os dados e chama o módulo de exportação de PDF."""
@@ -1066,67 +1107,81 @@ class QueueingCalculatorApp:
             values = self.results_tree.item(item_id, 'values')
             results_data.append(tuple(values))
 
-        # 4. Chama o módulo de exportação
-        try:
-            success = pdf_export.create_results_pdf(
-                filename=filename,
-                model_name=model_key,
-                params_data=params_data,
-                results_data=results_data
-            )
+        # 4. Gera o PDF em segundo plano
+        def on_done(success):
             if success:
                 messagebox.showinfo("Sucesso", f"Resultados exportados para:\n{filename}")
-        except Exception as e:
-            messagebox.showerror("Erro na Exportação", f"Ocorreu um erro ao salvar o PDF:\n{e}")
+        self._start_task("Gerando PDF...", self._write_pdf, (filename, model_key, params_data, results_data),
+                         on_done, error_title="Erro na Exportação")
+
+    def _write_pdf(self, task, filename, model_key, params_data, results_data):
+        """Executado na thread de trabalho: chama o módulo de exportação."""
+        task.progress(0.0)
+        import pdf_export  # importado só aqui: carrega o reportlab
+        return pdf_export.create_results_pdf(
+            filename=filename,
+            model_name=model_key,
+            params_data=params_data,
+            results_data=results_data
+        )
+
+    def _read_param_values(self, model_key):
+        """Lê e valida os campos do modelo; gera ValueError com a mensagem para o usuário."""
+        config = MODELS_CONFIG.get(model_key, {})
+        param_values = {}
+        all_possible_params = {**config.get("params", {}), **config.get("optional_params", {})}
+        
+        for key in all_possible_params.keys():
+            widget = self.param_widgets.get(key)
+            if widget:
+                val_str = widget.get().strip()
+                if not val_str:
+                    if key in config.get("params", {}):
+                        raise ValueError(f"O parâmetro '{all_possible_params[key]}' é obrigatório.")
+                    continue
+                
+                if key in ('c', 'k', 'n'):
+                    param_values[key] = int(float(val_str))
+                    if param_values[key] < 0: raise ValueError(f"Parâmetro '{key}' deve ser não-negativo.")
+                elif key in NONNEGATIVE_PARAMS:
+                    param_values[key] = float(val_str)
+                    if param_values[key] < 0: raise ValueError(f"Parâmetro '{key}' deve ser não-negativo.")
+                else:
+                    param_values[key] = float(val_str)
+                    if param_values[key] <= 0: raise ValueError(f"Taxa '{key}' deve ser positiva.")
+        return param_values
 
     def _calculate_metrics(self):
-        """Função principal de cálculo, agora dividida em 3 rotas."""
+        """Função principal de cálculo (botão): valida, avisa e recalcula a tabela inteira."""
+        if self.live_after is not None:
+            self.root.after_cancel(self.live_after)
+            self.live_after = None
         self.export_button.grid_remove()
         for item in self.results_tree.get_children():
             self.results_tree.delete(item)
+        self.last_inputs = None
             
         model_key = self.model_combo.get()
-        config = MODELS_CONFIG.get(model_key, {})
-        
-        param_values = {}
         try:
-            all_possible_params = {**config.get("params", {}), **config.get("optional_params", {})}
-            
-            for key in all_possible_params.keys():
-                widget = self.param_widgets.get(key)
-                if widget:
-                    val_str = widget.get().strip()
-                    if not val_str:
-                        if key in config.get("params", {}):
-                            raise ValueError(f"O parâmetro '{all_possible_params[key]}' é obrigatório.")
-                        continue
-                    
-                    if key in ('c', 'k', 'n'):
-                        param_values[key] = int(float(val_str))
-                        if param_values[key] < 0: raise ValueError(f"Parâmetro '{key}' deve ser não-negativo.")
-                    else:
-                        param_values[key] = float(val_str)
-                        if param_values[key] <= 0: raise ValueError(f"Taxa '{key}' deve ser positiva.")
-        
+            param_values = self._read_param_values(model_key)
         except ValueError as e:
             messagebox.showerror("Erro de Entrada", str(e))
             return
             
-        if model_key == "Personalizado":
-            self._run_custom_calc(param_values)
-        
-        elif model_key == "Comparativo (M/M/1 vs M/M/∞)":
+        if model_key == COMPARISON_MODEL:
             if 'lambda' not in param_values or 'mu' not in param_values:
                  messagebox.showerror("Erro", "λ e μ são obrigatórios para a comparação.")
                  return
-            self._run_comparison_calc(param_values)
+            if param_values["lambda"] >= param_values["mu"]:
+                messagebox.showwarning("Aviso de Estabilidade", 
+                    f"M/M/1 é instável (λ >= μ). Os resultados para M/M/1 serão '∞' (Instável).")
         
-        else:
+        elif model_key != "Personalizado":
             try:
                 lambd, mu = param_values.get("lambda"), param_values.get("mu")
-                if model_key == "M/M/1" and lambd >= mu:
+                if model_key in ("M/M/1", "M/G/1", "M/D/1") and lambd >= mu:
                     raise ValueError("Condição de estabilidade violada: λ deve ser menor que μ.")
-                if model_key == "M/M/c":
+                if model_key in ("M/M/c", "G/G/c (Allen–Cunneen)"):
                     c = param_values.get("c", 1)
                     if lambd >= c * mu:
                         raise ValueError(f"Condição de estabilidade violada: λ deve ser menor que c * μ ({c * mu}).")
@@ -1135,10 +1190,7 @@ class QueueingCalculatorApp:
             except TypeError:
                 pass 
             
-            self._run_standard_calc(config, param_values)
-            
-        if self.results_tree.get_children():
-            self.export_button.grid()
+        self._start_calc(model_key, param_values)
 
 if __name__ == "__main__":
     root = tb.Window(themename="litera") 
@@ -0,0 +1,21 @@
+#!/bin/sh
+# Compara o desempenho da árvore atual com o de outro commit, na mesma máquina:
+#
+#   benchmarks/compare_with.sh main              # baseline = main, depois --compare
+#   benchmarks/compare_with.sh HEAD~3 -k mmc_    # argumentos extras vão para run.py
+#
+# O commit de referência é extraído num git worktree temporário, o baseline é
+# gravado a partir dele e a árvore atual é comparada com esse baseline. Sai
+# com 1 se algum caso regredir (mesmo critério de run.py --compare). O commit
+# de referência precisa ter benchmarks/run.py.
+set -e
+
+ref=${1:-HEAD}
+[ $# -gt 0 ] && shift
+here=$(cd "$(dirname "$0")/.." && pwd)
+tmp=$(mktemp -d)
+trap 'git -C "$here" worktree remove --force "$tmp/tree" >/dev/null 2>&1; rm -rf "$tmp"' EXIT
+
+git -C "$here" worktree add --detach "$tmp/tree" "$ref" >/dev/null
+python "$tmp/tree/benchmarks/run.py" --save "$tmp/baseline.json" "$@"
+python "$here/benchmarks/run.py" --compare "$tmp/baseline.json" "$@"
@@ -0,0 +1,266 @@
+# Benchmarks reprodutíveis da calculadora (só biblioteca padrão + timeit).
+#
+#   python benchmarks/run.py                 # roda tudo e mostra a tabela
+#   python benchmarks/run.py -k mmc_         # só os casos cujo nome contém 'mmc_'
+#   python benchmarks/run.py --save          # grava o baseline (benchmarks/baseline.json)
+#   python benchmarks/run.py --compare       # compara com o baseline; sai com 1 se regredir
+#
+# Cada caso mede a latência por chamada (melhor de 'repeat' rodadas de
+# timeit, com o nº de chamadas por rodada calibrado para ~0,1 s) e a vazão
+# correspondente. Casos que geram exceção (ex.: estouro nas formas fechadas
+# com K grande) são registrados como erro. Os baselines dependem da máquina:
+# benchmarks/baseline.json é a referência versionada; para comparar com outro
+# commit na mesma máquina use benchmarks/compare_with.sh <commit>.
+#
+# Grupos de casos:
+#   models   : cada função mm1_*, mmc_*, mminf_*, mm1k_* (e *_solve) com
+#              parâmetros pequenos e extremos (c = 10⁴, ρ → 1, K = 10⁴)
+#   solve    : solve_model de cada modelo de MODELS_CONFIG
+#   formulas : avaliação de fórmulas personalizadas, uma a uma e em conjunto
+#              (FormulaProgram, como _run_custom_calc), compilação a frio e,
+#              com numpy, avaliação vetorizada
+#   parser   : param_parser.parse_param_file num arquivo grande
+#   pdf      : pdf_export.create_results_pdf (pulado sem reportlab)
+
+import argparse
+import datetime
+import inspect
+import json
+import os
+import platform
+import sys
+import tempfile
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from queue_metrics import models, formulas  # noqa: E402
+from queue_metrics.models import MODELS_CONFIG, solve_model  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_THRESHOLD = 1.25
+TARGET_ROUND_SECONDS = 0.1
+
+# Cenários por família: argumentos nomeados como nas funções de models.py.
+SCENARIOS = {
+    "mm1_": {"small": dict(lambd=4.0, mu=5.0, n=3),
+             "rho~1": dict(lambd=0.999999, mu=1.0, n=10_000)},
+    "mmc_": {"small": dict(lambd=20.0, mu=12.0, c=2),
+             "c=1e4,rho~1": dict(lambd=9_999.0, mu=1.0, c=10_000)},
+    "mminf_": {"small": dict(lambd=3.0, mu=1.0, n=2),
+               "a=1e4": dict(lambd=10_000.0, mu=1.0, n=10_000)},
+    "mm1k_": {"small": dict(lambd=4.0, mu=5.0, k=10, n=3),
+              "k=1e4,rho~1": dict(lambd=1.0000001, mu=1.0, k=10_000, n=5_000),
+              "k=1e4,rho=1.5": dict(lambd=1.5, mu=1.0, k=10_000, n=5_000)},
+}
+
+SOLVE_SCENARIOS = {
+    "M/M/1": {"lambda": 4.0, "mu": 5.0, "n": 3},
+    "M/M/c": {"lambda": 9_999.0, "mu": 1.0, "c": 10_000},
+    "M/M/∞": {"lambda": 3.0, "mu": 1.0, "n": 2},
+    "M/M/1/K": {"lambda": 4.0, "mu": 5.0, "k": 50, "n": 3},
+    "M/M/c/K": {"lambda": 9_000.0, "mu": 1.0, "c": 10_000, "k": 12_000},
+    "M/M/c/c (Erlang B)": {"lambda": 9_000.0, "mu": 1.0, "c": 10_000},
+    "M/G/1": {"lambda": 4.0, "mu": 5.0, "cs": 1.5},
+    "M/D/1": {"lambda": 4.0, "mu": 5.0},
+    "G/G/c (Allen–Cunneen)": {"lambda": 20.0, "mu": 12.0, "c": 2, "ca": 0.8, "cs": 1.2},
+}
+
+SAMPLE_FORMULAS = [
+    "(lambd / mu) / (1 - (lambd / mu))",
+    "lambd / (c * mu)",
+    "(1 - lambd / mu) * pow(lambd / mu, n)",
+    "exp(-lambd / mu) * pow(lambd / mu, n) / factorial(n)",
+    "log(1 + k * lambd / mu) + sqrt(c)",
+]
+FORMULA_PARAMS = {"lambd": 4.0, "mu": 5.0, "c": 2, "k": 10, "n": 3}
+
+
+# -------------------------------------------------------------------
+# Casos
+# -------------------------------------------------------------------
+def model_cases():
+    for name, func in sorted(vars(models).items()):
+        if not inspect.isfunction(func) or func.__module__ != models.__name__:
+            continue
+        prefix = next((p for p in SCENARIOS if name.startswith(p)), None)
+        if prefix is None:
+            continue
+        params = inspect.signature(func).parameters
+        for label, scenario in SCENARIOS[prefix].items():
+            kwargs = {p: scenario[p] for p in params if p in scenario}
+            if any(p not in kwargs and params[p].default is inspect.Parameter.empty for p in params):
+                continue
+            yield f"models/{name}[{label}]", (lambda f=func, kw=kwargs: f(**kw))
+
+
+def solve_cases():
+    for model_key, values in SOLVE_SCENARIOS.items():
+        if model_key in MODELS_CONFIG:
+            yield f"solve/{model_key}", (lambda m=model_key, v=values: solve_model(m, v))
+
+
+def formula_cases():
+    def evaluate_all():
+        for expr in SAMPLE_FORMULAS:
+            formulas.evaluate_formula(expr, FORMULA_PARAMS)
+    yield "formulas/evaluate[5 fórmulas]", evaluate_all
+
+    def compile_cold():
+        formulas.compile_expression.cache_clear()
+        for expr in SAMPLE_FORMULAS:
+            formulas.compile_expression(expr)
+    yield "formulas/compile[frio, 5 fórmulas]", compile_cold
+
+    from queue_metrics.optimizer import FormulaProgram
+    program = FormulaProgram([{"label": f"f{i}", "params": list(FORMULA_PARAMS), "expr": expr}
+                              for i, expr in enumerate(SAMPLE_FORMULAS)])
+    yield "formulas/program[5 fórmulas, subexpressões compartilhadas]", (
+        lambda: program.evaluate(FORMULA_PARAMS))
+
+    try:
+        import numpy as np
+        from queue_metrics.batch import evaluate_formulas_batch
+    except ImportError:
+        return
+    size = 100_000
+    arrays = {"lambd": np.linspace(0.1, 4.9, size), "mu": 5.0, "c": 2, "k": 10, "n": 3}
+    saved = [{"label": f"f{i}", "params": list(FORMULA_PARAMS), "expr": expr}
+             for i, expr in enumerate(SAMPLE_FORMULAS)]
+    yield f"formulas/batch[5 fórmulas x {size}]", (lambda: evaluate_formulas_batch(saved, arrays))
+
+
+def parser_cases(workdir):
+    import param_parser
+
+    path = os.path.join(workdir, "parametros_grandes.txt")
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(20_000):
+            f.write(f"# comentário {i}: taxa de chegada 999 (ignorado)\n")
+            f.write("Observação sem números relevantes sobre o atendimento.\n")
+        f.write("A taxa de chegada é 10 clientes por hora e cada atendente atende 12.\n")
+        f.write("Há 3 atendentes e capacidade de 20 clientes. n = 5\n")
+    yield "parser/parse_param_file[40k linhas]", (lambda: param_parser.parse_param_file(path))
+
+
+def pdf_cases(workdir):
+    try:
+        import pdf_export
+    except ImportError:
+        return
+    path = os.path.join(workdir, "relatorio.pdf")
+    params = [("Taxa de Chegada (λ)", "20"), ("Taxa de Serviço (μ)", "12"), ("Nº de Servidores (c)", "2")]
+    results = [(f"Métrica {i}", f"{i * 0.123456:.6g}") for i in range(50)]
+    yield "pdf/create_results_pdf[50 linhas]", (
+        lambda: pdf_export.create_results_pdf(path, "M/M/c", params, results))
+
+
+def all_cases(workdir):
+    yield from model_cases()
+    yield from solve_cases()
+    yield from formula_cases()
+    yield from parser_cases(workdir)
+    yield from pdf_cases(workdir)
+
+
+# -------------------------------------------------------------------
+# Medição, baseline e comparação
+# -------------------------------------------------------------------
+def measure(func, repeat):
+    """Melhor tempo por chamada (s) e o nº de chamadas por rodada."""
+    timer = timeit.Timer(func)
+    number, elapsed = timer.autorange()
+    number = max(1, int(number * TARGET_ROUND_SECONDS / max(elapsed, 1e-9)))
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+    return best, number
+
+
+def run(pattern=None, repeat=5, out=sys.stdout):
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for name, func in all_cases(workdir):
+            if pattern and pattern not in name:
+                continue
+            try:
+                func()
+            except Exception as e:   # ex.: OverflowError nas formas fechadas antigas
+                results[name] = {"error": f"{type(e).__name__}: {e}"}
+                print(f"{name:55s} {'ERRO':>10s}  {results[name]['error']}", file=out)
+                continue
+            per_call, number = measure(func, repeat)
+            results[name] = {"per_call": per_call, "number": number}
+            print(f"{name:55s} {_fmt_time(per_call):>10s} {1 / per_call:>14,.0f} op/s", file=out)
+    return results
+
+
+def _fmt_time(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6), ("ns", 1e-9)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+
+def save_baseline(results, path):
+    data = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        },
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def compare(results, path, threshold=DEFAULT_THRESHOLD, out=sys.stdout):
+    """Compara com o baseline; devolve os nomes dos casos que ficaram mais lentos que 'threshold'x."""
+    with open(path, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    regressions = []
+    print(f"\n{'caso':55s} {'baseline':>10s} {'atual':>10s} {'razão':>7s}", file=out)
+    for name, current in results.items():
+        if name not in baseline or "per_call" not in baseline[name]:
+            continue
+        if "per_call" not in current:
+            regressions.append(name)
+            print(f"{name:55s} {_fmt_time(baseline[name]['per_call']):>10s} {'ERRO':>10s}  << REGRESSÃO", file=out)
+            continue
+        ratio = current["per_call"] / baseline[name]["per_call"]
+        flag = "  << REGRESSÃO" if ratio > threshold else ""
+        if flag:
+            regressions.append(name)
+        print(f"{name:55s} {_fmt_time(baseline[name]['per_call']):>10s} "
+              f"{_fmt_time(current['per_call']):>10s} {ratio:>6.2f}x{flag}", file=out)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks da Calculadora de Teoria das Filas.")
+    parser.add_argument("-k", "--filter", help="Roda só os casos cujo nome contém este texto.")
+    parser.add_argument("--repeat", type=int, default=5, help="Rodadas por caso (vale a melhor).")
+    parser.add_argument("--save", nargs="?", const=DEFAULT_BASELINE,
+                        help="Grava os resultados como baseline (padrão: benchmarks/baseline.json).")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE,
+                        help="Compara com um baseline (padrão: benchmarks/baseline.json).")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Razão atual/baseline acima da qual há regressão (padrão: 1.25).")
+    args = parser.parse_args(argv)
+
+    results = run(args.filter, args.repeat)
+    status = 0
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} caso(s) com regressão.", file=sys.stderr)
+            status = 1
+    if args.save:
+        save_baseline(results, args.save)
+        print(f"\nBaseline gravado em {args.save}", file=sys.stderr)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
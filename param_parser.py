@@ -2,7 +2,6 @@
 # (Versão 2.7 - Corrigido o bug que confundia 'atendente' com 'atendimento')
 
 import re
-from tkinter import messagebox
 
 # Mapeia todas as possíveis entradas do usuário (incluindo símbolos)
 # para as chaves de sistema que o seu programa usa.
@@ -13,6 +12,7 @@ KEY_MAP = {
     'c': 'c', 'servidores': 'c', 'atendentes': 'c', 'barbeiro': 'c', 'caixa': 'c',
     'k': 'k', 'capacidade': 'k',
     'n': 'n',
+    'cs': 'cs', 'ca': 'ca',
 }
 
 # --- PADRÕES DE REGEX (CORRIGIDOS E ROBUSTOS) ---
@@ -40,6 +40,10 @@ PARAM_REGEX_PATTERNS = [
     
     # 5. Busca por N (valor de Pn)
     ('n', re.compile(r"n\s*[=:]\s*([\d\.,]+)", re.IGNORECASE)),
+
+    # 6. Coeficientes de variação (serviço e chegadas) dos modelos M/G/1 e G/G/c
+    ('cs', re.compile(r"\bcs\s*[=:]\s*([\d\.,]+)", re.IGNORECASE)),
+    ('ca', re.compile(r"\bca\s*[=:]\s*([\d\.,]+)", re.IGNORECASE)),
 ]
 
 # Padrões que não têm números (como "um atendente")
@@ -91,9 +95,11 @@ def parse_param_file(filepath):
                     parsed_data[key] = value
 
     except FileNotFoundError:
+        from tkinter import messagebox  # import tardio: o parser também roda sem GUI
         messagebox.showerror("Erro", f"Arquivo não encontrado:\n{filepath}")
         return {}
     except Exception as e:
+        from tkinter import messagebox
         messagebox.showerror("Erro ao Ler Arquivo", f"Não foi possível processar o arquivo:\n{e}")
         return {}
         
@@ -8,7 +8,6 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
-from tkinter import messagebox # Usado para o erro
 
 # A função _build_help_story() foi REMOVIDA, como solicitado.
 
@@ -114,5 +113,6 @@ def create_results_pdf(filename, model_name, params_data, results_data):
         return True
     
     except Exception as e:
+        from tkinter import messagebox # Usado para o erro (import tardio)
         messagebox.showerror("Erro ao Gerar PDF", f"Não foi possível criar o PDF: {e}")
         return False
\ No newline at end of file
@@ -0,0 +1,17 @@
+# Núcleo de cálculo da Calculadora de Teoria das Filas, sem dependências de GUI.
+#
+# Importar este pacote carrega apenas a biblioteca padrão. A avaliação
+# vetorizada (NumPy) fica em 'queue_metrics.batch' e a simulação em
+# 'queue_metrics.simulation'; ambas só são carregadas quando importadas
+# explicitamente.
+
+from queue_metrics.models import (
+    MODELS_CONFIG, solve_model,
+    mm1_solve, mmc_solve, mminf_solve, mm1k_solve,
+)
+from queue_metrics.formulas import (
+    ALLOWED_MATH, ALLOWED_PARAMS, CUSTOM_FORMULAS_FILE,
+    load_custom_formulas, save_custom_formulas, validate_expression,
+    compile_expression, compile_formulas, evaluate_formula,
+    FormulaLimits, FormulaLimitError,
+)
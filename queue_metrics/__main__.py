@@ -0,0 +1,5 @@
+import sys
+
+from queue_metrics.cli import main
+
+sys.exit(main())
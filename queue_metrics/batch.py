@@ -0,0 +1,400 @@
+# Avaliação vetorizada (NumPy) dos modelos de fila.
+# Cada função aceita escalares ou arrays (com broadcasting) e devolve um
+# dicionário com as mesmas chaves dos *_solve de queue_metrics.models, mas com arrays.
+# Os ramos instáveis / ρ = 1 são tratados elemento a elemento com máscaras.
+
+import numpy as np
+
+from queue_metrics.models import _mm1k_series_coeffs
+from queue_metrics.waiting import WAIT_PERCENTILES, percentile_key
+
+INF = np.inf
+
+
+def _as_float(*arrays):
+    return np.broadcast_arrays(*[np.asarray(x, dtype=float) for x in arrays])
+
+
+def _exponential_wq_percentiles(res, prob_wait, rate, stable):
+    """Percentis de Wq em forma fechada: t_p = ln(P(esperar) / (1 - p)) / rate."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for p in WAIT_PERCENTILES:
+            t = np.maximum(np.log(prob_wait / (1 - p)) / rate, 0.0)
+            res[percentile_key(p)] = np.where(stable, t, INF)
+    return res
+
+
+def _log_factorial(n):
+    """log(n!) para um array de inteiros não-negativos, via tabela acumulada."""
+    n = np.asarray(n, dtype=np.int64)
+    n_max = int(n.max()) if n.size else 0
+    table = np.zeros(n_max + 1)
+    if n_max > 0:
+        np.cumsum(np.log(np.arange(1, n_max + 1)), out=table[1:])
+    return table[n]
+
+
+# ----- M/M/1 -----
+def mm1_batch(lambd, mu, n=None):
+    lambd, mu = _as_float(lambd, mu)
+    rho = lambd / mu
+    stable = rho < 1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        L = np.where(stable, rho / (1 - rho), INF)
+        W = np.where(stable, 1.0 / (mu - lambd), INF)
+    res = {"rho": rho, "p0": np.where(stable, 1 - rho, 0.0),
+           "L": L, "Lq": rho * L, "W": W, "Wq": rho * W}
+    _exponential_wq_percentiles(res, rho, mu - lambd, stable)
+    if n is not None:
+        res["pn"] = res["p0"] * rho ** np.asarray(n, dtype=float)
+    return res
+
+
+# ----- M/M/c -----
+def mmc_erlangB_batch(a, c):
+    """Erlang B para arrays de a e c usando a recorrência B(k) = aB(k-1) / (k + aB(k-1)).
+
+    Os cenários são ordenados por c, de forma que a cada passo k só os que ainda
+    têm c >= k (um sufixo contíguo) são atualizados: custo total Σc, não N·max(c).
+    """
+    a, c = np.broadcast_arrays(np.asarray(a, dtype=float), np.asarray(c, dtype=np.int64))
+    shape = a.shape
+    a, c = a.ravel(), c.ravel()
+    order = np.argsort(c, kind='stable')
+    a_s, c_s = a[order], c[order]
+    b_s = np.ones_like(a_s)
+    c_max = int(c_s[-1]) if c_s.size else 0
+    for k in range(1, c_max + 1):
+        start = np.searchsorted(c_s, k, side='left')
+        ab = a_s[start:] * b_s[start:]
+        b_s[start:] = ab / (k + ab)
+    b = np.empty_like(b_s)
+    b[order] = b_s
+    return b.reshape(shape)
+
+
+def mmc_batch(lambd, mu, c):
+    lambd, mu = _as_float(lambd, mu)
+    lambd, mu, c = np.broadcast_arrays(lambd, mu, np.asarray(c, dtype=np.int64))
+    a = lambd / mu
+    rho = a / c
+    stable = rho < 1
+    b = mmc_erlangB_batch(a, c)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        erlang_c = np.where(stable, b / (1 - rho * (1 - b)), 1.0)
+        Lq = np.where(stable, erlang_c * rho / (1 - rho), INF)
+        Wq = np.where(stable, np.where(lambd > 0, Lq / lambd, 0.0), INF)
+        # P₀ = B * c! / aᶜ / [(1 - B) + B / (1 - ρ)], em espaço logarítmico
+        log_p0 = (np.log(b) + _log_factorial(c) - c * np.log(a)
+                  - np.log((1 - b) + b / (1 - rho)))
+        p0 = np.where(b > 0, np.exp(log_p0), np.exp(-a))
+    p0 = np.where(a <= 0, 1.0, p0)
+    p0 = np.where(stable, p0, 0.0)
+    res = {"rho": rho, "a": a, "p0": p0, "erlang_b": b, "erlang_c": erlang_c,
+           "L": Lq + a, "Lq": Lq, "W": Wq + 1.0 / mu, "Wq": Wq}
+    return _exponential_wq_percentiles(res, erlang_c, c * mu - lambd, stable)
+
+
+# ----- M/M/∞ -----
+def mminf_batch(lambd, mu, n=None):
+    lambd, mu = _as_float(lambd, mu)
+    a = lambd / mu
+    res = {"rho": a, "p0": np.exp(-a), "L": a, "Lq": np.zeros_like(a),
+           "W": 1.0 / mu, "Wq": np.zeros_like(a)}
+    if n is not None:
+        n = np.asarray(n, dtype=np.int64)
+        with np.errstate(divide='ignore'):
+            log_pn = -a + np.where(n > 0, n * np.log(a), 0.0) - _log_factorial(n)
+        res["pn"] = np.exp(log_pn)
+    return res
+
+
+# ----- M/M/1/K -----
+def _mm1k_weight_scale(s, k):
+    """Fatores de R_j e π_{j+1} (ver queue_metrics.waiting) para arrays, s = ln ρ.
+
+    Com πₙ ∝ ρⁿ (n < K) e u = -|s|:
+        π_{j+1} = e^(e_j)·expm1(u)/expm1(Ku),
+        R_j     = e^(e_j se ρ < 1, senão 0)·expm1((K-1-j)u)/expm1(Ku),
+    com e_j = (j+1)s se ρ < 1 e (j+2-K)s se ρ > 1, sempre ≤ 0: nada estoura e
+    expm1 não cancela perto de ρ = 1. Em ρ = 1, R_j = (K-1-j)/K e π = 1/K.
+    """
+    zero = s == 0
+    u = -np.abs(s)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        denom = np.where(zero, k, np.expm1(k * u))
+        dens_scale = np.where(zero, 1.0 / k, np.expm1(u) / denom)
+    return zero, u, denom, dens_scale
+
+
+def _mm1k_tail_and_density(x, s, k, log_fact):
+    """P(Wq > t) e a densidade em x = μt (por unidade de x), elemento a elemento.
+
+    Mesma soma de queue_metrics.waiting: só a janela x ± (12√x + 12) de j, limitada
+    a 0..K-2, entra; o laço é sobre a posição na janela, não sobre os elementos.
+    """
+    zero, u, denom, dens_scale = _mm1k_weight_scale(s, k)
+    low = s < 0
+    lx = np.log(x)
+    spread = 12 * np.sqrt(x) + 12
+    lo = np.maximum(np.floor(x - spread), 0.0)
+    hi = np.minimum(np.floor(x + spread) + 1, k - 2)
+    tail = np.zeros_like(x)
+    dens = np.zeros_like(x)
+    for i in range(int((hi - lo).max()) + 1 if x.size else 0):
+        j = lo + i
+        on = j <= hi
+        j = np.where(on, j, 0.0)
+        log_term = np.where(on, -x + j * lx - log_fact[j.astype(np.int64)], -np.inf)
+        e = np.where(low, (j + 1) * s, (j + 2 - k) * s)
+        m = k - 1 - j
+        tail += np.exp(np.where(low, log_term + e, log_term)) * np.where(zero, m, np.expm1(m * u))
+        dens += np.exp(log_term + e)
+    return tail / denom, dens * dens_scale
+
+
+def _mm1k_tail_at_zero(s, k):
+    """R_0 = P(Wq > 0) para arrays de s = ln ρ e K."""
+    zero, u, denom, _ = _mm1k_weight_scale(s, k)
+    with np.errstate(over='ignore'):
+        return np.where(s < 0, np.exp(s), 1.0) * np.where(zero, k - 1, np.expm1((k - 1) * u)) / denom
+
+
+def _mm1k_wq_percentiles_unit(s, k, ps=WAIT_PERCENTILES, tol=1e-10):
+    """Percentis de Wq com μ = 1 para arrays de s = ln ρ e K (inteiro ≥ 2).
+
+    Newton com bisseção de segurança, como mm1k_wq_percentiles, mas em todos os
+    elementos ao mesmo tempo; cada iteração só reavalia os que não convergiram.
+    """
+    log_fact = _log_factorial(np.arange(max(int(k.max()) - 1, 1)))
+    R0 = _mm1k_tail_at_zero(s, k)
+    out = []
+    for p in ps:
+        target = 1 - p
+        x = np.zeros_like(s)
+        idx = np.flatnonzero(R0 > target)
+        lo = np.zeros(idx.size)
+        hi = k[idx].copy()
+        grow = np.ones(idx.size, dtype=bool)
+        while grow.any():
+            g = np.flatnonzero(grow)
+            tail = _mm1k_tail_and_density(hi[g], s[idx[g]], k[idx[g]], log_fact)[0]
+            up = tail > target
+            lo[g[up]] = hi[g[up]]
+            hi[g[up]] *= 2
+            grow[g[~up]] = False
+        t = 0.5 * (lo + hi)
+        for _ in range(100):
+            if not idx.size:
+                break
+            tail, dens = _mm1k_tail_and_density(t, s[idx], k[idx], log_fact)
+            above = tail > target
+            lo = np.where(above, t, lo)
+            hi = np.where(above, hi, t)
+            with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+                t_new = t + np.where(dens > 0, (tail - target) / dens, 0.0)
+            t_new = np.where((lo < t_new) & (t_new < hi), t_new, 0.5 * (lo + hi))
+            done = np.abs(t_new - t) <= tol * np.maximum(1.0, t)
+            x[idx] = t_new
+            keep = ~done
+            idx, t, lo, hi = idx[keep], t_new[keep], lo[keep], hi[keep]
+        out.append(x)
+    return out
+
+
+def _mm1k_wq_percentiles(res, rho, mu, k):
+    """Percentis de Wq do M/M/1/K. Como t(ρ, μ, K) = t(ρ, 1, K) / μ, a busca roda
+    uma vez por par (ρ, K) distinto, vetorizada sobre os pares."""
+    valid = np.isfinite(rho) & np.isfinite(mu) & (mu > 0) & (rho >= 0) & (k >= 0)
+    pairs = np.stack([np.where(valid, rho, 0.0).ravel(),
+                      np.floor(np.where(valid & np.isfinite(k), k, 0.0)).ravel()], axis=1)
+    unique, inverse = np.unique(pairs, axis=0, return_inverse=True)
+    table = np.zeros((len(unique), len(WAIT_PERCENTILES)))
+    busy = (unique[:, 0] > 0) & (unique[:, 1] >= 2)
+    if busy.any():
+        s = np.log(unique[busy, 0])
+        for j, x in enumerate(_mm1k_wq_percentiles_unit(s, unique[busy, 1])):
+            table[busy, j] = x
+    for j, p in enumerate(WAIT_PERCENTILES):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = table[inverse.ravel(), j].reshape(rho.shape) / mu
+        res[percentile_key(p)] = np.where(valid, t, np.nan)
+    return res
+
+def mm1k_batch(lambd, mu, k, n=None, percentiles=True):
+    """M/M/1/K vetorizado.
+
+    Para ρ > 1 usa a simetria n -> K - n com q = 1/ρ, evitando que ρ^(K+1)
+    estoure para K grande: P₀(ρ) = Pₖ(q), Pₖ(ρ) = P₀(q) e L(ρ) = K - L(q).
+    Com percentiles=False a busca dos percentis de Wq (a parte cara) é pulada.
+    """
+    lambd, mu = _as_float(lambd, mu)
+    lambd, mu, k = np.broadcast_arrays(lambd, mu, np.asarray(k, dtype=float))
+    rho = lambd / mu
+    high = rho > 1
+    q = np.where(high, 1.0 / rho, rho)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x = k * np.log(q)
+        series = (q > 0) & (np.abs(x) <= 1.0)
+        qk = q ** k
+        qk1 = qk * q
+        p0_q = np.array((1 - q) / (1 - qk1), dtype=float)
+        L_q = np.array(q * (1 - (k + 1) * qk + k * qk1) / ((1 - q) * (1 - qk1)), dtype=float)
+    # Perto de ρ = 1: mesma série em x = K·ln q de queue_metrics.models.
+    for kk in np.unique(k[series]):
+        sel = series & (k == kk)
+        a, b = _mm1k_series_coeffs(int(kk))
+        S = np.polyval(a[::-1], x[sel])
+        p0_q[sel] = 1.0 / S
+        L_q[sel] = kk * np.polyval(b[::-1], x[sel]) / S
+    p0 = np.where(high, p0_q * qk, p0_q)
+    pk = np.where(high, p0_q, p0_q * qk)
+    L = np.where(high, k - L_q, L_q)
+    lambda_eff = lambd * (1 - pk)
+    Lq = L - (1 - p0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        W = np.where(lambda_eff > 0, L / lambda_eff, 1.0 / mu)
+        Wq = np.where(lambda_eff > 0, Lq / lambda_eff, 0.0)
+    res = {"rho": rho, "p0": p0, "pk": pk, "lambda_eff": lambda_eff,
+           "L": L, "Lq": Lq, "W": W, "Wq": Wq}
+    if percentiles:
+        _mm1k_wq_percentiles(res, rho, mu, k)
+    if n is not None:
+        n = np.asarray(n, dtype=float)
+        pn = np.where(high, p0_q * q ** (k - n), p0_q * q ** n)
+        res["pn"] = np.where(n > k, 0.0, pn)
+    return res
+
+
+# ----- M/G/1, M/D/1 e G/G/c -----
+def mg1_batch(lambd, mu, cs):
+    """M/G/1 (Pollaczek–Khinchine) vetorizado; cs pode variar por cenário."""
+    lambd, mu, cs = _as_float(lambd, mu, cs)
+    rho = lambd / mu
+    stable = rho < 1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        Lq = np.where(stable, rho * rho * (1 + cs * cs) / (2 * (1 - rho)), INF)
+        Wq = np.where(stable, np.where(lambd > 0, Lq / lambd, 0.0), INF)
+    return {"rho": rho, "p0": np.maximum(1 - rho, 0.0),
+            "L": Lq + rho, "Lq": Lq, "W": Wq + 1.0 / mu, "Wq": Wq}
+
+
+def md1_batch(lambd, mu):
+    return mg1_batch(lambd, mu, 0.0)
+
+
+def ggc_batch(lambd, mu, c, ca, cs):
+    """G/G/c (Allen–Cunneen) vetorizado sobre mmc_batch."""
+    res = mmc_batch(lambd, mu, c)
+    ca, cs = _as_float(ca, cs)
+    stable = res["rho"] < 1
+    Wq = np.where(stable, res["Wq"] * (ca * ca + cs * cs) / 2, INF)
+    lambd, mu = _as_float(lambd, mu)
+    Lq = np.where(stable, lambd * Wq, INF)
+    return {"rho": res["rho"], "a": res["a"], "erlang_c": res["erlang_c"],
+            "L": Lq + res["a"], "Lq": Lq, "W": Wq + 1.0 / mu, "Wq": Wq}
+
+
+BATCH_SOLVERS = {
+    "M/M/1": (mm1_batch, ["lambda", "mu"]),
+    "M/M/c": (mmc_batch, ["lambda", "mu", "c"]),
+    "M/M/∞": (mminf_batch, ["lambda", "mu"]),
+    "M/M/1/K": (mm1k_batch, ["lambda", "mu", "k"]),
+    "M/G/1": (mg1_batch, ["lambda", "mu", "cs"]),
+    "M/D/1": (md1_batch, ["lambda", "mu"]),
+    "G/G/c (Allen–Cunneen)": (ggc_batch, ["lambda", "mu", "c", "ca", "cs"]),
+}
+
+
+_MODELS_WITH_N = ("M/M/1", "M/M/∞", "M/M/1/K")
+_MODELS_WITH_PERCENTILE_SEARCH = ("M/M/1/K",)
+
+
+def solve_batch(model_key, param_values, percentiles=True):
+    """Avalia um modelo sobre arrays. 'param_values' usa as mesmas chaves da GUI
+    (lambda, mu, c, k, n, ca, cs); 'n' é opcional. Com percentiles=False os
+    modelos sem percentis em forma fechada (M/M/1/K) não calculam Wq_p*."""
+    solver, solver_params = BATCH_SOLVERS[model_key]
+    args = [param_values[p] for p in solver_params]
+    kwargs = {"n": param_values["n"]} if "n" in param_values and model_key in _MODELS_WITH_N else {}
+    if not percentiles and model_key in _MODELS_WITH_PERCENTILE_SEARCH:
+        kwargs["percentiles"] = False
+    return solver(*args, **kwargs)
+
+
+# -------------------------------------------------------------------
+# Fórmulas personalizadas sobre arrays
+# -------------------------------------------------------------------
+def _log(x, base=None):
+    return np.log(x) if base is None else np.log(x) / np.log(base)
+
+def _factorial(x):
+    """n! elemento a elemento (como math.factorial, só aceita inteiros ≥ 0).
+
+    Usa uma tabela acumulada até max(n); acima de 170 o resultado é inf.
+    """
+    x = np.asarray(x, dtype=float)
+    if np.any(x < 0) or np.any(x != np.floor(x)):
+        raise ValueError("factorial() only accepts integral values")
+    n_max = int(min(x.max(), 171)) if x.size else 0
+    table = np.ones(n_max + 1)
+    if n_max > 0:
+        with np.errstate(over='ignore'):
+            np.cumprod(np.arange(1, n_max + 1, dtype=float), out=table[1:])
+    return table[np.minimum(x, n_max).astype(np.int64)]
+
+# Equivalentes vetorizados de ALLOWED_MATH (ver queue_metrics.formulas).
+VECTOR_GLOBALS = {
+    "__builtins__": {},
+    'log': _log, 'log10': np.log10, 'exp': np.exp, 'sqrt': np.sqrt,
+    'pow': np.power, 'factorial': _factorial,
+    'sin': np.sin, 'cos': np.cos, 'tan': np.tan,
+    'asin': np.arcsin, 'acos': np.arccos, 'atan': np.arctan,
+    'pi': np.pi, 'e': np.e,
+    '_float': lambda x: np.asarray(x, dtype=float),
+}
+
+def _metric_arrays(scope):
+    """Métricas de METRIC_NAMES sobre os arrays do escopo (um mmc_batch; c = 1 se ausente)."""
+    from queue_metrics.formulas import METRIC_NAMES
+    res = mmc_batch(scope['lambd'], scope['mu'], scope.get('c', 1))
+    return {name: res[key] for name, key in METRIC_NAMES.items()}
+
+def evaluate_formula_batch(expr, param_arrays):
+    """Avalia uma fórmula personalizada sobre arrays de lambd, mu, c, k, n numa única chamada.
+
+    Reaproveita o code object validado de compile_expression; os parâmetros
+    são convertidos para float e combinados com broadcasting.
+    """
+    from queue_metrics.formulas import METRIC_NAMES, compile_expression
+    code = compile_expression(expr)
+    names = list(param_arrays)
+    arrays = np.broadcast_arrays(*[np.asarray(param_arrays[p], dtype=float) for p in names])
+    scope = dict(zip(names, arrays))
+    if not METRIC_NAMES.keys().isdisjoint(code.co_names):
+        scope.update(_metric_arrays(scope))
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        return np.broadcast_to(eval(code, VECTOR_GLOBALS, scope), arrays[0].shape if arrays else ())
+
+def evaluate_formulas_batch(formulas, param_arrays):
+    """Avalia todas as fórmulas salvas; devolve {label: array}. Fórmulas cujos
+    parâmetros não foram fornecidos ou que falham recebem a exceção como valor.
+
+    As subexpressões repetidas entre as fórmulas (queue_metrics.optimizer) são
+    calculadas uma única vez sobre os arrays, assim como as métricas do M/M/c
+    e as fórmulas usadas por outras.
+    """
+    from queue_metrics.optimizer import program_for
+    names = list(param_arrays)
+    arrays = np.broadcast_arrays(*[np.asarray(param_arrays[p], dtype=float) for p in names])
+    shape = arrays[0].shape if arrays else ()
+
+    def run(code, scope):
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            return np.broadcast_to(eval(code, VECTOR_GLOBALS, scope), shape)
+
+    results = {}
+    for i, result in program_for(formulas).iter_results(dict(zip(names, arrays)), run=run,
+                                                        metrics=_metric_arrays):
+        results[formulas[i]["label"]] = result
+    return results
@@ -0,0 +1,121 @@
+# Cache de resultados para avaliações repetidas de (modelo, parâmetros).
+#
+# LRU limitado por 'maxsize' e, opcionalmente, com validade ('ttl', em
+# segundos). A chave é o nome do modelo mais os parâmetros normalizados: só
+# entram os parâmetros que o modelo usa, taxas viram float e c/k/n viram int,
+# de modo que {"lambda": 4, "mu": 5} e {"lambda": "4.0", "mu": 5.0, "c": 3}
+# caem na mesma entrada para o M/M/1.
+
+import collections
+import threading
+import time
+
+from queue_metrics.models import MODELS_CONFIG, solve_model
+
+DEFAULT_MAXSIZE = 4096
+INT_PARAMS = ('c', 'k', 'n')
+
+
+def make_key(model_key, param_values):
+    config = MODELS_CONFIG[model_key]
+    names = list(config.get("params", {})) + list(config.get("optional_params", {}))
+    items = []
+    for name in names:
+        if name in param_values:
+            value = param_values[name]
+            items.append((name, int(float(value)) if name in INT_PARAMS else float(value)))
+    return (model_key, tuple(items))
+
+
+class ResultCache:
+    """Cache LRU/TTL na frente de solve_model, com contadores de uso."""
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, ttl=None, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        """Devolve o valor em cache ou None (contando acerto/falta)."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, stored_at = entry
+                if self.ttl is not None and self._clock() - stored_at > self.ttl:
+                    del self._data[key]
+                    self.expirations += 1
+                else:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = (value, self._clock())
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def solve(self, model_key, param_values):
+        """solve_model com cache. Devolve uma cópia do dicionário de métricas."""
+        key = make_key(model_key, param_values)
+        result = self.get(key)
+        if result is None:
+            result = solve_model(model_key, param_values)
+            self.put(key, result)
+        return dict(result)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def info(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data), "maxsize": self.maxsize, "ttl": self.ttl,
+            "hits": self.hits, "misses": self.misses,
+            "evictions": self.evictions, "expirations": self.expirations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+# Cache compartilhado do processo (GUI, CLI e cada worker de parallel_map).
+_default_cache = None
+
+def default_cache(maxsize=DEFAULT_MAXSIZE, ttl=None):
+    """Devolve o cache do processo, criando-o na primeira chamada."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResultCache(maxsize, ttl)
+    return _default_cache
+
+COUNTER_NAMES = ("hits", "misses", "evictions", "expirations")
+
+def cache_counters():
+    """Contadores do cache do processo (zeros se ainda não foi criado).
+
+    Usado por parallel_map para somar os caches de cada worker."""
+    cache = _default_cache
+    return {name: getattr(cache, name) if cache is not None else 0 for name in COUNTER_NAMES}
+
+def format_counters(counters):
+    """Linha de resumo dos contadores (de info() ou somados de vários processos)."""
+    lookups = counters["hits"] + counters["misses"]
+    rate = counters["hits"] / lookups if lookups else 0.0
+    return (f"cache: {counters['hits']} acerto(s), {counters['misses']} falta(s), "
+            f"{counters['evictions']} despejo(s), taxa de acerto {rate:.1%}")
+
+def cached_solve_model(model_key, param_values):
+    return default_cache().solve(model_key, param_values)
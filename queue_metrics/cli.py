@@ -0,0 +1,357 @@
+# Modo de linha de comando: avalia cenários em lote a partir de CSV/JSONL.
+#
+#   python -m queue_metrics batch cenarios.csv -o resultados.csv
+#   cat cenarios.jsonl | python -m queue_metrics batch - --output-format jsonl
+#
+# A entrada é lida como um fluxo (uma linha por vez) e cada resultado é
+# escrito assim que calculado, então a memória usada não depende do tamanho
+# do arquivo.
+
+import argparse
+import csv
+import functools
+import itertools
+import json
+import os
+import sys
+
+from queue_metrics.models import MODELS_CONFIG, NONNEGATIVE_PARAMS, solve_model
+
+# Aceita os nomes usados na GUI, nas fórmulas e os símbolos.
+FIELD_ALIASES = {
+    'lambda': 'lambda', 'lambd': 'lambda', 'λ': 'lambda',
+    'mu': 'mu', 'μ': 'mu',
+    'c': 'c', 'k': 'k', 'n': 'n', 'ca': 'ca', 'cs': 'cs',
+}
+INT_PARAMS = ('c', 'k', 'n')
+INPUT_FIELDS = ['model', 'lambda', 'mu', 'c', 'k', 'n', 'ca', 'cs']
+# Chave interna do registro de uma linha que não pôde ser lida (ver read_scenarios).
+LINE_ERROR = '_erro_linha'
+
+def _metric_keys():
+    keys = []
+    for config in MODELS_CONFIG.values():
+        for _label, key, _params in config.get("functions", []):
+            if key not in keys:
+                keys.append(key)
+    return keys
+
+METRIC_KEYS = _metric_keys()
+
+
+def _normalize_field(field):
+    return FIELD_ALIASES.get(field.strip().lower() if isinstance(field, str) else field)
+
+def parse_scenario(raw, default_model=None):
+    """Converte um registro bruto (dict de strings/números) em (modelo, param_values)."""
+    model_key = (raw.get('model') or default_model or '').strip()
+    if model_key not in MODELS_CONFIG or "solver" not in MODELS_CONFIG[model_key]:
+        raise ValueError(f"Modelo desconhecido: '{model_key}'")
+
+    param_values = {}
+    for field, value in raw.items():
+        key = _normalize_field(field)
+        if key is None or value is None or value == '':
+            continue
+        if key in INT_PARAMS:
+            param_values[key] = int(float(value))
+            if param_values[key] < 0: raise ValueError(f"Parâmetro '{key}' deve ser não-negativo.")
+        elif key in NONNEGATIVE_PARAMS:
+            param_values[key] = float(value)
+            if param_values[key] < 0: raise ValueError(f"Parâmetro '{key}' deve ser não-negativo.")
+        else:
+            param_values[key] = float(value)
+            if param_values[key] <= 0: raise ValueError(f"Taxa '{key}' deve ser positiva.")
+
+    config = MODELS_CONFIG[model_key]
+    missing = [p for p in config["params"] if p not in param_values]
+    if missing:
+        raise ValueError(f"Parâmetros obrigatórios faltando: {', '.join(missing)}")
+    return model_key, param_values
+
+
+def evaluate_scenario(raw, default_model=None, cache_size=None, cache_ttl=None):
+    """Avalia um cenário e devolve o registro de saída (entrada + métricas ou 'error').
+
+    Com 'cache_size', os resultados passam pelo cache LRU do processo
+    (queue_metrics.cache), útil quando os mesmos cenários se repetem.
+    """
+    record = dict.fromkeys(INPUT_FIELDS, '')
+    record['model'] = raw.get('model', '')
+    for field, value in raw.items():
+        key = _normalize_field(field)
+        if key is not None:
+            record[key] = value
+    try:
+        if LINE_ERROR in raw:
+            raise ValueError(raw[LINE_ERROR])
+        model_key, param_values = parse_scenario(raw, default_model)
+        record['model'] = model_key
+        if cache_size:
+            from queue_metrics.cache import default_cache
+            record.update(default_cache(cache_size, cache_ttl).solve(model_key, param_values))
+        else:
+            record.update(solve_model(model_key, param_values))
+        record['error'] = ''
+    except Exception as e:
+        record['error'] = str(e)
+    return record
+
+
+# -------------------------------------------------------------------
+# Leitura e escrita em fluxo
+# -------------------------------------------------------------------
+def _sniff_format(path, stream):
+    """Decide entre 'csv' e 'jsonl' pela extensão ou pela primeira linha.
+
+    Devolve (formato, linhas) onde 'linhas' reinsere a linha já consumida.
+    """
+    lower = path.lower()
+    if lower.endswith(('.jsonl', '.ndjson', '.json')):
+        return 'jsonl', stream
+    if lower.endswith('.csv'):
+        return 'csv', stream
+    first = stream.readline()
+    fmt = 'jsonl' if first.lstrip().startswith('{') else 'csv'
+    return fmt, itertools.chain([first], stream)
+
+def read_scenarios(lines, fmt):
+    """Gera dicionários de cenário a partir de um iterável de linhas.
+
+    Uma linha JSONL inválida (ou que não é um objeto) não interrompe o fluxo:
+    vira um registro com LINE_ERROR, que sai com a mensagem na coluna 'error'.
+    """
+    if fmt == 'csv':
+        yield from csv.DictReader(lines)
+    else:
+        for number, line in enumerate(lines, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                raw = json.loads(line)
+            except json.JSONDecodeError as e:
+                raw = {LINE_ERROR: f"Linha {number}: JSON inválido ({e.msg})"}
+            else:
+                if not isinstance(raw, dict):
+                    raw = {LINE_ERROR: f"Linha {number}: esperado um objeto JSON, não {type(raw).__name__}"}
+            yield raw
+
+class CsvResultWriter:
+    def __init__(self, stream, fieldnames=None):
+        self._writer = csv.DictWriter(stream, fieldnames=fieldnames or INPUT_FIELDS + METRIC_KEYS + ['error'],
+                                      extrasaction='ignore', lineterminator='\n')
+        self._writer.writeheader()
+
+    def write(self, record):
+        self._writer.writerow(record)
+
+class JsonlResultWriter:
+    def __init__(self, stream, fieldnames=None):
+        self._stream = stream
+
+    def write(self, record):
+        self._stream.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+WRITERS = {'csv': CsvResultWriter, 'jsonl': JsonlResultWriter}
+
+
+def run_batch(lines, fmt, out_stream, out_fmt, default_model=None,
+              workers=1, chunksize=None, stats=None, cache_size=None, cache_ttl=None):
+    """Avalia cada cenário do fluxo e escreve o resultado imediatamente.
+
+    Com workers > 1 os cenários são distribuídos entre processos
+    (ver queue_metrics.parallel), mantendo a ordem da entrada; com cache, os
+    contadores de cada worker são somados em stats.counters.
+    """
+    writer = WRITERS[out_fmt](out_stream)
+    scenarios = read_scenarios(lines, fmt)
+    evaluate = functools.partial(evaluate_scenario, default_model=default_model,
+                                 cache_size=cache_size, cache_ttl=cache_ttl)
+    if workers > 1:
+        from queue_metrics.parallel import parallel_map
+        counters = None
+        if cache_size:
+            from queue_metrics.cache import cache_counters as counters
+        records = parallel_map(evaluate, scenarios, workers=workers,
+                               chunksize=chunksize, stats=stats, counters=counters)
+    else:
+        records = map(evaluate, scenarios)
+    count = 0
+    for record in records:
+        writer.write(record)
+        count += 1
+    return count
+
+
+# -------------------------------------------------------------------
+# Séries de λ por intervalo (SIPP)
+# -------------------------------------------------------------------
+PERIOD_LABELS = ('period', 'periodo', 'período', 'inicio', 'início', 'time')
+PERIOD_FIELDS = ['period'] + INPUT_FIELDS + METRIC_KEYS + ['error']
+
+def _series_value(text, convert):
+    """Converte um campo da série; se não for numérico, devolve o texto para
+    que o intervalo saia com erro (ver queue_metrics.periods) sem parar a série."""
+    try:
+        return convert(text)
+    except (TypeError, ValueError):
+        return text.strip() if isinstance(text, str) else text
+
+def read_series(lines):
+    """Lê a série de intervalos: CSV com a coluna lambda (e, opcionais, c e um
+    rótulo de período) ou um λ por linha, sem cabeçalho.
+
+    Devolve (tem_c, gerador de (rótulo, λ, c)); sem rótulo, usa o índice.
+    """
+    lines = iter(lines)
+    first = next(lines, '')
+    try:
+        float(first.strip())
+    except ValueError:
+        pass
+    else:
+        values = (line.strip() for line in itertools.chain([first], lines))
+        return False, ((i, _series_value(v, float), None) for i, v in enumerate(v for v in values if v))
+
+    reader = csv.DictReader(itertools.chain([first], lines))
+    fields = {_normalize_field(f): f for f in reader.fieldnames or []}
+    if 'lambda' not in fields:
+        raise ValueError("A série precisa de uma coluna 'lambda'.")
+    label = next((f for f in reader.fieldnames if f.strip().lower() in PERIOD_LABELS), None)
+    has_c = 'c' in fields
+
+    def rows():
+        for i, row in enumerate(reader):
+            c = _series_value(row[fields['c']], lambda v: int(float(v))) if has_c else None
+            yield (row[label] if label else i), _series_value(row[fields['lambda']], float), c
+    return has_c, rows()
+
+
+def run_periods(lines, out_stream, out_fmt, model_key, params, block=None):
+    """Avalia a série intervalo a intervalo (ver queue_metrics.periods) e
+    escreve cada resultado assim que o bloco correspondente é calculado."""
+    from queue_metrics.periods import DEFAULT_BLOCK, evaluate_periods
+
+    has_c, rows = read_series(lines)
+    labels, lambdas, servers = itertools.tee(rows, 3)
+    results = evaluate_periods(model_key, (lambd for _, lambd, _ in lambdas), params,
+                               servers=(c for _, _, c in servers) if has_c else None,
+                               block=block or DEFAULT_BLOCK)
+    writer = WRITERS[out_fmt](out_stream, PERIOD_FIELDS)
+    count = 0
+    for (label, _, _), record in zip(labels, results):
+        record = {'model': model_key, **params, **record}
+        record['period'] = label
+        writer.write(record)
+        count += 1
+    return count
+
+
+# -------------------------------------------------------------------
+# Ponto de entrada
+# -------------------------------------------------------------------
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m queue_metrics",
+        description="Calculadora de Teoria das Filas em modo de linha de comando.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    batch = sub.add_parser("batch", help="Avalia cenários de um arquivo CSV/JSONL (ou stdin).")
+    batch.add_argument("input", nargs="?", default="-",
+                       help="Arquivo de cenários (colunas: model, lambda, mu, c, k, n, ca, cs). '-' = stdin.")
+    batch.add_argument("-o", "--output", default="-", help="Arquivo de saída. '-' = stdout.")
+    batch.add_argument("--input-format", choices=["csv", "jsonl"],
+                       help="Formato da entrada (padrão: pela extensão ou pela primeira linha).")
+    batch.add_argument("--output-format", choices=["csv", "jsonl"],
+                       help="Formato da saída (padrão: pela extensão, ou csv).")
+    batch.add_argument("--model", choices=[k for k, v in MODELS_CONFIG.items() if "solver" in v],
+                       help="Modelo usado quando o cenário não tem a coluna 'model'.")
+    batch.add_argument("-j", "--workers", type=int, default=1,
+                       help="Nº de processos (padrão: 1; 0 = todos os núcleos).")
+    batch.add_argument("--chunksize", type=int,
+                       help="Cenários por tarefa enviada aos processos (padrão: automático).")
+    batch.add_argument("--cache-size", type=int,
+                       help="Ativa o cache LRU de resultados com este nº máximo de entradas (por processo).")
+    batch.add_argument("--cache-ttl", type=float,
+                       help="Validade das entradas do cache, em segundos.")
+
+    periods = sub.add_parser("periods", help="Avalia uma série de λ por intervalo (ex.: a cada 15 min).")
+    periods.add_argument("input", nargs="?", default="-",
+                         help="Série: CSV com colunas lambda [, c] [, period] ou um λ por linha. '-' = stdin.")
+    periods.add_argument("-o", "--output", default="-", help="Arquivo de saída. '-' = stdout.")
+    periods.add_argument("--output-format", choices=["csv", "jsonl"],
+                         help="Formato da saída (padrão: pela extensão, ou csv).")
+    periods.add_argument("--model", required=True, choices=[k for k, v in MODELS_CONFIG.items() if "solver" in v],
+                         help="Modelo avaliado em cada intervalo.")
+    periods.add_argument("--mu", type=float, required=True, help="Taxa de serviço (μ) por servidor.")
+    periods.add_argument("--c", type=int, help="Nº de servidores, quando a série não tem a coluna 'c'.")
+    periods.add_argument("--k", type=int, help="Capacidade do sistema (K).")
+    periods.add_argument("--ca", type=float, help="Coeficiente de variação das chegadas.")
+    periods.add_argument("--cs", type=float, help="Coeficiente de variação do serviço.")
+    periods.add_argument("--block", type=int, help="Intervalos por avaliação vetorizada.")
+    return parser
+
+def _open_input(path):
+    return sys.stdin if path == '-' else open(path, 'r', encoding='utf-8', newline='')
+
+def _open_output(path):
+    return sys.stdout if path == '-' else open(path, 'w', encoding='utf-8', newline='')
+
+def cmd_batch(args):
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    stats = None
+    if workers > 1:
+        from queue_metrics.parallel import SweepStats
+        stats = SweepStats()
+    in_stream = _open_input(args.input)
+    out_stream = _open_output(args.output)
+    try:
+        if args.input_format:
+            fmt, lines = args.input_format, in_stream
+        else:
+            fmt, lines = _sniff_format(args.input, in_stream)
+        out_fmt = args.output_format or ('jsonl' if args.output.lower().endswith(('.jsonl', '.ndjson')) else 'csv')
+        count = run_batch(lines, fmt, out_stream, out_fmt, args.model,
+                          workers=workers, chunksize=args.chunksize, stats=stats,
+                          cache_size=args.cache_size, cache_ttl=args.cache_ttl)
+    finally:
+        out_stream.flush()
+        if args.output != '-':
+            out_stream.close()
+        if args.input != '-':
+            in_stream.close()
+    print(f"{count} cenário(s) avaliado(s).", file=sys.stderr)
+    if stats is not None:
+        print(stats.summary(), file=sys.stderr)
+    if args.cache_size:
+        from queue_metrics.cache import default_cache, format_counters
+        counters = stats.counters if stats is not None else default_cache().info()
+        print(format_counters(counters), file=sys.stderr)
+    return 0
+
+def cmd_periods(args):
+    params = {key: getattr(args, key) for key in ('mu', 'c', 'k', 'ca', 'cs')
+              if getattr(args, key) is not None}
+    in_stream = _open_input(args.input)
+    out_stream = _open_output(args.output)
+    try:
+        out_fmt = args.output_format or ('jsonl' if args.output.lower().endswith(('.jsonl', '.ndjson')) else 'csv')
+        count = run_periods(in_stream, out_stream, out_fmt, args.model, params, args.block)
+    except ValueError as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+    finally:
+        out_stream.flush()
+        if args.output != '-':
+            out_stream.close()
+        if args.input != '-':
+            in_stream.close()
+    print(f"{count} intervalo(s) avaliado(s).", file=sys.stderr)
+    return 0
+
+COMMANDS = {"batch": cmd_batch, "periods": cmd_periods}
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return COMMANDS[args.command](args)
@@ -0,0 +1,57 @@
+# Grafo de dependências entre os parâmetros de entrada e as linhas da tabela.
+#
+# Cada linha de resultado de um modelo declara em MODELS_CONFIG os parâmetros
+# de que depende ('params_needed'); cada fórmula personalizada, a sua lista
+# 'params', somada aos parâmetros das fórmulas e métricas que ela usa
+# (FormulaProgram.depends). Invertendo essas listas obtém-se, para cada parâmetro, as linhas
+# que precisam ser refeitas quando ele muda. Isso permite recalcular ao vivo
+# só o que mudou: ao editar n, por exemplo, apenas P(n) é atualizado.
+
+from queue_metrics.models import MODELS_CONFIG
+from queue_metrics.optimizer import program_for
+
+CUSTOM_MODEL = "Personalizado"
+
+
+def formula_row_id(index):
+    return f"formula-{index}"
+
+
+def metric_rows(model_key, custom_formulas=()):
+    """Linhas da tabela do modelo, na ordem de exibição: [(row_id, label, params)].
+
+    Para os modelos padrão o row_id é a chave da métrica (ex.: 'Wq'); para o
+    modelo Personalizado, 'formula-<i>' (a posição da fórmula na lista salva).
+    """
+    if model_key == CUSTOM_MODEL:
+        depends = program_for(custom_formulas).depends
+        return [(formula_row_id(i), f["label"], sorted(depends[i])) for i, f in enumerate(custom_formulas)]
+    return [(key, label, list(params)) for label, key, params in MODELS_CONFIG[model_key].get("functions", [])]
+
+
+def dependency_graph(rows):
+    """Grafo invertido {parâmetro: {row_id, ...}} a partir de metric_rows()."""
+    graph = {}
+    for row_id, _label, params in rows:
+        for p in params:
+            graph.setdefault(p, set()).add(row_id)
+    return graph
+
+
+def changed_params(old_values, new_values):
+    """Parâmetros cujo valor mudou (incluindo os que surgiram ou foram apagados)."""
+    return {p for p in set(old_values) | set(new_values) if old_values.get(p) != new_values.get(p)}
+
+
+def affected_rows(rows, old_values, new_values, graph=None):
+    """row_ids (na ordem de exibição) que dependem de algum parâmetro alterado.
+
+    Sem valores anteriores (old_values = None), todas as linhas são afetadas.
+    """
+    if old_values is None:
+        return [row_id for row_id, _label, _params in rows]
+    graph = dependency_graph(rows) if graph is None else graph
+    dirty = set()
+    for p in changed_params(old_values, new_values):
+        dirty |= graph.get(p, set())
+    return [row_id for row_id, _label, _params in rows if row_id in dirty]
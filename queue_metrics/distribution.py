@@ -0,0 +1,142 @@
+# Distribuição completa do nº de clientes no sistema: P(0..N), CDF e caudas.
+#
+# Em vez de chamar P(n) N vezes, cada modelo preenche um vetor pré-alocado
+# em um único passo. P₀ (o termo caro, com Erlang B no M/M/c) é calculado uma
+# vez e cada P(n) sai de log P(n) = log P₀ + log(razão acumulada), o que evita
+# estouros de aⁿ, n! e ρⁿ mesmo para N, c ou K grandes, sem acumular erro de
+# arredondamento ao longo do vetor:
+#   M/M/1   : P(n) = P₀ ρⁿ
+#   M/M/c   : P(n) = P₀ aⁿ/n!  (n ≤ c),   P₀ aᶜ/c! ρⁿ⁻ᶜ  (n > c)
+#   M/M/∞   : P(n) = e⁻ᵃ aⁿ/n!
+#   M/M/1/K : P(n) = P₀ ρⁿ  (n ≤ K),    0 acima de K
+
+import bisect
+import math
+
+from queue_metrics.models import mmc_erlangB, _mmc_log_p0
+
+SUPPORTED_MODELS = ("M/M/1", "M/M/c", "M/M/∞", "M/M/1/K")
+
+
+def _exp(x):
+    return math.exp(x) if x > -745 else 0.0
+
+
+def _log(x):
+    return math.log(x) if x > 0 else -math.inf
+
+
+def _nlog(n, log_x):
+    # n log x, com 0 log 0 = 0 (P(0) quando λ = 0) em vez de 0 * -inf = nan
+    return n * log_x if n else 0.0
+
+
+def _mm1k_log_p0(rho, k):
+    if abs(rho - 1.0) < 1e-9:
+        return -math.log(k + 1)
+    if rho < 1:
+        return math.log1p(-rho) - math.log1p(-rho ** (k + 1))
+    # ρ > 1: P₀ = (ρ - 1) / (ρ^(K+1) - 1), sem calcular ρ^(K+1)
+    lr = math.log(rho)
+    return math.log(rho - 1) - (k + 1) * lr - math.log1p(-math.exp(-(k + 1) * lr))
+
+
+def _log_pmf_plan(model_key, param_values):
+    """Devolve (log P(n), n_limite, razão_geométrica, início_geométrico, moda).
+
+    Acima de 'n_limite' P(n) = 0. 'razão_geométrica' é ρ quando a cauda a
+    partir de 'início_geométrico' é geométrica (para somar o resto
+    analiticamente) e None caso contrário. Depois da 'moda' P(n) só decresce.
+    """
+    lambd, mu = param_values["lambda"], param_values["mu"]
+    if model_key == "M/M/1":
+        rho = lambd / mu
+        if rho >= 1: raise ValueError("M/M/1 instável (ρ ≥ 1): não há distribuição estacionária.")
+        log_p0, lr = math.log1p(-rho), _log(rho)
+        return (lambda n: log_p0 + _nlog(n, lr)), None, rho, 0, 0
+    if model_key == "M/M/c":
+        c = param_values["c"]
+        a = lambd / mu
+        rho = a / c
+        if rho >= 1: raise ValueError("M/M/c instável (ρ ≥ 1): não há distribuição estacionária.")
+        log_p0 = _mmc_log_p0(a, c, rho, mmc_erlangB(lambd, mu, c))
+        la, lr = _log(a), _log(rho)
+        log_pc = log_p0 + c * la - math.lgamma(c + 1)
+        return (lambda n: log_p0 + _nlog(n, la) - math.lgamma(n + 1) if n <= c
+                else log_pc + (n - c) * lr), None, rho, c, math.floor(a)
+    if model_key == "M/M/∞":
+        a = lambd / mu
+        la = _log(a)
+        return (lambda n: -a + _nlog(n, la) - math.lgamma(n + 1)), None, None, None, math.floor(a)
+    if model_key == "M/M/1/K":
+        k = param_values["k"]
+        rho = lambd / mu
+        log_p0, lr = _mm1k_log_p0(rho, k), _log(rho)
+        return (lambda n: log_p0 + _nlog(n, lr)), k, None, None, k if rho > 1 else 0
+    raise ValueError(f"Distribuição não disponível para o modelo '{model_key}'.")
+
+
+def state_distribution(model_key, param_values, n_max):
+    """P(0..n_max) do nº de clientes no sistema, num vetor pré-alocado."""
+    log_pmf, n_limit = _log_pmf_plan(model_key, param_values)[:2]
+    pmf = [0.0] * (n_max + 1)
+    top = n_max if n_limit is None else min(n_max, n_limit)
+    for n in range(top + 1):
+        pmf[n] = _exp(log_pmf(n))
+    return pmf
+
+
+def _mass_beyond(log_pmf, n_max, n_limit, geometric, geometric_from, mode):
+    """P(N > n_max), somada termo a termo em vez de 1 - Σ P(n) (que se anula
+    por cancelamento nas caudas pequenas).
+
+    Os termos são somados até ficarem desprezíveis depois da moda (ou até
+    'n_limite'); se a cauda vira geométrica (n ≥ início_geométrico), o resto
+    é P(n) / (1 - ρ).
+    """
+    beyond = 0.0
+    n = n_max + 1
+    while n_limit is None or n <= n_limit:
+        term = _exp(log_pmf(n))
+        if geometric is not None and n >= geometric_from:
+            return beyond + term / (1 - geometric)
+        beyond += term
+        if n > mode and term <= beyond * 1e-17:
+            break
+        n += 1
+    return beyond
+
+
+def distribution(model_key, param_values, n_max):
+    """Calcula pmf, CDF e cauda P(N > n) para n = 0..n_max.
+
+    A CDF é acumulada junto com a pmf; a cauda é somada de trás para frente,
+    a partir da massa além de n_max (também somada diretamente, ver
+    _mass_beyond), o que preserva precisão nas caudas pequenas.
+    """
+    log_pmf, n_limit, geometric, geometric_from, mode = _log_pmf_plan(model_key, param_values)
+    pmf = [0.0] * (n_max + 1)
+    cdf = [0.0] * (n_max + 1)
+    tail = [0.0] * (n_max + 1)
+
+    total = 0.0
+    top = n_max if n_limit is None else min(n_max, n_limit)
+    for n in range(top + 1):
+        pmf[n] = _exp(log_pmf(n))
+        total += pmf[n]
+        cdf[n] = total
+    for n in range(top + 1, n_max + 1):
+        cdf[n] = total
+
+    acc = _mass_beyond(log_pmf, n_max, n_limit, geometric, geometric_from, mode)
+    for n in range(n_max, -1, -1):
+        tail[n] = acc
+        acc += pmf[n]
+    return {"pmf": pmf, "cdf": cdf, "tail": tail}
+
+
+def percentile(cdf, q):
+    """Menor n com P(N ≤ n) ≥ q, ou None se q não for atingido em 0..n_max."""
+    n = bisect.bisect_left(cdf, q)
+    return n if n < len(cdf) else None
+
@@ -0,0 +1,138 @@
+# Números duais para derivação automática em modo direto (forward-mode).
+#
+# Um Dual carrega o valor e o gradiente em relação às variáveis "semeadas"
+# (ex.: λ e μ). As operações aritméticas propagam a regra da cadeia, então os
+# solvers de queue_metrics.models, que só fazem contas e chamam as funções
+# abaixo (exp, log, sqrt, fsum), devolvem métricas já com as derivadas.
+# Comparações usam apenas o valor, de modo que os ramos (estável/instável,
+# ρ < 1 ou ρ > 1) seguem iguais aos do cálculo com floats.
+#
+# Dual não define __float__ de propósito: passar um Dual para math.log etc.
+# gera TypeError em vez de descartar a derivada em silêncio.
+
+import math
+
+
+class Dual:
+    __slots__ = ("value", "grad")
+
+    def __init__(self, value, grad):
+        self.value = value
+        self.grad = grad
+
+    @classmethod
+    def variables(cls, values):
+        """Cria um Dual por valor, cada um semeado na sua própria direção."""
+        n = len(values)
+        return [cls(v, tuple(1.0 if j == i else 0.0 for j in range(n))) for i, v in enumerate(values)]
+
+    def _scaled(self, value, factor):
+        return Dual(value, tuple(factor * g for g in self.grad))
+
+    def __repr__(self):
+        return f"Dual({self.value!r}, {self.grad!r})"
+
+    # --- aritmética ---
+    def __add__(self, other):
+        if isinstance(other, Dual):
+            return Dual(self.value + other.value, tuple(a + b for a, b in zip(self.grad, other.grad)))
+        return Dual(self.value + other, self.grad)
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if isinstance(other, Dual):
+            return Dual(self.value - other.value, tuple(a - b for a, b in zip(self.grad, other.grad)))
+        return Dual(self.value - other, self.grad)
+
+    def __rsub__(self, other):
+        return Dual(other - self.value, tuple(-g for g in self.grad))
+
+    def __mul__(self, other):
+        if isinstance(other, Dual):
+            u, v = self.value, other.value
+            return Dual(u * v, tuple(a * v + u * b for a, b in zip(self.grad, other.grad)))
+        return self._scaled(self.value * other, other)
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if isinstance(other, Dual):
+            u, v = self.value, other.value
+            return Dual(u / v, tuple((a * v - u * b) / (v * v) for a, b in zip(self.grad, other.grad)))
+        return self._scaled(self.value / other, 1.0 / other)
+
+    def __rtruediv__(self, other):
+        v = self.value
+        return self._scaled(other / v, -other / (v * v))
+
+    def __neg__(self):
+        return self._scaled(-self.value, -1.0)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return -self if self.value < 0 else self
+
+    def __pow__(self, other):
+        if isinstance(other, Dual):
+            return exp(other * log(self))
+        if other == 0:
+            return Dual(1.0, tuple(0.0 for _ in self.grad))
+        return self._scaled(self.value ** other, other * self.value ** (other - 1))
+
+    def __rpow__(self, other):
+        result = other ** self.value
+        return self._scaled(result, result * math.log(other) if other > 0 else 0.0)
+
+    # --- comparações (só o valor) ---
+    def __lt__(self, other): return self.value < value(other)
+    def __le__(self, other): return self.value <= value(other)
+    def __gt__(self, other): return self.value > value(other)
+    def __ge__(self, other): return self.value >= value(other)
+    def __eq__(self, other): return self.value == value(other)
+    def __ne__(self, other): return self.value != value(other)
+    __hash__ = None
+
+
+def value(x):
+    """Parte real de x (o próprio x se não for Dual)."""
+    return x.value if isinstance(x, Dual) else x
+
+
+def gradient(x, size):
+    """Gradiente de x (zeros se x for um número comum)."""
+    return x.grad if isinstance(x, Dual) else (0.0,) * size
+
+
+# --- funções elementares: math para floats, regra da cadeia para Duals ---
+def exp(x):
+    if not isinstance(x, Dual):
+        return math.exp(x)
+    e = math.exp(x.value)
+    return x._scaled(e, e)
+
+def log(x):
+    if not isinstance(x, Dual):
+        return math.log(x)
+    return x._scaled(math.log(x.value), 1.0 / x.value)
+
+def log1p(x):
+    if not isinstance(x, Dual):
+        return math.log1p(x)
+    return x._scaled(math.log1p(x.value), 1.0 / (1.0 + x.value))
+
+def sqrt(x):
+    if not isinstance(x, Dual):
+        return math.sqrt(x)
+    s = math.sqrt(x.value)
+    return x._scaled(s, 0.5 / s if s > 0 else math.inf)
+
+def fsum(values):
+    """math.fsum no valor; o gradiente é somado componente a componente."""
+    values = list(values)
+    duals = [v for v in values if isinstance(v, Dual)]
+    if not duals:
+        return math.fsum(values)
+    total = math.fsum(value(v) for v in values)
+    grad = tuple(math.fsum(g) for g in zip(*(d.grad for d in duals)))
+    return Dual(total, grad)
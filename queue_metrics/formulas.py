@@ -0,0 +1,328 @@
+# Motor das fórmulas personalizadas: persistência, validação (AST) e avaliação.
+# Não depende de Tk; quem chama decide como exibir os erros.
+#
+# A avaliação é limitada (FormulaLimits): as constantes inteiras da expressão
+# e os parâmetros viram float, então '**' e pow nunca caem na aritmética de
+# inteiros de precisão arbitrária (pow(lambd, 10**9) custa o mesmo que
+# pow(lambd, 2) e estoura para OverflowError em vez de travar); factorial só
+# aceita inteiros até 'max_factorial' (170! é o maior que cabe num float); e
+# cada fórmula tem um orçamento de tempo, verificado em factorial (a única
+# função cujo custo cresce com o argumento) e ao final. As demais funções de
+# math custam O(1) sobre floats e não precisam de verificação. Estourar qualquer limite gera FormulaLimitError com o nome da
+# fórmula.
+#
+# Além dos parâmetros, as fórmulas podem usar as métricas do M/M/c pelo nome
+# (METRIC_NAMES: rho, P0, L, Lq, W, Wq, erlang_c), calculadas com lambd, mu e
+# c (c = 1 se não informado), e outras fórmulas salvas pelo nome (ex.:
+# "custo = c*50 + Wq*lambd*20"). As referências entre fórmulas formam um grafo
+# que não pode ter ciclos (check_references); a avaliação em ordem topológica
+# fica em queue_metrics.optimizer.
+
+import ast
+import functools
+import json
+import keyword
+import math
+import threading
+import time
+
+from queue_metrics.models import mmc_solve
+
+# -------------------------------------------------------------------
+# Gerenciamento de Fórmulas Customizadas
+# -------------------------------------------------------------------
+CUSTOM_FORMULAS_FILE = "custom_formulas.json"
+ALLOWED_MATH = [
+    'log', 'log10', 'exp', 'sqrt', 'pow', 'factorial',
+    'sin', 'cos', 'tan', 'asin', 'acos', 'atan',
+    'pi', 'e'
+]
+ALLOWED_PARAMS = ['lambd', 'mu', 'c', 'k', 'n']
+# Métricas que as fórmulas podem usar (nome na fórmula -> chave de mmc_solve).
+METRIC_NAMES = {
+    'rho': 'rho', 'P0': 'p0', 'L': 'L', 'Lq': 'Lq', 'W': 'W', 'Wq': 'Wq', 'erlang_c': 'erlang_c',
+}
+METRIC_PARAMS = ['lambd', 'mu']         # obrigatórios para usar as métricas
+METRIC_OPTIONAL_PARAMS = ['c']          # c = 1 se não informado
+RESERVED_NAMES = set(ALLOWED_PARAMS) | set(ALLOWED_MATH) | set(METRIC_NAMES)
+
+
+class FormulaLimitError(ValueError):
+    """Uma fórmula excedeu os limites de avaliação (tempo, magnitude ou faixa de float)."""
+
+    def __init__(self, formula, reason):
+        super().__init__(f"A fórmula '{formula}' excedeu o limite: {reason}")
+        self.formula = formula
+        self.reason = reason
+
+
+class FormulaLimits:
+    """Limites da avaliação de uma fórmula personalizada."""
+
+    def __init__(self, max_factorial=170, time_budget=1.0):
+        self.max_factorial = max_factorial  # maior n aceito em factorial(n)
+        self.time_budget = time_budget      # segundos por fórmula
+
+DEFAULT_LIMITS = FormulaLimits()
+
+class _LimitExceeded(Exception):
+    """Sinal interno das funções protegidas; vira FormulaLimitError em evaluate_formula."""
+
+# Limites e prazo da avaliação em curso (por thread: a GUI avalia numa thread de trabalho).
+_active = threading.local()
+
+def _check_deadline():
+    if time.perf_counter() > getattr(_active, "deadline", math.inf):
+        raise _LimitExceeded(f"orçamento de {_active.limits.time_budget:g} s esgotado")
+
+def _factorial(x):
+    _check_deadline()
+    limit = getattr(_active, "limits", DEFAULT_LIMITS).max_factorial
+    if x != math.floor(x) or x < 0:
+        raise ValueError("factorial() só aceita inteiros não-negativos")
+    if x > limit:
+        raise _LimitExceeded(f"factorial({x:g}) acima do máximo permitido ({limit})")
+    return float(math.factorial(int(x)))
+
+# Escopo global das fórmulas: montado uma única vez, sem builtins.
+SAFE_GLOBALS = {"__builtins__": {}}
+for _func_name in ALLOWED_MATH:
+    if hasattr(math, _func_name):
+        SAFE_GLOBALS[_func_name] = getattr(math, _func_name)
+SAFE_GLOBALS['factorial'] = _factorial
+SAFE_GLOBALS['_float'] = float   # comparações viram 0.0 / 1.0 (ver _FloatConstants)
+del _func_name
+
+ALLOWED_NODES = {
+    ast.Expression, ast.Call, ast.Name, ast.Load,
+    ast.BinOp, ast.UnaryOp, ast.Compare,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Mod, ast.Pow,
+    ast.USub, ast.UAdd,
+    ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE,
+    ast.Constant
+}
+
+def load_custom_formulas(path=CUSTOM_FORMULAS_FILE):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return []
+
+def save_custom_formulas(formulas, path=CUSTOM_FORMULAS_FILE):
+    """Salva as fórmulas em JSON. Erros de E/S (IOError) são propagados."""
+    with open(path, 'w') as f:
+        json.dump(formulas, f, indent=4)
+
+def validate_expression(expression, param_list):
+    """Valida a expressão matemática usando AST."""
+    try:
+        tree = ast.parse(expression, mode='eval')
+    except SyntaxError as e:
+        raise ValueError(f"Erro de sintaxe na expressão: {e}")
+
+    allowed_names = set(param_list) | set(ALLOWED_MATH)
+
+    for node in ast.walk(tree):
+        if type(node) not in ALLOWED_NODES:
+            raise ValueError(f"Operação não permitida: {type(node).__name__}")
+
+        if isinstance(node, ast.Constant) and type(node.value) not in (int, float):
+            raise ValueError(f"Constante não permitida: {node.value!r}")
+
+        if isinstance(node, ast.Name):
+            if node.id not in allowed_names:
+                raise ValueError(f"Nome não permitido: '{node.id}'")
+
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in ALLOWED_MATH:
+                raise ValueError(f"Função não permitida: '{getattr(node.func, 'id', 'N/A')}'")
+    return True
+
+class _FloatConstants(ast.NodeTransformer):
+    """Troca as constantes inteiras por float e envolve as comparações em
+    _float(...), para que toda a aritmética seja em ponto flutuante: somar ou
+    elevar resultados de comparações (bool, ou seja, int) abriria caminho para
+    inteiros gigantes, ex.: ((mu > 0) + (mu > 0)) ** ... aninhado."""
+
+    def visit_Constant(self, node):
+        if type(node.value) is int:
+            return ast.copy_location(ast.Constant(float(node.value)), node)
+        return node
+
+    def visit_Compare(self, node):
+        self.generic_visit(node)
+        return ast.copy_location(ast.Call(ast.Name('_float', ast.Load()), [node], []), node)
+
+# Maior |valor| que o pré-cálculo de constantes grava na AST.
+MAX_FOLDED = 1e300
+
+class _FoldConstants(ast.NodeTransformer):
+    """Pré-calcula as subexpressões que só têm constantes (ex.: 2 * pi, sqrt(2), 10**3).
+
+    Roda na thread da GUI (ao salvar e ao montar o grafo de dependências), então
+    só dobra operações entre floats com resultado float finito de até MAX_FOLDED;
+    o resto (ex.: 1 / 0, estouro, comparações) fica para a avaliação, sob os
+    FormulaLimits. factorial não é dobrado: seu limite depende desses limites.
+    """
+
+    def visit_Name(self, node):
+        value = SAFE_GLOBALS.get(node.id)
+        return ast.copy_location(ast.Constant(value), node) if isinstance(value, float) else node
+
+    def _fold(self, node, operands):
+        if not all(isinstance(op, ast.Constant) and type(op.value) is float for op in operands):
+            return node
+        try:
+            value = eval(compile(ast.fix_missing_locations(ast.Expression(node)), "<fórmula>", "eval"),
+                         SAFE_GLOBALS, {})
+        except Exception:
+            return node
+        if type(value) is not float or not abs(value) <= MAX_FOLDED:
+            return node
+        return ast.copy_location(ast.Constant(value), node)
+
+    def visit_BinOp(self, node):
+        self.generic_visit(node)
+        return self._fold(node, [node.left, node.right])
+
+    def visit_UnaryOp(self, node):
+        self.generic_visit(node)
+        return self._fold(node, [node.operand])
+
+    def visit_Call(self, node):
+        self.generic_visit(node)
+        if node.keywords or node.func.id == 'factorial':
+            return node
+        return self._fold(node, node.args)
+
+def parse_expression(expr, names=()):
+    """Valida a expressão e devolve a AST otimizada (ast.Expression): constantes
+    inteiras como float e subexpressões constantes já calculadas.
+
+    :param names: Nomes de outras fórmulas que a expressão pode usar.
+    """
+    validate_expression(expr, ALLOWED_PARAMS + list(METRIC_NAMES) + list(names))
+    tree = ast.parse(expr, mode='eval')
+    tree = _FoldConstants().visit(_FloatConstants().visit(tree))
+    return ast.fix_missing_locations(tree)
+
+@functools.lru_cache(maxsize=1024)
+def compile_expression(expr, names=()):
+    """Valida e compila a expressão uma única vez; o code object fica em cache
+    (chave: o texto da expressão e a tupla 'names' de fórmulas referenciáveis)."""
+    return compile(parse_expression(expr, names), "<fórmula>", "eval")
+
+def compile_formulas(formulas):
+    """Pré-compila as fórmulas carregadas/salvas. As inválidas são ignoradas aqui
+    e reportam o erro quando forem avaliadas."""
+    for formula in formulas:
+        try:
+            compile_expression(formula["expr"])
+        except (ValueError, KeyError):
+            pass
+
+def evaluate_formula(expr, param_values, name=None, limits=None):
+    """Avalia uma expressão com as funções de ALLOWED_MATH e os parâmetros.
+
+    Métricas (METRIC_NAMES) são resolvidas aqui; referências a outras fórmulas
+    exigem queue_metrics.optimizer.FormulaProgram.
+
+    :param name: Nome da fórmula usado na mensagem de FormulaLimitError
+                 (padrão: a própria expressão).
+    :param limits: FormulaLimits (padrão: DEFAULT_LIMITS).
+    """
+    code = compile_expression(expr)
+    values = {key: float(value) for key, value in param_values.items()}
+    if not METRIC_NAMES.keys().isdisjoint(code.co_names):
+        values.update(metric_values(values))
+    try:
+        return eval_limited(code, values, limits or DEFAULT_LIMITS)
+    except LIMIT_ERRORS as e:
+        raise limit_error(name or expr, e) from None
+
+# Exceções de eval_limited que indicam limite excedido (ver limit_error).
+LIMIT_ERRORS = (_LimitExceeded, OverflowError)
+
+def eval_limited(code, scope, limits):
+    """eval de um code object de fórmula sob 'limits'; gera LIMIT_ERRORS ao exceder."""
+    start = time.perf_counter()
+    _active.limits, _active.deadline = limits, start + limits.time_budget
+    try:
+        result = eval(code, SAFE_GLOBALS, scope)
+    finally:
+        _active.deadline = math.inf
+    if time.perf_counter() - start > limits.time_budget:
+        raise _LimitExceeded(f"orçamento de {limits.time_budget:g} s esgotado")
+    return result
+
+def limit_error(name, exc):
+    """Converte uma exceção de LIMIT_ERRORS em FormulaLimitError com o nome da fórmula."""
+    if isinstance(exc, _LimitExceeded):
+        return FormulaLimitError(name, str(exc))
+    return FormulaLimitError(name, "resultado fora da faixa de ponto flutuante")
+
+# -------------------------------------------------------------------
+# Métricas e referências entre fórmulas
+# -------------------------------------------------------------------
+def metric_values(scope):
+    """Valores de METRIC_NAMES para o cenário (um único mmc_solve; c = 1 se ausente)."""
+    res = mmc_solve(scope['lambd'], scope['mu'], int(scope.get('c', 1)))
+    return {name: res[key] for name, key in METRIC_NAMES.items()}
+
+def is_referenceable(label):
+    """Se outras fórmulas podem usar esta pelo nome: identificador Python não
+    reservado e sem '_' inicial (reservado aos temporários do otimizador)."""
+    return (label.isidentifier() and not label.startswith('_') and not keyword.iskeyword(label)
+            and label not in RESERVED_NAMES)
+
+def expression_names(expr):
+    """Nomes usados como valor na expressão (sem os nomes de funções chamadas)."""
+    tree = ast.parse(expr, mode='eval')
+    called = {id(node.func) for node in ast.walk(tree) if isinstance(node, ast.Call)}
+    return {node.id for node in ast.walk(tree) if isinstance(node, ast.Name) and id(node) not in called}
+
+def formula_references(formulas):
+    """Grafo {label: [labels das fórmulas que ela usa]}; expressões com erro de
+    sintaxe ficam sem referências (o erro aparece na validação)."""
+    labels = {f["label"] for f in formulas if is_referenceable(f["label"])}
+    references = {}
+    for formula in formulas:
+        try:
+            names = expression_names(formula["expr"])
+        except SyntaxError:
+            names = set()
+        references[formula["label"]] = sorted(names & labels)
+    return references
+
+def find_cycle(references):
+    """Um ciclo do grafo de referências como [a, b, ..., a], ou None se não houver."""
+    state = {}          # 1 = na pilha da busca, 2 = concluído
+    stack = []
+
+    def visit(label):
+        state[label] = 1
+        stack.append(label)
+        for ref in references.get(label, ()):
+            if state.get(ref) == 1:
+                return stack[stack.index(ref):] + [ref]
+            if ref not in state:
+                cycle = visit(ref)
+                if cycle:
+                    return cycle
+        state[label] = 2
+        stack.pop()
+        return None
+
+    for label in references:
+        if label not in state:
+            cycle = visit(label)
+            if cycle:
+                return cycle
+    return None
+
+def check_references(formulas):
+    """Gera ValueError se alguma fórmula depende de si mesma (direta ou indiretamente)."""
+    cycle = find_cycle(formula_references(formulas))
+    if cycle:
+        raise ValueError(f"Referência circular entre fórmulas: {' -> '.join(cycle)}")
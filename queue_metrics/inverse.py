@@ -0,0 +1,218 @@
+# Solvers inversos: qual λ (ou μ) faz uma métrica atingir um valor alvo.
+#
+#   max_lambda("M/M/c", {"mu": 12, "c": 3}, "Wq", 0.05)
+#   -> maior λ com Wq ≤ 0,05 (a métrica cresce com λ)
+#
+# A raiz de f(x) = métrica(x) - alvo é procurada num intervalo que sempre
+# contém a troca de sinal. Para modelos com condição de estabilidade, o
+# intervalo termina no limite (λ < cμ, ou μ > λ/c); nos demais, a ponta é
+# dobrada até haver troca de sinal. Cada avaliação de f chama o solver do
+# modelo uma única vez (Erlang B, P₀ etc. calculados juntos), então a métrica
+# pedida sai dos mesmos intermediários das demais.
+#   escalar  : método de Brent (bisseção + secante + interpolação inversa)
+#   vetorial : falsa posição (Illinois) sobre arrays, com bisseção quando a
+#              métrica é infinita numa das pontas (perto da instabilidade)
+
+import math
+
+from queue_metrics.models import MODELS_CONFIG, solve_model
+from queue_metrics.waiting import WAIT_PERCENTILES, percentile_key
+
+VARIABLES = ("lambda", "mu")
+# Modelos cuja estabilidade exige λ < c·μ (c = 1 quando o modelo não tem c).
+STABILITY_LIMITED = ("M/M/1", "M/M/c", "M/G/1", "M/D/1", "G/G/c (Allen–Cunneen)")
+
+
+def _check(model_key, param_values, metric, vary):
+    config = MODELS_CONFIG.get(model_key)
+    if config is None or "solver" not in config:
+        raise ValueError(f"Modelo desconhecido: '{model_key}'")
+    if vary not in VARIABLES:
+        raise ValueError(f"Só é possível variar {' ou '.join(VARIABLES)}.")
+    if metric not in [key for _label, key, _params in config["functions"]]:
+        raise ValueError(f"Métrica '{metric}' não existe no modelo {model_key}.")
+    fixed = [p for p in config["params"] if p != vary]
+    missing = [p for p in fixed if p not in param_values]
+    if missing:
+        raise ValueError(f"Parâmetros obrigatórios faltando: {', '.join(missing)}")
+
+
+def _bracket_limits(model_key, param_values, vary):
+    """(lo, hi, hi_fixo): intervalo inicial; hi_fixo=False indica que hi pode crescer."""
+    c = param_values.get("c", 1)
+    if vary == "lambda":
+        mu = param_values["mu"]
+        if model_key in STABILITY_LIMITED:
+            limit = c * mu
+            return limit * 1e-12, limit * (1 - 1e-12), True
+        return mu * 1e-12, mu * max(c, 1), False
+    lambd = param_values["lambda"]
+    if model_key in STABILITY_LIMITED:
+        limit = lambd / c
+        return limit * (1 + 1e-12), 2 * limit, False
+    return lambd * 1e-6, lambd, False
+
+
+def _brent(f, a, b, fa, fb, tol, maxiter):
+    """Método de Brent para f(a)·f(b) ≤ 0 (mesma lógica do 'zeroin' clássico)."""
+    if fa == 0: return a
+    if fb == 0: return b
+    c, fc = a, fa
+    d = e = b - a
+    for _ in range(maxiter):
+        if (fb > 0) == (fc > 0):
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+        tol1 = 2 * 2.2e-16 * abs(b) + 0.5 * tol
+        m = 0.5 * (c - b)
+        if abs(m) <= tol1 or fb == 0:
+            return b
+        if abs(e) >= tol1 and abs(fa) > abs(fb):
+            s = fb / fa
+            if a == c:                     # secante
+                p, q = 2 * m * s, 1 - s
+            else:                          # interpolação quadrática inversa
+                q, r = fa / fc, fb / fc
+                p = s * (2 * m * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+            if p > 0: q = -q
+            else: p = -p
+            if 2 * p < min(3 * m * q - abs(tol1 * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = m
+        else:
+            d = e = m
+        a, fa = b, fb
+        b += d if abs(d) > tol1 else math.copysign(tol1, m)
+        fb = f(b)
+    return b
+
+
+def solve_for(model_key, param_values, metric, target, vary="lambda",
+              lo=None, hi=None, tol=1e-12, maxiter=200):
+    """Valor de 'vary' ("lambda" ou "mu") em que 'metric' vale 'target'.
+
+    :param param_values: Parâmetros fixos do modelo (mesmas chaves da GUI).
+    :param lo, hi: Intervalo de busca opcional (padrão: automático).
+    :param tol: Tolerância absoluta em x (somada à relativa de precisão de máquina).
+    Gera ValueError quando o alvo não é atingível no intervalo.
+    """
+    _check(model_key, param_values, metric, vary)
+    auto_lo, auto_hi, fixed_hi = _bracket_limits(model_key, param_values, vary)
+    lo = auto_lo if lo is None else lo
+    fixed_hi = fixed_hi or hi is not None
+    hi = auto_hi if hi is None else hi
+
+    values = dict(param_values)
+    def f(x):
+        values[vary] = x
+        return solve_model(model_key, values)[metric] - target
+
+    f_lo, f_hi = f(lo), f(hi)
+    if not fixed_hi:
+        for _ in range(200):
+            if (f_lo > 0) != (f_hi > 0) or f_hi == 0:
+                break
+            lo, f_lo = hi, f_hi
+            hi *= 2
+            f_hi = f(hi)
+    if math.isnan(f_lo) or math.isnan(f_hi) or ((f_lo > 0) == (f_hi > 0) and f_lo != 0 and f_hi != 0):
+        raise ValueError(f"O alvo {metric} = {target} não é atingido para {vary} em [{lo:.6g}, {hi:.6g}].")
+    if math.isinf(f_hi):
+        # Perto da instabilidade a métrica é infinita: Brent precisa de f finita.
+        while math.isinf(f_hi):
+            mid = 0.5 * (lo + hi)
+            f_mid = f(mid)
+            if (f_mid > 0) == (f_lo > 0): lo, f_lo = mid, f_mid
+            else: hi, f_hi = mid, f_mid
+    return _brent(f, lo, hi, f_lo, f_hi, tol, maxiter)
+
+
+def max_lambda(model_key, param_values, metric, target, **kwargs):
+    """Maior λ com métrica ≤ alvo, para métricas que crescem com λ (L, Wq, Pₖ...).
+
+    Se o alvo nunca é atingido antes da instabilidade, devolve o limite de
+    estabilidade (c·μ) para modelos limitados; nos demais gera ValueError.
+    """
+    try:
+        return solve_for(model_key, param_values, metric, target, vary="lambda", **kwargs)
+    except ValueError:
+        if model_key in STABILITY_LIMITED and metric in ("L", "Lq", "W", "Wq"):
+            values = dict(param_values, **{"lambda": _bracket_limits(model_key, param_values, "lambda")[1]})
+            if solve_model(model_key, values)[metric] <= target:
+                return param_values.get("c", 1) * param_values["mu"]
+        raise
+
+
+def min_mu(model_key, param_values, metric, target, **kwargs):
+    """Menor μ com métrica ≤ alvo, para métricas que decrescem com μ."""
+    return solve_for(model_key, param_values, metric, target, vary="mu", **kwargs)
+
+
+def solve_for_batch(model_key, param_values, metric, targets, vary="lambda",
+                    lo=None, hi=None, tol=1e-10, maxiter=100):
+    """Versão vetorizada de solve_for (NumPy): muitos alvos e/ou parâmetros de uma vez.
+
+    'param_values' e 'targets' podem ser arrays (com broadcasting). Para
+    modelos sem limite de estabilidade (capacidade finita, M/M/∞), 'lo' e
+    'hi' devem ser informados. Elementos sem troca de sinal no intervalo
+    saem como NaN.
+    """
+    import numpy as np
+    from queue_metrics.batch import BATCH_SOLVERS, solve_batch
+
+    _check(model_key, param_values, metric, vary)
+    if model_key not in BATCH_SOLVERS:
+        raise ValueError(f"O modelo {model_key} não tem versão vetorizada.")
+    values = {key: np.asarray(value) for key, value in param_values.items()}
+    targets = np.asarray(targets, dtype=float)
+    c = values.get("c", 1)
+    if vary == "lambda":
+        limit = c * values["mu"] if model_key in STABILITY_LIMITED else None
+        lo = limit * 1e-12 if lo is None and limit is not None else lo
+        hi = limit * (1 - 1e-12) if hi is None and limit is not None else hi
+    else:
+        limit = values["lambda"] / c if model_key in STABILITY_LIMITED else None
+        lo = limit * (1 + 1e-12) if lo is None and limit is not None else lo
+        hi = limit * 1e6 if hi is None and limit is not None else hi
+    if lo is None or hi is None:
+        raise ValueError("Informe 'lo' e 'hi' para este modelo/variável.")
+
+    shape = np.broadcast_shapes(np.shape(lo), np.shape(hi), targets.shape,
+                                *[np.shape(v) for v in values.values()])
+    lo = np.broadcast_to(np.asarray(lo, dtype=float), shape).copy()
+    hi = np.broadcast_to(np.asarray(hi, dtype=float), shape).copy()
+    targets = np.broadcast_to(targets, shape)
+
+    percentiles = metric in {percentile_key(p) for p in WAIT_PERCENTILES}
+
+    def f(x):
+        values[vary] = x
+        with np.errstate(all='ignore'):
+            res = solve_batch(model_key, values, percentiles=percentiles)
+            return np.broadcast_to(res[metric], shape) - targets
+
+    f_lo, f_hi = f(lo), f(hi)
+    valid = (np.sign(f_lo) != np.sign(f_hi)) | (f_lo == 0) | (f_hi == 0)
+    x = np.where(f_lo == 0, lo, hi)
+    side = 0 * lo                    # Illinois: qual ponta ficou parada da última vez
+    for _ in range(maxiter):
+        finite = np.isfinite(f_lo) & np.isfinite(f_hi)
+        with np.errstate(all='ignore'):
+            x = np.where(finite, (lo * f_hi - hi * f_lo) / (f_hi - f_lo), 0.5 * (lo + hi))
+        x = np.where((x > lo) & (x < hi), x, 0.5 * (lo + hi))
+        fx = f(x)
+        left = np.sign(fx) == np.sign(f_lo)
+        # Illinois: se a mesma ponta fica parada duas vezes, seu f é dividido por 2
+        f_hi = np.where(left & (side == 1), 0.5 * f_hi, f_hi)
+        f_lo = np.where(~left & (side == -1), 0.5 * f_lo, f_lo)
+        lo, f_lo = np.where(left, x, lo), np.where(left, fx, f_lo)
+        hi, f_hi = np.where(left, hi, x), np.where(left, f_hi, fx)
+        side = np.where(left, 1, -1)
+        if np.all((hi - lo <= tol * np.maximum(1.0, np.abs(x))) | (fx == 0) | ~valid):
+            break
+    return np.where(valid, x, np.nan)
@@ -0,0 +1,544 @@
+# Modelos de fila: funções de cálculo, "solvers" e configuração dos modelos.
+# Este módulo é Python puro (só biblioteca padrão), para poder ser importado por
+# workers em lote e servidores sem interface gráfica. exp/log/fsum vêm de
+# queue_metrics.dual, que aceita tanto floats quanto números duais (derivadas
+# em queue_metrics.sensitivity).
+
+import functools
+import math
+
+from queue_metrics import dual
+from queue_metrics.waiting import (
+    WAIT_PERCENTILES, percentile_key, exponential_wq_percentile, mm1k_wq_percentiles,
+)
+
+# -------------------------------------------------------------------
+# Funções de Cálculo
+# -------------------------------------------------------------------
+# Convenção para λ = 0 (sem chegadas) em todos os modelos: o sistema fica
+# vazio, Wq = 0 e W = 1/μ (o tempo de um serviço), como no M/M/1 e no M/G/1.
+# ----- M/M/1 -----
+def mm1_rho(lambd, mu):
+    return lambd / mu
+def mm1_p0(lambd, mu):
+    return 1 - (lambd / mu)
+def mm1_pn(lambd, mu, n):
+    rho = lambd / mu
+    return (1 - rho) * (rho ** n)
+def mm1_L(lambd, mu):
+    rho = lambd / mu
+    return rho / (1 - rho)
+def mm1_Lq(lambd, mu):
+    rho = lambd / mu
+    return (rho ** 2) / (1 - rho)
+def mm1_W(lambd, mu):
+    return 1.0 / (mu - lambd)
+def mm1_Wq(lambd, mu):
+    rho = lambd / mu
+    return rho / (mu - lambd)
+
+def mm1_solve(lambd, mu, n=None):
+    """Calcula todas as métricas do M/M/1 de uma vez e devolve um dicionário."""
+    rho = lambd / mu
+    stable = rho < 1
+    # Instável (ρ ≥ 1): a fila cresce sem limite; P₀ = Pₙ = 0 e as médias são ∞
+    # (mesma convenção de mm1_batch).
+    res = {"rho": rho, "p0": 1 - rho if stable else 0.0}
+    if n is not None:
+        res["pn"] = (1 - rho) * (rho ** n) if stable else 0.0
+    if not stable:
+        res["L"] = res["Lq"] = res["W"] = res["Wq"] = float('inf')
+        res.update((percentile_key(p), float('inf')) for p in WAIT_PERCENTILES)
+        return res
+    res["L"] = rho / (1 - rho)
+    res["Lq"] = rho * res["L"]
+    res["W"] = 1.0 / (mu - lambd)
+    res["Wq"] = rho * res["W"]
+    for p in WAIT_PERCENTILES:
+        res[percentile_key(p)] = exponential_wq_percentile(rho, mu - lambd, p)
+    return res
+
+# ----- M/M/c -----
+# As funções abaixo evitam 'a ** c' e 'math.factorial(c)' (que estouram para c
+# na casa das centenas) usando a recorrência de Erlang B:
+#   B(0, a) = 1
+#   B(k, a) = a * B(k-1, a) / (k + a * B(k-1, a))
+# A partir de B obtemos Erlang C e, em espaço logarítmico, P₀.
+def mmc_rho(lambd, mu, c):
+    return lambd / (c * mu)
+def mmc_erlangB(lambd, mu, c):
+    a = lambd / mu
+    b = 1.0
+    for k in range(1, int(c) + 1):
+        b = a * b / (k + a * b)
+    return b
+def _mmc_log_p0(a, c, rho_s, b):
+    # log P₀, com P₀ = B * c! / aᶜ / [(1 - B) + B / (1 - ρ)]
+    if a <= 0: return 0.0
+    if b <= 0: return -a   # B abaixo do menor float: Σ aⁿ/n! ≈ eᵃ
+    denom = (1 - b) + b / (1 - rho_s)
+    return dual.log(b) + math.lgamma(c + 1) - c * dual.log(a) - dual.log(denom)
+def _mmc_p0_from_b(a, c, rho_s, b):
+    # P₀ avaliado com log para não estourar
+    log_p0 = _mmc_log_p0(a, c, rho_s, b)
+    return dual.exp(log_p0) if log_p0 > -745 else 0.0
+def mmc_p0(lambd, mu, c):
+    a = lambd / mu
+    rho_s = mmc_rho(lambd, mu, c)
+    if rho_s >= 1: return 0.0
+    b = mmc_erlangB(lambd, mu, c)
+    return _mmc_p0_from_b(a, c, rho_s, b)
+def mmc_erlangC(lambd, mu, c):
+    rho_s = mmc_rho(lambd, mu, c)
+    if rho_s >= 1: return 1.0
+    b = mmc_erlangB(lambd, mu, c)
+    return b / (1 - rho_s * (1 - b))
+def mmc_Lq(lambd, mu, c):
+    rho_s = mmc_rho(lambd, mu, c)
+    if rho_s >= 1: return float('inf')
+    return mmc_erlangC(lambd, mu, c) * rho_s / (1 - rho_s)
+def mmc_L(lambd, mu, c):
+    lq = mmc_Lq(lambd, mu, c)
+    return lq + (lambd / mu)
+def mmc_Wq(lambd, mu, c):
+    lq = mmc_Lq(lambd, mu, c)
+    return lq / lambd if lambd > 0 else 0.0
+def mmc_W(lambd, mu, c):
+    wq = mmc_Wq(lambd, mu, c)
+    return wq + (1.0 / mu)
+def mmc_solve(lambd, mu, c):
+    """Calcula todas as métricas do M/M/c com uma única recorrência de Erlang B."""
+    a = lambd / mu
+    rho_s = mmc_rho(lambd, mu, c)
+    res = {"rho": rho_s, "a": a}
+    if rho_s >= 1:
+        res.update(p0=0.0, erlang_c=1.0, L=float('inf'), Lq=float('inf'),
+                   W=float('inf'), Wq=float('inf'))
+        res.update((percentile_key(p), float('inf')) for p in WAIT_PERCENTILES)
+        return res
+    b = mmc_erlangB(lambd, mu, c)
+    erlang_c = b / (1 - rho_s * (1 - b))
+    lq = erlang_c * rho_s / (1 - rho_s)
+    wq = lq / lambd if lambd > 0 else 0.0
+    res.update(p0=_mmc_p0_from_b(a, c, rho_s, b), erlang_b=b, erlang_c=erlang_c,
+               L=lq + a, Lq=lq, W=wq + (1.0 / mu), Wq=wq)
+    for p in WAIT_PERCENTILES:
+        res[percentile_key(p)] = exponential_wq_percentile(erlang_c, c * mu - lambd, p)
+    return res
+
+# ----- M/M/∞ -----
+def mminf_rho(lambd, mu):
+    return lambd / mu
+def mminf_p0(lambd, mu):
+    a = lambd / mu
+    return dual.exp(-a)
+def _poisson_pmf(a, n):
+    # e⁻ᵃ aⁿ / n! em espaço logarítmico (n! estoura para n > 170)
+    if n == 0: return dual.exp(-a)
+    if a <= 0: return 0.0
+    return dual.exp(-a + n * dual.log(a) - math.lgamma(n + 1))
+def mminf_pn(lambd, mu, n):
+    a = lambd / mu
+    return _poisson_pmf(a, n)
+def mminf_L(lambd, mu):
+    return lambd / mu
+def mminf_W(lambd, mu):
+    return 1.0 / mu
+def mminf_solve(lambd, mu, n=None):
+    """Calcula todas as métricas do M/M/∞ de uma vez."""
+    a = lambd / mu
+    res = {"rho": a, "p0": dual.exp(-a), "L": a, "Lq": 0.0, "W": 1.0 / mu, "Wq": 0.0}
+    if n is not None:
+        res["pn"] = _poisson_pmf(a, n)
+    return res
+
+# ----- M/M/1/K -----
+# Perto de ρ = 1 as formas fechadas viram 0/0 e perdem dígitos (e derivadas)
+# bem antes de ρ = 1. Quando K·|ln ρ| ≤ 1 usamos a série em x = K·ln ρ de
+# S = Σ_{j≤K} ρʲ e T = Σ j ρʲ, com P₀ = 1/S e L = T/S; os coeficientes vêm das
+# somas de potências Σ jᵐ calculadas em inteiros exatos.
+_MM1K_SERIES_TERMS = 24
+
+@functools.lru_cache(maxsize=256)
+def _mm1k_series_coeffs(k):
+    """Coeficientes (a, b) com S = Σ aₘ xᵐ e T = K Σ bₘ xᵐ, x = K·ln ρ."""
+    k = int(k)
+    sums = []  # sums[m] = Σ_{j=0}^{K} jᵐ (0⁰ = 1)
+    for m in range(_MM1K_SERIES_TERMS + 1):
+        acc = (k + 1) ** (m + 1) - sum(math.comb(m + 1, i) * sums[i] for i in range(m))
+        sums.append(acc // (m + 1))
+    scale = max(k, 1)
+    a = tuple(sums[m] / (math.factorial(m) * scale ** m) for m in range(_MM1K_SERIES_TERMS))
+    b = tuple(sums[m + 1] / (math.factorial(m) * scale ** (m + 1)) for m in range(_MM1K_SERIES_TERMS))
+    return a, b
+
+def _horner(coeffs, x):
+    acc = coeffs[-1]
+    for c in reversed(coeffs[:-1]):
+        acc = acc * x + c
+    return acc
+
+def _mm1k_near_one(rho, k):
+    return rho > 0 and k * abs(dual.log(rho)) <= 1.0
+
+def _mm1k_series(rho, k):
+    """(S, T) pela série; só vale com _mm1k_near_one(rho, k)."""
+    a, b = _mm1k_series_coeffs(int(k))
+    x = k * dual.log(rho)
+    return _horner(a, x), k * _horner(b, x)
+
+def _mm1k_reduced(rho, k):
+    """(q, P₀(q), L(q)) com q = min(ρ, 1/ρ). Para ρ > 1 vale a simetria
+    n -> K - n: P₀(ρ) = P₀(q)·q^K, Pₖ(ρ) = P₀(q) e L(ρ) = K - L(q), o que
+    evita estourar ρ^(K+1) com K grande (como em queue_metrics.batch)."""
+    q = 1 / rho if rho > 1 else rho
+    if _mm1k_near_one(q, k):
+        S, T = _mm1k_series(q, k)
+        return q, 1.0 / S, T / S
+    qk = q ** k
+    qk1 = qk * q
+    return q, (1 - q) / (1 - qk1), q * (1 - (k + 1) * qk + k * qk1) / ((1 - q) * (1 - qk1))
+
+def mm1k_rho(lambd, mu):
+    return lambd / mu
+def mm1k_p0(lambd, mu, k):
+    rho = lambd / mu
+    q, p0_q, _ = _mm1k_reduced(rho, k)
+    return p0_q * (q ** k) if rho > 1 else p0_q
+def mm1k_pn(lambd, mu, k, n):
+    if n > k: return 0.0
+    rho = lambd / mu
+    q, p0_q, _ = _mm1k_reduced(rho, k)
+    return p0_q * (q ** (k - n)) if rho > 1 else p0_q * (q ** n)
+def mm1k_pk(lambd, mu, k):
+    return mm1k_pn(lambd, mu, k, k)
+def mm1k_lambda_eff(lambd, mu, k):
+    pk = mm1k_pk(lambd, mu, k)
+    return lambd * (1 - pk)
+def mm1k_L(lambd, mu, k):
+    rho = lambd / mu
+    _, _, L_q = _mm1k_reduced(rho, k)
+    return k - L_q if rho > 1 else L_q
+def mm1k_Lq(lambd, mu, k):
+    L = mm1k_L(lambd, mu, k)
+    p0 = mm1k_p0(lambd, mu, k)
+    return L - (1 - p0)
+def mm1k_W(lambd, mu, k):
+    L = mm1k_L(lambd, mu, k)
+    lambda_eff = mm1k_lambda_eff(lambd, mu, k)
+    return L / lambda_eff if lambda_eff > 0 else 1.0 / mu
+def mm1k_Wq(lambd, mu, k):
+    Lq = mm1k_Lq(lambd, mu, k)
+    lambda_eff = mm1k_lambda_eff(lambd, mu, k)
+    return Lq / lambda_eff if lambda_eff > 0 else 0.0
+def mm1k_solve(lambd, mu, k, n=None):
+    """Calcula todas as métricas do M/M/1/K reaproveitando P₀, L e λ'."""
+    rho = lambd / mu
+    high = rho > 1
+    q, p0_q, L_q = _mm1k_reduced(rho, k)
+    p0 = p0_q * (q ** k) if high else p0_q
+    pk = p0_q if high else p0_q * (q ** k)
+    lambda_eff = lambd * (1 - pk)
+    L = k - L_q if high else L_q
+    Lq = L - (1 - p0)
+    res = {"rho": rho, "p0": p0, "pk": pk, "lambda_eff": lambda_eff, "L": L, "Lq": Lq,
+           "W": L / lambda_eff if lambda_eff > 0 else 1.0 / mu,
+           "Wq": Lq / lambda_eff if lambda_eff > 0 else 0.0}
+    for p, t in zip(WAIT_PERCENTILES, mm1k_wq_percentiles(lambd, mu, k)):
+        res[percentile_key(p)] = t
+    if n is not None:
+        res["pn"] = 0.0 if n > k else p0_q * (q ** (k - n) if high else q ** n)
+    return res
+
+# ----- M/M/c/K e M/M/c/c (Erlang B) -----
+# Com pₙ relativo a p_c: Σ_{n≤c} pₙ/p_c = 1/B(c, a) (Erlang B) e, na fila,
+# p_{c+j}/p_c = ρʲ (j = 1..K-c). Assim a normalização custa O(c) + O(K - c)
+# (soma geométrica), sem fatoriais nem aᶜ. 1/B vem da recorrência inversa
+#   1/B(k) = 1 + (k / a) * 1/B(k-1)
+# em espaço logarítmico: com carga leve e c grande, B fica abaixo do menor
+# float (ex.: a = 10, c = 500) e 1/B acima do maior. A normalização também é
+# feita em log, e para ρ > 1 os termos da fila são escalados por ρ^-(K-c)
+# para que nenhuma potência estoure.
+def _log_add(x, y):
+    # log(eˣ + eʸ) sem estouro
+    hi, lo = (x, y) if x >= y else (y, x)
+    return hi + dual.log1p(dual.exp(lo - hi)) if lo - hi > -745 else hi
+
+def _log_inv_erlangB(a, c):
+    # log(1 / B(c, a)) pela recorrência inversa (a > 0). 1/B é mantido como
+    # inv * e^shift: quando inv passa de 1e250 ele é reescalado, de modo que
+    # o laço só usa aritmética (log e exp só entram na reescala).
+    inv, shift = 1.0, 0.0
+    one = 1.0
+    for k in range(1, int(c) + 1):
+        inv = one + (k / a) * inv
+        if inv > 1e250:
+            shift += dual.log(inv)
+            one = dual.exp(-shift) if shift < 745 else 0.0
+            inv = 1.0
+    return shift + dual.log(inv)
+
+def mmck_solve(lambd, mu, c, k, n=None):
+    """Calcula todas as métricas do M/M/c/K (c servidores, capacidade K ≥ c)."""
+    if c < 1:
+        raise ValueError("O número de servidores c deve ser ≥ 1.")
+    if k < c:
+        raise ValueError("A capacidade K deve ser maior ou igual a c.")
+    a = lambd / mu
+    rho = a / c
+    if a <= 0:
+        # Sem chegadas o sistema fica sempre vazio.
+        res = {"rho": rho, "a": a, "erlang_b": 0.0, "p0": 1.0, "pk": 0.0, "lambda_eff": 0.0,
+               "L": 0.0, "Lq": 0.0, "W": 1.0 / mu, "Wq": 0.0}
+        if n is not None:
+            res["pn"] = 1.0 if n == 0 else 0.0
+        return res
+    log_inv_b = _log_inv_erlangB(a, c)
+    m = k - c
+    log_rho = dual.log(rho)
+    if rho <= 1:
+        log_q0 = 0.0
+        queue = [rho ** j for j in range(m + 1)]
+    else:
+        log_q0 = -m * log_rho
+        queue = [dual.exp((j - m) * log_rho) for j in range(m + 1)]
+    # norm = 1/B * q₀ + Σ_{j≥1} qⱼ, em log (a soma da fila fica entre ρ^m e m)
+    log_norm = log_inv_b + log_q0
+    if m > 0:
+        log_norm = _log_add(log_norm, dual.log(dual.fsum(queue[1:])))
+    scale = dual.exp(-log_norm) if log_norm < 745 else 0.0
+    pk = queue[m] * scale
+    lq = dual.fsum(j * queue[j] for j in range(1, m + 1)) * scale
+    lambda_eff = lambd * (1 - pk)
+    L = lq + a * (1 - pk)
+
+    # log P₀ = log p_c + log(c!) - c log a
+    log_p0 = log_q0 - log_norm + math.lgamma(c + 1) - c * dual.log(a)
+    res = {"rho": rho, "a": a,
+           "erlang_b": dual.exp(-log_inv_b) if log_inv_b < 745 else 0.0,
+           "p0": dual.exp(log_p0) if log_p0 > -745 else 0.0,
+           "pk": pk, "lambda_eff": lambda_eff, "L": L, "Lq": lq,
+           "W": L / lambda_eff if lambda_eff > 0 else 1.0 / mu,
+           "Wq": lq / lambda_eff if lambda_eff > 0 else 0.0}
+    if n is not None:
+        if n > k:
+            res["pn"] = 0.0
+        elif n >= c:
+            res["pn"] = queue[n - c] * scale
+        else:
+            log_pn = log_p0 + n * dual.log(a) - math.lgamma(n + 1)
+            res["pn"] = dual.exp(log_pn) if log_pn > -745 else 0.0
+    return res
+
+def erlangb_solve(lambd, mu, c, n=None):
+    """M/M/c/c (sistema de perda pura, Erlang B): não há fila, K = c."""
+    return mmck_solve(lambd, mu, c, c, n)
+
+# ----- Serviço não exponencial: M/G/1, M/D/1 e G/G/c -----
+# A variabilidade entra pelos coeficientes de variação (desvio / média):
+# cs para o tempo de serviço e ca para o intervalo entre chegadas. Com o
+# segundo momento E[S²] basta usar cs² = μ² E[S²] - 1. cs = 0 é serviço
+# determinístico e cs = 1 recai no exponencial (M/M/1).
+#   M/G/1 (Pollaczek–Khinchine, exata): Lq = ρ² (1 + cs²) / (2(1 - ρ))
+#   G/G/c (Allen–Cunneen, aproximada) : Wq ≈ Wq(M/M/c) * (ca² + cs²) / 2
+#   (com c = 1, G/G/c é a aproximação de Kingman)
+# Só usam operações aritméticas, então também funcionam elemento a elemento
+# em queue_metrics.batch.
+NONNEGATIVE_PARAMS = ('ca', 'cs')
+
+def mg1_solve(lambd, mu, cs):
+    """Calcula todas as métricas do M/G/1 pela fórmula de Pollaczek–Khinchine."""
+    rho = lambd / mu
+    res = {"rho": rho, "p0": max(0.0, 1 - rho)}
+    if rho >= 1:
+        res["L"] = res["Lq"] = res["W"] = res["Wq"] = float('inf')
+        return res
+    lq = rho * rho * (1 + cs * cs) / (2 * (1 - rho))
+    wq = lq / lambd if lambd > 0 else 0.0
+    res.update(L=lq + rho, Lq=lq, W=wq + 1.0 / mu, Wq=wq)
+    return res
+
+def md1_solve(lambd, mu):
+    """M/D/1: M/G/1 com tempo de serviço constante (cs = 0)."""
+    return mg1_solve(lambd, mu, 0.0)
+
+def ggc_solve(lambd, mu, c, ca, cs):
+    """G/G/c pela aproximação de Allen–Cunneen (Erlang C corrigido pela variabilidade)."""
+    res = mmc_solve(lambd, mu, c)
+    factor = (ca * ca + cs * cs) / 2
+    out = {"rho": res["rho"], "a": res["a"], "erlang_c": res["erlang_c"]}
+    if res["rho"] >= 1:
+        out["L"] = out["Lq"] = out["W"] = out["Wq"] = float('inf')
+        return out
+    wq = res["Wq"] * factor
+    lq = lambd * wq
+    out.update(L=lq + res["a"], Lq=lq, W=wq + 1.0 / mu, Wq=wq)
+    return out
+# -------------------------------------------------------------------
+
+# -------------------------------------------------------------------
+# Configuração dos Modelos
+# -------------------------------------------------------------------
+MODELS_CONFIG = {
+    "M/M/1": {
+        "params": {"lambda": "Taxa de Chegada (λ)", "mu": "Taxa de Serviço (μ)"},
+        "optional_params": {"n": "Valor de n para P(n)"},
+        "solver": (mm1_solve, ["lambda", "mu"]),
+        "functions": [
+            ("ρ (Utilização)", "rho", ["lambda", "mu"]),
+            ("P₀ (Prob. sistema vazio)", "p0", ["lambda", "mu"]),
+            ("P(n) (Prob. de n clientes)", "pn", ["lambda", "mu", "n"]),
+            ("L (Nº médio no sistema)", "L", ["lambda", "mu"]),
+            ("Lq (Nº médio na fila)", "Lq", ["lambda", "mu"]),
+            ("W (Tempo médio no sistema)", "W", ["lambda", "mu"]),
+            ("Wq (Tempo médio na fila)", "Wq", ["lambda", "mu"]),
+            ("Wq p95 (95% esperam até)", "Wq_p95", ["lambda", "mu"]),
+            ("Wq p99 (99% esperam até)", "Wq_p99", ["lambda", "mu"]),
+        ]
+    },
+    "M/M/c": {
+        "params": {"lambda": "Taxa de Chegada (λ)", "mu": "Taxa de Serviço (μ)", "c": "Nº de Servidores (c)"},
+        "optional_params": {},
+        "solver": (mmc_solve, ["lambda", "mu", "c"]),
+        "functions": [
+            ("ρ (Utilização por servidor)", "rho", ["lambda", "mu", "c"]),
+            ("P₀ (Prob. sistema vazio)", "p0", ["lambda", "mu", "c"]),
+            ("C(c, a) (Prob. de esperar / Erlang C)", "erlang_c", ["lambda", "mu", "c"]),
+            ("L (Nº médio no sistema)", "L", ["lambda", "mu", "c"]),
+            ("Lq (Nº médio na fila)", "Lq", ["lambda", "mu", "c"]),
+            ("W (Tempo médio no sistema)", "W", ["lambda", "mu", "c"]),
+            ("Wq (Tempo médio na fila)", "Wq", ["lambda", "mu", "c"]),
+            ("Wq p95 (95% esperam até)", "Wq_p95", ["lambda", "mu", "c"]),
+            ("Wq p99 (99% esperam até)", "Wq_p99", ["lambda", "mu", "c"]),
+        ]
+    },
+    "M/M/∞": {
+        "params": {"lambda": "Taxa de Chegada (λ)", "mu": "Taxa de Serviço (μ)"},
+        "optional_params": {"n": "Valor de n para P(n)"},
+        "solver": (mminf_solve, ["lambda", "mu"]),
+        "functions": [
+            ("a = λ/μ (Intensidade de tráfego)", "rho", ["lambda", "mu"]),
+            ("P₀ (Prob. sistema vazio)", "p0", ["lambda", "mu"]),
+            ("P(n) (Prob. de n clientes)", "pn", ["lambda", "mu", "n"]),
+            ("L (Nº médio no sistema)", "L", ["lambda", "mu"]),
+            ("W (Tempo médio no sistema)", "W", ["lambda", "mu"]),
+        ]
+    },
+    "M/M/1/K": {
+        "params": {"lambda": "Taxa de Chegada (λ)", "mu": "Taxa de Serviço (μ)", "k": "Capacidade do Sistema (K)"},
+        "optional_params": {"n": "Valor de n para P(n)"},
+        "solver": (mm1k_solve, ["lambda", "mu", "k"]),
+        "functions": [
+            ("ρ = λ/μ (Intensidade de tráfego)", "rho", ["lambda", "mu"]),
+            ("P₀ (Prob. sistema vazio)", "p0", ["lambda", "mu", "k"]),
+            ("Pₖ (Prob. de perda/bloqueio)", "pk", ["lambda", "mu", "k"]),
+            ("P(n) (Prob. de n clientes)", "pn", ["lambda", "mu", "k", "n"]),
+            ("λ' (Taxa de chegada efetiva)", "lambda_eff", ["lambda", "mu", "k"]),
+            ("L (Nº médio no sistema)", "L", ["lambda", "mu", "k"]),
+            ("Lq (Nº médio na fila)", "Lq", ["lambda", "mu", "k"]),
+            ("W (Tempo médio no sistema)", "W", ["lambda", "mu", "k"]),
+            ("Wq (Tempo médio na fila)", "Wq", ["lambda", "mu", "k"]),
+            ("Wq p95 (95% esperam até)", "Wq_p95", ["lambda", "mu", "k"]),
+            ("Wq p99 (99% esperam até)", "Wq_p99", ["lambda", "mu", "k"]),
+        ]
+    },
+    "M/M/c/K": {
+        "params": {"lambda": "Taxa de Chegada (λ)", "mu": "Taxa de Serviço (μ)", "c": "Nº de Servidores (c)", "k": "Capacidade do Sistema (K)"},
+        "optional_params": {"n": "Valor de n para P(n)"},
+        "solver": (mmck_solve, ["lambda", "mu", "c", "k"]),
+        "functions": [
+            ("ρ (Utilização oferecida por servidor)", "rho", ["lambda", "mu", "c", "k"]),
+            ("P₀ (Prob. sistema vazio)", "p0", ["lambda", "mu", "c", "k"]),
+            ("Pₖ (Prob. de perda/bloqueio)", "pk", ["lambda", "mu", "c", "k"]),
+            ("P(n) (Prob. de n clientes)", "pn", ["lambda", "mu", "c", "k", "n"]),
+            ("λ' (Taxa de chegada efetiva)", "lambda_eff", ["lambda", "mu", "c", "k"]),
+            ("L (Nº médio no sistema)", "L", ["lambda", "mu", "c", "k"]),
+            ("Lq (Nº médio na fila)", "Lq", ["lambda", "mu", "c", "k"]),
+            ("W (Tempo médio no sistema)", "W", ["lambda", "mu", "c", "k"]),
+            ("Wq (Tempo médio na fila)", "Wq", ["lambda", "mu", "c", "k"]),
+        ]
+    },
+    "M/M/c/c (Erlang B)": {
+        "params": {"lambda": "Taxa de Chegada (λ)", "mu": "Taxa de Serviço (μ)", "c": "Nº de Servidores (c)"},
+        "optional_params": {"n": "Valor de n para P(n)"},
+        "solver": (erlangb_solve, ["lambda", "mu", "c"]),
+        "functions": [
+            ("a = λ/μ (Tráfego oferecido, Erlangs)", "a", ["lambda", "mu", "c"]),
+            ("B(c, a) (Prob. de bloqueio / Erlang B)", "pk", ["lambda", "mu", "c"]),
+            ("P₀ (Prob. sistema vazio)", "p0", ["lambda", "mu", "c"]),
+            ("P(n) (Prob. de n clientes)", "pn", ["lambda", "mu", "c", "n"]),
+            ("λ' (Taxa de chegada efetiva)", "lambda_eff", ["lambda", "mu", "c"]),
+            ("L (Nº médio de servidores ocupados)", "L", ["lambda", "mu", "c"]),
+            ("W (Tempo médio no sistema)", "W", ["lambda", "mu", "c"]),
+        ]
+    },
+    "M/G/1": {
+        "params": {"lambda": "Taxa de Chegada (λ)", "mu": "Taxa de Serviço (μ)", "cs": "CV do Serviço (cs)"},
+        "optional_params": {},
+        "solver": (mg1_solve, ["lambda", "mu", "cs"]),
+        "functions": [
+            ("ρ (Utilização)", "rho", ["lambda", "mu", "cs"]),
+            ("P₀ (Prob. sistema vazio)", "p0", ["lambda", "mu", "cs"]),
+            ("L (Nº médio no sistema)", "L", ["lambda", "mu", "cs"]),
+            ("Lq (Nº médio na fila)", "Lq", ["lambda", "mu", "cs"]),
+            ("W (Tempo médio no sistema)", "W", ["lambda", "mu", "cs"]),
+            ("Wq (Tempo médio na fila)", "Wq", ["lambda", "mu", "cs"]),
+        ]
+    },
+    "M/D/1": {
+        "params": {"lambda": "Taxa de Chegada (λ)", "mu": "Taxa de Serviço (μ)"},
+        "optional_params": {},
+        "solver": (md1_solve, ["lambda", "mu"]),
+        "functions": [
+            ("ρ (Utilização)", "rho", ["lambda", "mu"]),
+            ("P₀ (Prob. sistema vazio)", "p0", ["lambda", "mu"]),
+            ("L (Nº médio no sistema)", "L", ["lambda", "mu"]),
+            ("Lq (Nº médio na fila)", "Lq", ["lambda", "mu"]),
+            ("W (Tempo médio no sistema)", "W", ["lambda", "mu"]),
+            ("Wq (Tempo médio na fila)", "Wq", ["lambda", "mu"]),
+        ]
+    },
+    "G/G/c (Allen–Cunneen)": {
+        "params": {"lambda": "Taxa de Chegada (λ)", "mu": "Taxa de Serviço (μ)", "c": "Nº de Servidores (c)",
+                   "ca": "CV das Chegadas (ca)", "cs": "CV do Serviço (cs)"},
+        "optional_params": {},
+        "solver": (ggc_solve, ["lambda", "mu", "c", "ca", "cs"]),
+        "functions": [
+            ("ρ (Utilização por servidor)", "rho", ["lambda", "mu", "c"]),
+            ("C(c, a) (Prob. de esperar no M/M/c)", "erlang_c", ["lambda", "mu", "c"]),
+            ("L (Nº médio no sistema) ≈", "L", ["lambda", "mu", "c", "ca", "cs"]),
+            ("Lq (Nº médio na fila) ≈", "Lq", ["lambda", "mu", "c", "ca", "cs"]),
+            ("W (Tempo médio no sistema) ≈", "W", ["lambda", "mu", "c", "ca", "cs"]),
+            ("Wq (Tempo médio na fila) ≈", "Wq", ["lambda", "mu", "c", "ca", "cs"]),
+        ]
+    },
+    "Comparativo (M/M/1 vs M/M/∞)": {
+        "params": {"lambda": "Taxa de Chegada (λ)", "mu": "Taxa de Serviço (μ)"},
+        "optional_params": {},
+        "functions": [] 
+    },
+    "Personalizado": {
+        "params": {}, 
+        "optional_params": {
+            "lambd": "Taxa de Chegada (λ) [use 'lambd']", 
+            "mu": "Taxa de Serviço (μ)", 
+            "c": "Nº de Servidores (c)",
+            "k": "Capacidade (K)",
+            "n": "Valor de n"
+        },
+        "functions": []
+    }
+}
+
+
+def solve_model(model_key, param_values):
+    """Resolve um modelo padrão uma única vez.
+
+    'param_values' usa as chaves da interface (lambda, mu, c, k, n, ca, cs) e o
+    retorno é o dicionário de métricas do solver do modelo.
+    """
+    config = MODELS_CONFIG[model_key]
+    solver, solver_params = config["solver"]
+    args = [param_values[p] for p in solver_params]
+    kwargs = {p: param_values[p] for p in config.get("optional_params", {}) if p in param_values}
+    return solver(*args, **kwargs)
@@ -0,0 +1,133 @@
+# Redes de filas: redes de Jackson abertas e MVA para redes fechadas.
+#
+# Rede aberta (Jackson): chegadas externas γᵢ em cada nó e matriz de
+# roteamento P (P[i][j] = prob. de ir de i para j; o que falta para 1 em cada
+# linha sai da rede). As taxas totais resolvem as equações de tráfego
+#   λ = γ + Pᵀλ   ->   (I - Pᵀ) λ = γ
+# e cada nó é um M/M/c independente (mmc_solve). Os totais da rede saem da Lei
+# de Little: W = ΣLᵢ / Σγᵢ.
+#
+# Rede fechada (MVA, Mean Value Analysis): N clientes circulam entre estações
+# com demanda Dᵢ = vᵢ / μᵢ (visitas x tempo de serviço) e tempo de reflexão Z.
+# Para n = 1..N:
+#   Rᵢ(n) = Dᵢ (1 + Qᵢ(n-1))      (estação com 1 servidor)
+#   Rᵢ(n) = Dᵢ                     (estação de atraso, c = ∞)
+#   X(n)  = n / (Z + ΣRᵢ(n)),   Qᵢ(n) = X(n) Rᵢ(n)
+# Estações com c > 1 usam a aproximação de Seidmann: uma fila de 1 servidor
+# com demanda D/c seguida de um atraso D(c-1)/c. Cada passo em n é vetorizado
+# sobre as estações, então o custo é O(N) operações NumPy de tamanho M.
+
+from queue_metrics.models import mmc_solve
+
+
+def _as_vector(np, values, size, name):
+    """Escalar ou sequência -> array de 'size' elementos."""
+    try:
+        return np.broadcast_to(np.asarray(values, dtype=float), (size,)).copy()
+    except ValueError:
+        raise ValueError(f"'{name}' deve ter {size} elementos.")
+
+
+def traffic_rates(external_rates, routing):
+    """Resolve as equações de tráfego (I - Pᵀ) λ = γ e devolve λ (array)."""
+    import numpy as np
+
+    gamma = np.asarray(external_rates, dtype=float)
+    P = np.asarray(routing, dtype=float)
+    m = gamma.size
+    if P.shape != (m, m):
+        raise ValueError(f"A matriz de roteamento deve ser {m}x{m}.")
+    if (P < 0).any() or (P.sum(axis=1) > 1 + 1e-9).any():
+        raise ValueError("Cada linha do roteamento deve ter probabilidades ≥ 0 com soma ≤ 1.")
+    try:
+        rates = np.linalg.solve(np.eye(m) - P.T, gamma)
+    except np.linalg.LinAlgError:
+        raise ValueError("Equações de tráfego sem solução: algum ciclo do roteamento não tem saída.")
+    return rates
+
+
+def jackson_network(external_rates, routing, mu, c=1):
+    """Resolve uma rede de Jackson aberta.
+
+    :param external_rates: Chegadas externas γᵢ em cada nó.
+    :param routing: Matriz P (lista de listas ou array) de roteamento entre nós.
+    :param mu: Taxa de serviço por servidor de cada nó (escalar ou lista).
+    :param c: Nº de servidores de cada nó (escalar ou lista).
+    :return: Dicionário com 'nodes' (resultado de mmc_solve de cada nó, mais
+             'lambda' e 'visits'), 'throughput' (Σγ), 'L', 'W' e 'stable'.
+    """
+    import numpy as np
+
+    rates = traffic_rates(external_rates, routing)
+    m = rates.size
+    mu = _as_vector(np, mu, m, "mu")
+    servers = _as_vector(np, c, m, "c").astype(int)
+    throughput = float(np.sum(external_rates))
+
+    nodes = []
+    for lambd, mu_i, c_i in zip(rates.tolist(), mu.tolist(), servers.tolist()):
+        res = mmc_solve(lambd, mu_i, c_i)
+        res["lambda"] = lambd
+        res["visits"] = lambd / throughput if throughput > 0 else 0.0
+        nodes.append(res)
+    stable = all(node["rho"] < 1 for node in nodes)
+    L = sum(node["L"] for node in nodes) if stable else float('inf')
+    return {"nodes": nodes, "throughput": throughput, "L": L,
+            "W": L / throughput if throughput > 0 else float('inf'), "stable": stable}
+
+
+def mva(population, visits, mu, c=1, think_time=0.0):
+    """MVA para uma rede fechada com 'population' clientes.
+
+    :param visits: Nº médio de visitas a cada estação por ciclo (vᵢ).
+    :param mu: Taxa de serviço por servidor de cada estação.
+    :param c: Servidores por estação; 0 ou None = estação de atraso (∞).
+    :param think_time: Tempo de reflexão Z (estação de atraso externa).
+    :return: Dicionário com 'throughput' (X do sistema), 'response_time'
+             (ΣRᵢ), 'cycle_time' (ΣRᵢ + Z), 'throughput_curve' (X(1..N)) e
+             'nodes' com, por estação: X (vazão), U (utilização por
+             servidor), L (nº médio), R (tempo de residência por ciclo) e
+             W (tempo por visita).
+    """
+    import numpy as np
+
+    if population < 0:
+        raise ValueError("A população deve ser ≥ 0.")
+    visits = np.asarray(visits, dtype=float)
+    m = visits.size
+    mu = _as_vector(np, mu, m, "mu")
+    servers = [c] * m if c is None or not hasattr(c, '__len__') else list(c)
+    if len(servers) != m:
+        raise ValueError(f"'c' deve ter {m} elementos.")
+    servers = np.array([0 if s is None else s for s in servers], dtype=float)
+    demand = visits / mu
+    delay = servers <= 0
+    multi = servers > 1
+    safe_c = np.where(delay, 1.0, servers)
+    queue_demand = np.where(delay, 0.0, demand / safe_c)             # parte com fila
+    fixed = np.where(delay, demand, np.where(multi, demand - queue_demand, 0.0))  # parte de atraso
+
+    queue = np.zeros(m)            # clientes na parte com fila de cada estação
+    R = fixed.copy()
+    X = 0.0
+    curve = np.zeros(population)
+    for n in range(1, population + 1):
+        R_queue = queue_demand * (1.0 + queue)
+        R = R_queue + fixed
+        X = n / (think_time + R.sum())
+        queue = X * R_queue
+        curve[n - 1] = X
+
+    L = X * R
+    nodes = []
+    for i in range(m):
+        busy = X * demand[i]
+        nodes.append({
+            "X": float(X * visits[i]),
+            "U": float(busy if delay[i] else busy / safe_c[i]),
+            "L": float(L[i]), "R": float(R[i]),
+            "W": float(R[i] / visits[i]) if visits[i] > 0 else 0.0,
+        })
+    response = float(R.sum()) if population else 0.0
+    return {"throughput": float(X), "response_time": response, "cycle_time": response + think_time,
+            "throughput_curve": curve, "nodes": nodes}
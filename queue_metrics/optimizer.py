@@ -0,0 +1,318 @@
+# Otimização conjunta das fórmulas personalizadas salvas.
+#
+# Cada fórmula passa por parse_expression (constantes dobradas, aritmética em
+# float). Em seguida as subexpressões repetidas, dentro de uma fórmula ou
+# entre fórmulas diferentes, como (lambd / mu) em várias fórmulas, viram
+# temporários '_t0', '_t1', ... que são calculados uma única vez por cenário
+# e reaproveitados por todas as fórmulas que os usam:
+#
+#   f1 = (lambd / mu) / (1 - lambd / mu)      _t0 = lambd / mu
+#   f2 = (1 - lambd / mu) * pow(lambd/mu, n)  _t1 = 1.0 - _t0
+#                                     ->      f1 = _t0 / _t1
+#                                             f2 = _t1 * pow(_t0, n)
+#
+# Os temporários são calculados sob demanda, na ordem em que foram definidos
+# (um temporário só depende de anteriores). Como as fórmulas não têm
+# curto-circuito (and/or/if não são permitidos), toda subexpressão de uma
+# fórmula é sempre avaliada, e calculá-la antes não muda o resultado. Um erro
+# num temporário (ex.: divisão por zero) é repassado a cada fórmula que o usa.
+#
+# Na avaliação escalar, os temporários e as fórmulas pedidas são reunidos numa
+# única expressão (uma tupla com atribuições ':=' para os temporários), então
+# cada cenário custa um único eval. Se essa avaliação falhar, cada fórmula é
+# refeita separadamente, para que o erro fique só na fórmula que o causou.
+#
+# Fórmulas que usam outras fórmulas pelo nome viram nós do mesmo grafo:
+# temporários e fórmulas são avaliados em ordem topológica e cada um é
+# calculado uma única vez por cenário, assim como as métricas do M/M/c
+# (rho, L, Wq, ...), resolvidas por um único mmc_solve quando alguma fórmula
+# as usa. Fórmulas num ciclo de referências, ou que dependem de uma fórmula
+# inválida, ficam em 'errors'.
+
+import ast
+import collections
+import functools
+
+from queue_metrics.formulas import (
+    DEFAULT_LIMITS, LIMIT_ERRORS, METRIC_NAMES, METRIC_OPTIONAL_PARAMS, METRIC_PARAMS,
+    eval_limited, find_cycle, formula_references, is_referenceable, limit_error,
+    metric_values, parse_expression,
+)
+
+# Combinações (fórmulas pedidas, parâmetros informados) compiladas mantidas por programa.
+MAX_PLANS = 64
+
+# Chave no escopo que marca as métricas já calculadas no cenário.
+_METRICS = "_metricas"
+
+# Nós que podem virar temporários (folhas, como nomes e constantes, não compensam).
+_HOISTABLE = (ast.BinOp, ast.UnaryOp, ast.Call, ast.Compare)
+
+
+def _key(node):
+    return ast.dump(node, annotate_fields=False)
+
+
+class _Hoister(ast.NodeTransformer):
+    """Troca as subexpressões repetidas por nomes de temporários (de cima para baixo)."""
+
+    def __init__(self, counts):
+        self.counts = counts
+        self.temps = {}     # chave -> nome
+        self.bodies = {}    # nome -> AST da expressão do temporário (na ordem de definição)
+
+    def visit(self, node):
+        if isinstance(node, _HOISTABLE) and self.counts[_key(node)] > 1:
+            key = _key(node)
+            if key not in self.temps:
+                body = self.generic_visit(node)   # subexpressões internas antes (ordem topológica)
+                name = f"_t{len(self.temps)}"
+                self.temps[key] = name
+                self.bodies[name] = body
+            return ast.Name(self.temps[key], ast.Load())
+        return self.generic_visit(node)
+
+
+class _Inliner(ast.NodeTransformer):
+    def __init__(self, bodies):
+        self.bodies = bodies
+
+    def visit_Name(self, node):
+        return self.visit(self.bodies[node.id]) if node.id in self.bodies else node
+
+
+def _names(node):
+    return {n.id for n in ast.walk(node) if isinstance(n, ast.Name)}
+
+
+class FormulaProgram:
+    """Fórmulas salvas compiladas em conjunto, com subexpressões compartilhadas.
+
+    :param formulas: Lista de dicionários com 'label', 'params' e 'expr'
+                     (o formato de custom_formulas.json).
+    """
+
+    def __init__(self, formulas):
+        self.formulas = list(formulas)
+        labels = collections.Counter(f["label"] for f in self.formulas)
+        # Nome de cada fórmula no escopo: o próprio label, se outras fórmulas podem usá-lo.
+        self.names = [f["label"] if is_referenceable(f["label"]) and labels[f["label"]] == 1 else f"_f{i}"
+                      for i, f in enumerate(self.formulas)]
+        index = {name: i for i, name in enumerate(self.names)}
+        references = formula_references(self.formulas)
+        refs = [[index[label] for label in references[f["label"]] if label in index] for f in self.formulas]
+        trees, self.errors = {}, {}
+        referable = tuple(sorted(index))
+        for i, formula in enumerate(self.formulas):
+            try:
+                trees[i] = parse_expression(formula["expr"], referable)
+            except ValueError as e:
+                self.errors[i] = e
+
+        # Fórmulas em ciclo e as que dependem (direta ou indiretamente) de uma fórmula com erro.
+        order = self._topological(range(len(self.formulas)), lambda i: refs[i])
+        cyclic = [i for i in range(len(self.formulas)) if i not in order]
+        if cyclic:
+            cycle = find_cycle({self.formulas[i]["label"]: [self.formulas[r]["label"] for r in refs[i]]
+                                for i in cyclic})
+            for i in cyclic:
+                self.errors[i] = ValueError(f"Referência circular entre fórmulas: {' -> '.join(cycle)}")
+        for i in order:
+            bad = [r for r in refs[i] if r in self.errors]
+            if bad and i not in self.errors:
+                self.errors[i] = ValueError(f"Depende da fórmula inválida '{self.formulas[bad[0]]['label']}'")
+        trees = {i: tree for i, tree in trees.items() if i not in self.errors}
+
+        counts = collections.Counter(_key(node) for tree in trees.values() for node in ast.walk(tree.body)
+                                     if isinstance(node, _HOISTABLE))
+        hoister = _Hoister(counts)
+        bodies = {i: hoister.visit(tree.body) for i, tree in trees.items()}
+
+        # Um temporário usado uma única vez (ex.: só dentro de outro temporário) volta a ser inline.
+        temps = hoister.bodies
+        uses = collections.Counter(n.id for body in list(bodies.values()) + list(temps.values())
+                                   for n in ast.walk(body) if isinstance(n, ast.Name) and n.id in temps)
+        inline = {name: body for name, body in temps.items() if uses[name] <= 1}
+        inliner = _Inliner(inline)
+        temps = {name: inliner.visit(body) for name, body in temps.items() if name not in inline}
+        bodies = {i: inliner.visit(body) for i, body in bodies.items()}
+        renamed = {old: f"_t{j}" for j, old in enumerate(temps)}
+        for node in ast.walk(ast.Module([*temps.values(), *bodies.values()], [])):
+            if isinstance(node, ast.Name) and node.id in renamed:
+                node.id = renamed[node.id]
+        temps = {renamed[name]: body for name, body in temps.items()}
+
+        compile_body = lambda body: compile(ast.fix_missing_locations(ast.Expression(body)), "<fórmula>", "eval")
+        self.temps = {name: compile_body(body) for name, body in temps.items()}
+        self.temp_exprs = {name: ast.unparse(body) for name, body in temps.items()}
+        self.codes = {i: compile_body(body) for i, body in bodies.items()}
+        self.exprs = {i: ast.unparse(body) for i, body in bodies.items()}
+        self._plans = {}
+
+        # Grafo único de temporários e fórmulas (pelo nome no escopo), em ordem topológica.
+        self._units = dict(temps)
+        self._units.update((self.names[i], body) for i, body in bodies.items())
+        self._unit_codes = dict(self.temps)
+        self._unit_codes.update((self.names[i], code) for i, code in self.codes.items())
+        direct = {name: _names(body) & self._units.keys() for name, body in self._units.items()}
+        self._order = self._topological(self._units, lambda name: direct[name])
+        closure, uses_metrics = {}, {}
+        for name in self._order:
+            closure[name] = set(direct[name]).union(*(closure[d] for d in direct[name]))
+            uses_metrics[name] = bool(_names(self._units[name]) & METRIC_NAMES.keys()) or \
+                any(uses_metrics[d] for d in direct[name])
+
+        # needs[i]: temporários e fórmulas de que a fórmula i depende, na ordem de avaliação.
+        self.needs, self.uses_metrics = {}, {}
+        for i in bodies:
+            name = self.names[i]
+            self.needs[i] = [unit for unit in self._order if unit in closure[name]]
+            self.uses_metrics[i] = uses_metrics[name]
+
+        # Parâmetros efetivos: os próprios, os das fórmulas usadas e os das métricas.
+        self.required, self.depends = [], []
+        for i, formula in enumerate(self.formulas):
+            required, depends = set(formula["params"]), set(formula["params"])
+            if self.uses_metrics.get(i):
+                required.update(METRIC_PARAMS)
+                depends.update(METRIC_PARAMS + METRIC_OPTIONAL_PARAMS)
+            self.required.append(required)
+            self.depends.append(depends)
+        for i in order:
+            for r in refs[i]:
+                self.required[i] |= self.required[r]
+                self.depends[i] |= self.depends[r]
+        self.required = [frozenset(p) for p in self.required]
+        self.depends = [frozenset(p) for p in self.depends]
+
+    @staticmethod
+    def _topological(nodes, edges):
+        """Nós em ordem topológica (dependências antes); os que estão num ciclo,
+        ou dependem de um, ficam de fora."""
+        nodes = list(nodes)
+        state, order = {}, []
+
+        def visit(node):
+            if node in state:
+                return state[node]
+            state[node] = False     # na pilha: um ciclo que volta aqui falha
+            ok = all([visit(dep) for dep in edges(node)])
+            state[node] = ok
+            if ok:
+                order.append(node)
+            return ok
+
+        for node in nodes:
+            visit(node)
+        return order
+
+    def _plan(self, indices, available):
+        """(fórmulas prontas, se usam métricas, code object de uma única tupla
+        (_t0 := ..., fórmula := ..., ..., fórmula_i, ...)).
+
+        Prontas são as fórmulas válidas cujos parâmetros estão em 'available'.
+        """
+        key = (indices, available)
+        if key not in self._plans:
+            if len(self._plans) >= MAX_PLANS:
+                self._plans.clear()
+            ready = tuple(i for i in indices if i not in self.errors and self.required[i] <= available)
+            needed = set().union(*(self.needs[i] for i in ready)) | {self.names[i] for i in ready}
+            elts = [ast.NamedExpr(ast.Name(name, ast.Store()), self._units[name])
+                    for name in self._order if name in needed]
+            elts += [ast.Name(self.names[i], ast.Load()) for i in ready]
+            tree = ast.fix_missing_locations(ast.Expression(ast.Tuple(elts, ast.Load())))
+            metrics = any(self.uses_metrics[i] for i in ready)
+            self._plans[key] = ready, metrics, compile(tree, "<fórmulas>", "eval")
+        return self._plans[key]
+
+    def iter_results(self, param_values, indices=None, limits=None, run=None, metrics=None):
+        """Gera (índice, resultado) para cada fórmula pedida; falhas saem como a exceção.
+
+        Fórmulas cujos parâmetros não foram fornecidos (incluindo os das fórmulas
+        e métricas que elas usam) recebem KeyError("Parâmetros Faltando"). Os
+        limites de avaliação valem para cada temporário e cada fórmula (no
+        caminho rápido, para o conjunto).
+
+        :param indices: Posições das fórmulas a avaliar (padrão: todas).
+        :param run: Avaliador run(code, scope) alternativo (ex.: sobre arrays NumPy);
+                    o padrão é eval_limited com 'limits' e parâmetros em float.
+        :param metrics: metrics(scope) -> {nome: valor} das métricas de METRIC_NAMES
+                        (padrão: metric_values, um mmc_solve por cenário).
+        """
+        limits = limits or DEFAULT_LIMITS
+        metrics = metrics or metric_values
+        indices = tuple(range(len(self.formulas))) if indices is None else tuple(indices)
+        fast = {}
+        if run is None:
+            scope = {key: float(value) for key, value in param_values.items()}
+            run = lambda code, scope: eval_limited(code, scope, limits)
+            ready, use_metrics, code = self._plan(indices, frozenset(param_values))
+            if ready:
+                try:
+                    if use_metrics:
+                        scope.update(metrics(scope))
+                    values = run(code, scope)[-len(ready):]
+                except Exception:
+                    # refaz fórmula a fórmula, para isolar o erro
+                    scope = {key: float(value) for key, value in param_values.items()}
+                else:
+                    if len(ready) == len(indices):
+                        yield from zip(ready, values)
+                        return
+                    fast = dict(zip(ready, values))
+        else:
+            scope = dict(param_values)
+        failed = {}
+
+        def compute(name):
+            if name in failed:
+                raise failed[name]
+            if name not in scope:
+                try:
+                    if name == _METRICS:
+                        scope.update(metrics(scope))
+                        scope[name] = True
+                    else:
+                        scope[name] = run(self._unit_codes[name], scope)
+                except Exception as e:
+                    failed[name] = e
+                    raise
+            return scope[name]
+
+        for i in indices:
+            if i in fast:
+                yield i, fast[i]
+                continue
+            formula = self.formulas[i]
+            if not self.required[i] <= param_values.keys():
+                yield i, KeyError("Parâmetros Faltando")
+                continue
+            if i in self.errors:
+                yield i, self.errors[i]
+                continue
+            try:
+                if self.uses_metrics[i]:
+                    compute(_METRICS)
+                for name in self.needs[i]:
+                    compute(name)
+                result = compute(self.names[i])
+            except LIMIT_ERRORS as e:
+                result = limit_error(formula["label"], e)
+            except Exception as e:
+                result = e
+            yield i, result
+
+    def evaluate(self, param_values, indices=None, limits=None):
+        """{índice: resultado ou exceção} das fórmulas pedidas (ver iter_results)."""
+        return dict(self.iter_results(param_values, indices, limits))
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_program(key):
+    return FormulaProgram([{"label": label, "params": list(params), "expr": expr} for label, params, expr in key])
+
+
+def program_for(formulas):
+    """FormulaProgram das fórmulas, reaproveitado enquanto elas não mudarem."""
+    return _cached_program(tuple((f["label"], tuple(f["params"]), f["expr"]) for f in formulas))
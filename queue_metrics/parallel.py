@@ -0,0 +1,129 @@
+# Execução paralela de varreduras de cenários em vários processos.
+#
+# Os cenários são agrupados em blocos ("chunks") e cada bloco vira uma única
+# tarefa do ProcessPoolExecutor, para que o custo de serialização (IPC) seja
+# pago por bloco e não por cenário. O tamanho do bloco se ajusta sozinho para
+# que cada tarefa dure cerca de TARGET_TASK_SECONDS. Os resultados saem na
+# mesma ordem da entrada e no máximo 'max_pending' blocos ficam em trânsito,
+# então a memória não cresce com o tamanho da varredura.
+#
+# Estado que vive em cada processo (ex.: o cache de resultados) não é visível
+# no processo principal; com 'counters', cada bloco devolve quanto os
+# contadores do worker mudaram e o SweepStats soma esses deltas.
+
+import collections
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+TARGET_TASK_SECONDS = 0.05
+MIN_CHUNKSIZE = 16
+MAX_CHUNKSIZE = 65536
+
+
+def _run_chunk(func, chunk, counters=None):
+    """Executado no processo filho: avalia um bloco e mede o tempo gasto
+    (e a variação dos contadores de 'counters()', se dado)."""
+    before = counters() if counters else {}
+    start = time.perf_counter()
+    results = [func(item) for item in chunk]
+    elapsed = time.perf_counter() - start
+    delta = {key: value - before.get(key, 0) for key, value in counters().items()} if counters else {}
+    return os.getpid(), elapsed, results, delta
+
+
+class SweepStats:
+    """Contadores por processo: cenários avaliados e tempo ocupado, mais a
+    soma dos contadores dos workers ('counters' de parallel_map)."""
+
+    def __init__(self):
+        self.items = collections.Counter()
+        self.busy_seconds = collections.Counter()
+        self.counters = collections.Counter()
+        self.chunks = 0
+        self.wall_seconds = 0.0
+
+    def record(self, pid, elapsed, count, counters=None):
+        self.items[pid] += count
+        self.busy_seconds[pid] += elapsed
+        self.counters.update(counters or {})
+        self.chunks += 1
+
+    @property
+    def total_items(self):
+        return sum(self.items.values())
+
+    def per_worker(self):
+        """Lista de (pid, cenários, cenários/s ocupado) por processo."""
+        rows = []
+        for pid, count in sorted(self.items.items()):
+            busy = self.busy_seconds[pid]
+            rows.append((pid, count, count / busy if busy > 0 else float('inf')))
+        return rows
+
+    def summary(self):
+        lines = [f"{self.total_items} cenário(s) em {self.chunks} bloco(s), "
+                 f"{self.wall_seconds:.3f} s de parede"]
+        for pid, count, rate in self.per_worker():
+            lines.append(f"  worker {pid}: {count} cenário(s), {rate:,.0f} cenários/s")
+        return "\n".join(lines)
+
+
+def _chunks(items, next_size):
+    """Agrupa 'items' em listas; o tamanho de cada bloco é pedido a 'next_size()'."""
+    chunk = []
+    size = next_size()
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+            size = next_size()
+    if chunk:
+        yield chunk
+
+
+def parallel_map(func, items, workers=None, chunksize=None, stats=None, max_pending=None,
+                 counters=None):
+    """Aplica 'func' a cada item em vários processos, preservando a ordem.
+
+    :param func: Função de nível de módulo (precisa ser serializável por pickle).
+    :param items: Iterável de entradas; é consumido aos poucos.
+    :param workers: Nº de processos (padrão: os.cpu_count()).
+    :param chunksize: Tamanho fixo do bloco. Se None, é ajustado automaticamente.
+    :param stats: SweepStats opcional, preenchido durante a execução.
+    :param max_pending: Máximo de blocos em trânsito (padrão: 4 por worker).
+    :param counters: Função de nível de módulo que devolve os contadores do
+                     processo ({nome: número}); a variação em cada bloco é
+                     somada em stats.counters.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or 4 * workers
+    stats = stats if stats is not None else SweepStats()
+    adaptive = chunksize is None
+    state = {"size": chunksize or MIN_CHUNKSIZE}
+
+    def next_size():
+        return state["size"]
+
+    def tune(elapsed, count):
+        if adaptive and elapsed > 0:
+            per_item = elapsed / count
+            wanted = int(TARGET_TASK_SECONDS / per_item)
+            state["size"] = max(MIN_CHUNKSIZE, min(MAX_CHUNKSIZE, wanted))
+
+    start = time.perf_counter()
+    pending = collections.deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk in _chunks(items, next_size):
+            pending.append(pool.submit(_run_chunk, func, chunk, counters))
+            while len(pending) >= max_pending:
+                pid, elapsed, results, delta = pending.popleft().result()
+                stats.record(pid, elapsed, len(results), delta)
+                tune(elapsed, len(results))
+                yield from results
+        while pending:
+            pid, elapsed, results, delta = pending.popleft().result()
+            stats.record(pid, elapsed, len(results), delta)
+            yield from results
+    stats.wall_seconds = time.perf_counter() - start
@@ -0,0 +1,120 @@
+# Taxa de chegada variável no tempo: avaliação por intervalo (SIPP).
+#
+# No método SIPP ("stationary independent period by period") cada intervalo
+# (ex.: 15 min) é tratado como um sistema estacionário independente, com o λ
+# (e, se informado, o c) daquele intervalo. A série é consumida em blocos de
+# 'block' intervalos: cada bloco vira uma única chamada vetorizada de
+# queue_metrics.batch e os resultados são devolvidos um a um, então a memória
+# não depende do tamanho da série. Modelos sem versão vetorizada são
+# resolvidos intervalo a intervalo com solve_model.
+#
+# Um intervalo inválido (λ negativo ou não numérico, c < 1) ou que o modelo
+# rejeita não interrompe a série: o registro dele sai com a mensagem na
+# coluna 'error' e sem métricas.
+
+import itertools
+import math
+import numbers
+
+from queue_metrics.models import MODELS_CONFIG, solve_model
+
+DEFAULT_BLOCK = 8192
+
+
+def _blocks(lambdas, servers, block):
+    """Agrupa a série em listas de (λ, c); c é None quando não há série de servidores."""
+    pairs = zip(lambdas, servers) if servers is not None else ((lambd, None) for lambd in lambdas)
+    while True:
+        chunk = list(itertools.islice(pairs, block))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _interval_error(lambd, c):
+    """Mensagem de erro do intervalo, ou None se λ e c são válidos.
+
+    Aceita escalares NumPy (numbers.Real / numbers.Integral), mas não bool.
+    """
+    if (not isinstance(lambd, numbers.Real) or isinstance(lambd, bool)
+            or not math.isfinite(lambd) or lambd < 0):
+        return f"λ inválido: {lambd!r}"
+    if c is not None and (not isinstance(c, numbers.Integral) or isinstance(c, bool) or c < 1):
+        return f"Nº de servidores inválido: {c!r}"
+    return None
+
+
+def _solve_block_scalar(model_key, chunk, params):
+    results = []
+    for lambd, c in chunk:
+        values = dict(params, **{"lambda": lambd})
+        if c is not None:
+            values["c"] = c
+        try:
+            results.append(solve_model(model_key, values))
+        except Exception as e:
+            results.append(e)
+    return results
+
+
+def _solve_block(model_key, chunk, params):
+    """Resolve um bloco e devolve, por intervalo, o dicionário de métricas ou a exceção."""
+    try:
+        from queue_metrics.batch import BATCH_SOLVERS, solve_batch
+    except ImportError:  # sem numpy: avalia intervalo a intervalo
+        BATCH_SOLVERS = {}
+    if model_key not in BATCH_SOLVERS:
+        return _solve_block_scalar(model_key, chunk, params)
+    import numpy as np
+    values = dict(params)
+    values["lambda"] = np.array([lambd for lambd, _ in chunk], dtype=float)
+    if chunk[0][1] is not None:
+        values["c"] = np.array([c for _, c in chunk], dtype=np.int64)
+    try:
+        res = solve_batch(model_key, values)
+    except Exception:  # isola o intervalo que falhou
+        return _solve_block_scalar(model_key, chunk, params)
+    size = len(chunk)
+    keys = list(res)
+    columns = [np.broadcast_to(res[key], (size,)).tolist() for key in keys]
+    return [dict(zip(keys, row)) for row in zip(*columns)]
+
+
+def evaluate_periods(model_key, lambdas, params, servers=None, block=DEFAULT_BLOCK):
+    """Avalia o modelo em cada intervalo de uma série de λ, em fluxo.
+
+    :param model_key: Modelo de MODELS_CONFIG (ex.: "M/M/c").
+    :param lambdas: Iterável com o λ de cada intervalo (pode ser um gerador).
+    :param params: Parâmetros fixos do modelo (mu e, conforme o modelo, c, k, ca, cs).
+    :param servers: Iterável opcional com o c de cada intervalo; substitui params["c"].
+    :param block: Intervalos avaliados por chamada vetorizada.
+    :return: Gerador de dicionários {"period": índice, "lambda", ["c",] métricas...,
+             "error"}; 'error' é "" ou a mensagem do intervalo (sem métricas).
+    """
+    config = MODELS_CONFIG.get(model_key)
+    if config is None or "solver" not in config:
+        raise ValueError(f"Modelo desconhecido: '{model_key}'")
+    needed = set(config["params"]) - {"lambda"} - ({"c"} if servers is not None else set())
+    missing = sorted(needed - set(params))
+    if missing:
+        raise ValueError(f"Parâmetros obrigatórios faltando: {', '.join(missing)}")
+
+    index = 0
+    for chunk in _blocks(lambdas, servers, block):
+        errors = [_interval_error(lambd, c) for lambd, c in chunk]
+        valid = [pair for pair, error in zip(chunk, errors) if error is None]
+        results = iter(_solve_block(model_key, valid, params) if valid else [])
+        for (lambd, c), error in zip(chunk, errors):
+            # Válidos saem como float/int do Python (ex.: para json.dumps com entrada NumPy).
+            record = {"period": index, "lambda": lambd if error else float(lambd)}
+            if c is not None:
+                record["c"] = c if error else int(c)
+            if error is None:
+                res = next(results)
+                if isinstance(res, Exception):
+                    error = str(res)
+                else:
+                    record.update(res)
+            record["error"] = error or ""
+            yield record
+            index += 1
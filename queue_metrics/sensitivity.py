@@ -0,0 +1,69 @@
+# Sensibilidades (derivadas) das métricas dos modelos.
+#
+# Parâmetros contínuos (λ, μ e, nos modelos G, ca e cs) são semeados como
+# números duais (queue_metrics.dual) e o solver do modelo roda uma única vez:
+# cada métrica sai com o valor e as derivadas exatas (modo direto), sem o
+# ruído de diferenças finitas perto de ρ → 1. Parâmetros inteiros (c, K)
+# usam diferença finita para frente: Δ = métrica(c + 1) - métrica(c), o ganho
+# de um servidor (ou vaga) a mais.
+
+import math
+
+from queue_metrics.dual import Dual, gradient, value
+from queue_metrics.models import MODELS_CONFIG, solve_model
+
+CONTINUOUS_PARAMS = ("lambda", "mu", "ca", "cs")
+DISCRETE_PARAMS = ("c", "k")
+
+
+def _finite(x):
+    return isinstance(x, (int, float)) and math.isfinite(x)
+
+
+def solve_with_gradients(model_key, param_values, wrt=None):
+    """Resolve o modelo e devolve valores e derivadas de todas as métricas.
+
+    :param param_values: Mesmas chaves da GUI (lambda, mu, c, k, n, ca, cs).
+    :param wrt: Parâmetros a derivar (padrão: todos os do modelo, contínuos
+                por derivação automática e c/k por diferença finita).
+    :return: {"values": {métrica: valor}, "d_lambda": {métrica: ∂/∂λ},
+             "d_mu": {...}, "d_c": {métrica: Δ com c + 1}, ...}. Derivadas
+             de métricas infinitas (sistema instável) saem como NaN.
+    """
+    config = MODELS_CONFIG.get(model_key)
+    if config is None or "solver" not in config:
+        raise ValueError(f"Modelo desconhecido: '{model_key}'")
+    model_params = list(config["params"])
+    wrt = model_params if wrt is None else list(wrt)
+    unknown = [p for p in wrt if p not in model_params]
+    if unknown:
+        raise ValueError(f"O modelo {model_key} não tem o(s) parâmetro(s): {', '.join(unknown)}")
+
+    continuous = [p for p in wrt if p in CONTINUOUS_PARAMS]
+    discrete = [p for p in wrt if p in DISCRETE_PARAMS]
+
+    values = dict(param_values)
+    for name, seeded in zip(continuous, Dual.variables([float(param_values[p]) for p in continuous])):
+        values[name] = seeded
+    res = solve_model(model_key, values)
+
+    out = {"values": {key: value(v) for key, v in res.items()}}
+    size = len(continuous)
+    for i, name in enumerate(continuous):
+        out[f"d_{name}"] = {
+            key: gradient(v, size)[i] if _finite(value(v)) else math.nan
+            for key, v in res.items()
+        }
+    for name in discrete:
+        stepped_values = dict(param_values, **{name: int(param_values[name]) + 1})
+        if name == "c" and "k" in model_params and stepped_values["c"] > int(stepped_values["k"]):
+            # c + 1 servidores não cabem na capacidade K: não há passo a medir.
+            out[f"d_{name}"] = {key: math.nan for key in out["values"]}
+            continue
+        stepped = solve_model(model_key, stepped_values)
+        out[f"d_{name}"] = {
+            key: stepped[key] - out["values"][key]
+            if _finite(stepped.get(key)) and _finite(out["values"][key]) else math.nan
+            for key in out["values"]
+        }
+    return out
@@ -0,0 +1,192 @@
+# Simulação de eventos discretos dos modelos de MODELS_CONFIG, para validar
+# os resultados analíticos e estimar L, Lq, W e Wq com intervalo de confiança.
+#
+# Os tempos entre chegadas e de serviço de cada replicação são sorteados de uma
+# vez em arrays pré-alocados (NumPy), com um fluxo de números aleatórios
+# independente por replicação (SeedSequence.spawn), então o resultado depende
+# só da semente, não do nº de processos. A disciplina é sempre FIFO:
+#   1 servidor, sem limite : recursão de Lindley vetorizada
+#                            Wq(n+1) = max(0, Wq(n) + S(n) - A(n+1))
+#   c servidores e/ou K    : heap com os instantes de término de cada servidor
+#                            (o próximo evento de saída) e, com capacidade K,
+#                            uma deque com os inícios de quem ainda está na fila
+#   ∞ servidores           : ninguém espera, W = S
+# As médias temporais (L, Lq) saem pela Lei de Little sobre a janela observada.
+# Depois do aquecimento ('warmup', fração inicial descartada), cada replicação
+# gera uma observação e o IC usa a distribuição t entre replicações.
+
+import collections
+import heapq
+import math
+
+import numpy as np
+
+from queue_metrics.models import MODELS_CONFIG
+
+SIM_METRICS = ("L", "Lq", "W", "Wq", "utilization", "pk")
+
+# Quantis t(0,975; gl) para o IC de 95% (gl > 30: aproximação normal).
+_T_975 = (12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+          2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+          2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042)
+
+
+def _t_quantile(df):
+    return _T_975[df - 1] if df <= len(_T_975) else 1.960
+
+
+def _sim_plan(model_key, param_values):
+    """Traduz o modelo em (λ, μ, c, K, ca, cs); c = None significa ∞ servidores."""
+    if model_key not in MODELS_CONFIG or "solver" not in MODELS_CONFIG[model_key]:
+        raise ValueError(f"Simulação não disponível para o modelo '{model_key}'.")
+    lambd, mu = float(param_values["lambda"]), float(param_values["mu"])
+    c = int(param_values.get("c", 1))
+    k = None
+    ca = float(param_values.get("ca", 1.0))
+    cs = float(param_values.get("cs", 1.0))
+    if model_key == "M/M/∞":
+        c = None
+    elif model_key == "M/M/1/K":
+        k = int(param_values["k"])
+    elif model_key == "M/M/c/K":
+        k = int(param_values["k"])
+    elif model_key == "M/M/c/c (Erlang B)":
+        k = c
+    elif model_key == "M/D/1":
+        cs = 0.0
+    if model_key.startswith("M/"):
+        ca = 1.0
+    if c is not None and c < 1:
+        raise ValueError("O número de servidores c deve ser ≥ 1.")
+    return lambd, mu, c, k, ca, cs
+
+
+def _draw(rng, mean, cv, size):
+    """Amostras com média e coeficiente de variação dados.
+
+    cv = 1: exponencial; cv = 0: constante; demais: gama com forma 1/cv².
+    """
+    if cv == 1.0:
+        return rng.exponential(mean, size)
+    if cv == 0.0:
+        return np.full(size, mean)
+    shape = 1.0 / (cv * cv)
+    return rng.gamma(shape, mean / shape, size)
+
+
+def _lindley(arrivals, services):
+    """Esperas na fila de um servidor FIFO sem limite, sem laço em Python.
+
+    Com X(n) = Σ_{i<n} (S(i) - A(i+1)), X(0) = 0, a recursão de Lindley tem
+    solução Wq(n) = X(n) - min_{j≤n} X(j).
+    """
+    x = np.empty_like(services)
+    x[0] = 0.0
+    np.cumsum(services[:-1] - np.diff(arrivals), out=x[1:])
+    return x - np.minimum.accumulate(x)
+
+
+def _multi_server(arrivals, services, c, k):
+    """Esperas com c servidores FIFO e capacidade K (None = sem limite).
+
+    Devolve (esperas, aceitos); clientes bloqueados têm espera NaN. Em FIFO os
+    inícios de atendimento são crescentes, então quem ainda espera na fila é
+    o fim de uma deque de inícios; o sistema está cheio quando todos os
+    servidores estão ocupados e há K - c clientes nessa deque.
+    """
+    free = [0.0] * c                      # término de cada servidor (heap)
+    heapreplace = heapq.heapreplace
+    queued = collections.deque()          # inícios ainda no futuro (fila)
+    popleft, push = queued.popleft, queued.append
+    room = math.inf if k is None else k - c
+    nan = math.nan
+    waits = []
+    record = waits.append
+    for t, s in zip(arrivals.tolist(), services.tolist()):
+        while queued and queued[0] <= t:
+            popleft()
+        f = free[0]
+        if f > t:
+            if len(queued) >= room:
+                record(nan)
+                continue
+            heapreplace(free, f + s)
+            push(f)
+            record(f - t)
+        else:
+            heapreplace(free, t + s)
+            record(0.0)
+    waits = np.array(waits)
+    return waits, ~np.isnan(waits)
+
+
+def _run_replication(task):
+    """Uma replicação (função de módulo, para rodar em outros processos)."""
+    model_key, param_values, customers, warmup, seed = task
+    lambd, mu, c, k, ca, cs = _sim_plan(model_key, param_values)
+    rng = np.random.default_rng(seed)
+    arrivals = np.cumsum(_draw(rng, 1.0 / lambd, ca, customers))
+    services = _draw(rng, 1.0 / mu, cs, customers)
+
+    if c is None:
+        waits, accepted = np.zeros(customers), np.ones(customers, dtype=bool)
+    elif c == 1 and k is None:
+        waits, accepted = _lindley(arrivals, services), np.ones(customers, dtype=bool)
+    else:
+        waits, accepted = _multi_server(arrivals, services, c, k)
+
+    first = int(warmup * customers)
+    span = arrivals[-1] - arrivals[first]
+    waits, services, accepted = waits[first:], services[first:], accepted[first:]
+    offered = len(accepted)
+    waits, services = waits[accepted], services[accepted]
+    sum_wq = float(np.sum(waits))
+    sum_w = sum_wq + float(np.sum(services))
+    served = len(waits)
+    return {
+        "L": sum_w / span, "Lq": sum_wq / span,
+        "W": sum_w / served if served else math.nan,
+        "Wq": sum_wq / served if served else math.nan,
+        "utilization": float(np.sum(services)) / span / (c if c else 1),
+        "pk": 1.0 - served / offered,
+    }
+
+
+def simulate(model_key, param_values, customers=1_000_000, replications=10,
+             warmup=0.1, seed=None, workers=1):
+    """Simula um modelo de MODELS_CONFIG e devolve médias com IC de 95%.
+
+    :param param_values: Mesmas chaves da GUI (lambda, mu, c, k, ca, cs).
+    :param customers: Clientes por replicação (incluindo o aquecimento).
+    :param replications: Nº de replicações independentes (≥ 2 para o IC).
+    :param warmup: Fração inicial de cada replicação descartada.
+    :param seed: Semente (int ou SeedSequence); None = entropia do sistema.
+    :param workers: Processos para as replicações (1 = no próprio processo).
+    :return: Dicionário com a média de cada métrica de SIM_METRICS e a meia
+             largura do IC em '<métrica>_ci' (ex.: 'Wq' e 'Wq_ci').
+             'utilization' é a carga efetivamente atendida por servidor
+             (para M/M/∞, o nº médio de servidores ocupados) e 'pk' a
+             fração de clientes bloqueados.
+    """
+    _sim_plan(model_key, param_values)  # valida antes de abrir processos
+    if customers < 2:
+        raise ValueError("São necessários ao menos 2 clientes por replicação.")
+    root = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    tasks = [(model_key, dict(param_values), customers, warmup, child)
+             for child in root.spawn(replications)]
+    if workers == 1:
+        runs = list(map(_run_replication, tasks))
+    else:
+        from queue_metrics.parallel import parallel_map
+        runs = list(parallel_map(_run_replication, tasks, workers=workers or None, chunksize=1))
+
+    result = {"replications": replications, "customers": customers}
+    for key in SIM_METRICS:
+        values = np.array([run[key] for run in runs])
+        mean = float(np.mean(values))
+        if replications > 1:
+            half = _t_quantile(replications - 1) * float(np.std(values, ddof=1)) / math.sqrt(replications)
+        else:
+            half = math.inf
+        result[key], result[f"{key}_ci"] = mean, half
+    return result
@@ -0,0 +1,102 @@
+# Dimensionamento (M/M/c): menor número de servidores c que atende a uma meta
+# de nível de serviço.
+#
+# As metas aceitas são (todas podem ser combinadas):
+#   max_prob_wait   -> C(c, a) ≤ valor        (prob. de esperar, Erlang C)
+#   max_wait        -> Wq ≤ valor             (tempo médio na fila)
+#   wait_time + max_prob_exceed
+#                   -> P(Wq > t) = C(c, a) * e^(-(cμ - λ)t) ≤ valor
+#
+# Todas as métricas decrescem com c, então basta subir c até a meta ser
+# atendida. Erlang B é atualizado incrementalmente (B(c) a partir de B(c-1)),
+# sem recalcular do zero para cada c testado.
+
+import math
+
+
+def _check_targets(max_wait, max_prob_wait, wait_time, max_prob_exceed):
+    if max_wait is None and max_prob_wait is None and max_prob_exceed is None:
+        raise ValueError("Informe ao menos uma meta: max_wait, max_prob_wait ou max_prob_exceed.")
+    if (wait_time is None) != (max_prob_exceed is None):
+        raise ValueError("'wait_time' e 'max_prob_exceed' devem ser informados juntos.")
+
+
+def _default_c_max(a):
+    return int(a + 20 * math.sqrt(a) + 100)
+
+
+def min_servers(lambd, mu, max_wait=None, max_prob_wait=None,
+                wait_time=None, max_prob_exceed=None, c_max=None):
+    """Menor c tal que o M/M/c com (λ, μ) atende a todas as metas informadas.
+
+    Devolve um dicionário com 'c' e as métricas nesse c (rho, erlang_c, Wq,
+    prob_exceed). Gera ValueError se nenhum c ≤ c_max atender às metas.
+    """
+    _check_targets(max_wait, max_prob_wait, wait_time, max_prob_exceed)
+    a = lambd / mu
+    c_max = c_max or _default_c_max(a)
+    b = 1.0
+    for c in range(1, c_max + 1):
+        b = a * b / (c + a * b)
+        if a >= c:
+            continue  # instável: nenhuma meta pode ser atendida
+        rho = a / c
+        erlang_c = b / (1 - rho * (1 - b))
+        wq = erlang_c / (c * mu - lambd)
+        if max_prob_wait is not None and erlang_c > max_prob_wait:
+            continue
+        if max_wait is not None and wq > max_wait:
+            continue
+        prob_exceed = None
+        if max_prob_exceed is not None:
+            prob_exceed = erlang_c * math.exp(-(c * mu - lambd) * wait_time)
+            if prob_exceed > max_prob_exceed:
+                continue
+        return {"c": c, "rho": rho, "erlang_c": erlang_c, "Wq": wq, "prob_exceed": prob_exceed}
+    raise ValueError(f"Nenhum c ≤ {c_max} atende às metas (a = λ/μ = {a:.6g}).")
+
+
+def min_servers_series(lambdas, mu, **targets):
+    """Aplica min_servers a cada λ de uma série (ex.: intervalos de 15 min), em fluxo."""
+    for lambd in lambdas:
+        if lambd <= 0:
+            yield {"c": 0, "rho": 0.0, "erlang_c": 0.0, "Wq": 0.0, "prob_exceed": 0.0}
+        else:
+            yield min_servers(lambd, mu, **targets)
+
+
+def min_servers_batch(lambdas, mu, max_wait=None, max_prob_wait=None,
+                      wait_time=None, max_prob_exceed=None, c_max=None):
+    """Versão NumPy de min_servers para muitos intervalos de uma vez.
+
+    Sobe c para todos os intervalos em paralelo; cada intervalo sai do laço
+    assim que sua meta é atendida. Devolve um array de c (0 quando λ = 0;
+    -1 quando nenhum c ≤ c_max atende).
+    """
+    import numpy as np
+
+    _check_targets(max_wait, max_prob_wait, wait_time, max_prob_exceed)
+    lambdas, mu = np.broadcast_arrays(np.asarray(lambdas, dtype=float), np.asarray(mu, dtype=float))
+    a = lambdas / mu
+    c_max = c_max or _default_c_max(float(a.max()) if a.size else 0.0)
+    result = np.where(a <= 0, 0, -1)
+    active = np.flatnonzero(a > 0)
+    b = np.ones(active.size)
+    for c in range(1, c_max + 1):
+        if active.size == 0:
+            break
+        a_act, lam_act, mu_act = a[active], lambdas[active], mu[active]
+        b = a_act * b / (c + a_act * b)
+        stable = a_act < c
+        with np.errstate(divide='ignore', invalid='ignore'):
+            erlang_c = b / (1 - (a_act / c) * (1 - b))
+            ok = stable.copy()
+            if max_prob_wait is not None:
+                ok &= erlang_c <= max_prob_wait
+            if max_wait is not None:
+                ok &= erlang_c / (c * mu_act - lam_act) <= max_wait
+            if max_prob_exceed is not None:
+                ok &= erlang_c * np.exp(-(c * mu_act - lam_act) * wait_time) <= max_prob_exceed
+        result[active[ok]] = c
+        active, b = active[~ok], b[~ok]
+    return result
@@ -0,0 +1,66 @@
+# Execução em segundo plano para a GUI (sem dependência de Tk).
+#
+# BackgroundTask roda uma função numa thread daemon e publica mensagens numa
+# queue.Queue: ("progress", fração, texto), ("done", resultado),
+# ("error", exceção) ou ("cancelled",). A GUI consome a fila com root.after,
+# já que só a thread principal pode mexer nos widgets do Tk.
+#
+# A função recebe a própria tarefa como 1º argumento e chama
+# task.progress(fração, texto) entre as etapas (ex.: entre uma fórmula e
+# outra); se o usuário cancelou, progress() gera CancelledError e a função
+# termina ali. Uma única etapa longa não é interrompida: ao cancelar, a GUI
+# deixa de esperar por ela e o resultado, quando vier, é descartado.
+
+import queue
+import threading
+
+
+class CancelledError(Exception):
+    """A tarefa foi cancelada pelo usuário."""
+
+
+class BackgroundTask:
+    def __init__(self, func, *args):
+        self.messages = queue.Queue()
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(func, args), daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    @property
+    def running(self):
+        return self._thread.is_alive()
+
+    def progress(self, fraction, text=""):
+        """Publica o andamento (0 a 1); gera CancelledError se a tarefa foi cancelada."""
+        if self._cancel.is_set():
+            raise CancelledError()
+        self.messages.put(("progress", fraction, text))
+
+    def _run(self, func, args):
+        try:
+            result = func(self, *args)
+        except CancelledError:
+            self.messages.put(("cancelled",))
+        except Exception as e:
+            self.messages.put(("error", e))
+        else:
+            self.messages.put(("cancelled",) if self._cancel.is_set() else ("done", result))
+
+    def poll(self):
+        """Devolve as mensagens pendentes, sem bloquear."""
+        pending = []
+        while True:
+            try:
+                pending.append(self.messages.get_nowait())
+            except queue.Empty:
+                return pending
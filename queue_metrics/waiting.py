@@ -0,0 +1,151 @@
+# Distribuição do tempo de espera na fila (Wq) e percentis (p95, p99, ...).
+#
+#   M/M/1   : P(Wq > t) = ρ e^(-(μ - λ)t)
+#   M/M/c   : P(Wq > t) = C(c, a) e^(-(cμ - λ)t)
+#   M/M/1/K : P(Wq > t) = Σ_{n=1}^{K-1} πₙ P(Erlang(n, μ) > t),  πₙ = Pₙ / (1 - Pₖ)
+#             (clientes que entram; quem chega com n no sistema espera n serviços)
+#
+# As funções de M/M/1 e M/M/c recebem a prob. de esperar já calculada pelos
+# solvers (ρ ou Erlang C), para não recalculá-la, e têm percentis em forma
+# fechada. O percentil do M/M/1/K é obtido por Newton (com bisseção de
+# segurança) sobre a cauda, que é monótona; os pesos πₙ são montados uma única
+# vez para todos os percentis.
+
+import math
+
+from queue_metrics import dual
+
+WAIT_PERCENTILES = (0.95, 0.99)
+
+
+def percentile_key(p):
+    """Chave usada nos dicionários de resultado: 0.95 -> 'Wq_p95'."""
+    return f"Wq_p{round(p * 100):d}"
+
+
+# ----- Caudas exponenciais (M/M/1 e M/M/c) -----
+def exponential_wq_tail(prob_wait, rate, t):
+    """P(Wq > t) = P(esperar) * e^(-rate t), com rate = cμ - λ."""
+    if rate <= 0: return 1.0
+    return prob_wait * dual.exp(-rate * t)
+
+def exponential_wq_percentile(prob_wait, rate, p):
+    """Menor t com P(Wq ≤ t) ≥ p. É 0 quando P(esperar) ≤ 1 - p."""
+    if rate <= 0: return float('inf')
+    if prob_wait <= 1 - p: return 0.0
+    return dual.log(prob_wait / (1 - p)) / rate
+
+def mm1_wq_tail(lambd, mu, t):
+    return exponential_wq_tail(lambd / mu, mu - lambd, t)
+
+def mmc_wq_tail(lambd, mu, c, t, erlang_c):
+    return exponential_wq_tail(erlang_c, c * mu - lambd, t)
+
+
+# ----- M/M/1/K -----
+def _mm1k_arrival_weights(rho, k):
+    """R_j = Σ_{n=j+1}^{K-1} πₙ para j = 0..K-2.
+
+    πₙ = Pₙ / (1 - Pₖ) ∝ ρⁿ (n < K). Para ρ > 1 os pesos são escritos como
+    (1/ρ)^(K-1-n), para que nenhuma potência estoure.
+    """
+    if k < 2:
+        return []
+    if rho <= 1:
+        pn = [rho ** n for n in range(k)]
+    else:
+        r = 1.0 / rho
+        pn = [r ** (k - 1 - n) for n in range(k)]
+    norm = dual.fsum(pn)
+    weights = [0.0] * (k - 1)
+    acc = 0.0
+    for j in range(k - 2, -1, -1):
+        acc += pn[j + 1]
+        weights[j] = acc / norm
+    return weights
+
+def _mm1k_tail_and_density(weights, mu, t):
+    """(P(Wq > t), densidade de Wq em t) a partir dos pesos R_j.
+
+    P(Wq > t) = Σ_j Poisson(j; μt) R_j e f(t) = μ Σ_j Poisson(j; μt) π_{j+1},
+    com π_{j+1} = R_j - R_{j+1}. Só a janela onde o termo de Poisson não é
+    desprezível (μt ± 12√(μt)) é somada.
+    """
+    if not weights: return 0.0, 0.0
+    if t <= 0: return weights[0], mu * (weights[0] - (weights[1] if len(weights) > 1 else 0.0))
+    x = mu * t
+    xv = dual.value(x)
+    exp = dual.exp if isinstance(x, dual.Dual) or isinstance(weights[0], dual.Dual) else math.exp
+    lx = dual.log(x)
+    spread = 12 * math.sqrt(xv) + 12
+    last = len(weights) - 1
+    lo = max(0, int(xv - spread))
+    hi = min(last, int(xv + spread) + 1)
+    tail = dens = 0.0
+    for j in range(lo, hi + 1):
+        log_term = -x + j * lx - math.lgamma(j + 1)
+        if log_term > -745:
+            term = exp(log_term)
+            tail += term * weights[j]
+            dens += term * (weights[j] - (weights[j + 1] if j < last else 0.0))
+    return tail, mu * dens
+
+def mm1k_wq_tail(lambd, mu, k, t):
+    """P(Wq > t) para os clientes que entram no M/M/1/K."""
+    return _mm1k_tail_and_density(_mm1k_arrival_weights(lambd / mu, k), mu, t)[0]
+
+def mm1k_wq_percentiles(lambd, mu, k, ps=WAIT_PERCENTILES, tol=1e-10):
+    """Percentis de Wq no M/M/1/K (os pesos πₙ são calculados uma vez).
+
+    Newton sobre a cauda, protegido por um intervalo [lo, hi] que sempre
+    contém a raiz: se o passo de Newton sair do intervalo, usa-se bisseção.
+    """
+    if isinstance(lambd, dual.Dual) or isinstance(mu, dual.Dual):
+        # Derivada pelo teorema da função implícita: um passo de Newton com
+        # números duais a partir da raiz t* já calculada com floats.
+        weights = _mm1k_arrival_weights(lambd / mu, k)
+        out = []
+        for p, t in zip(ps, mm1k_wq_percentiles(dual.value(lambd), dual.value(mu), k, ps, tol)):
+            tail, dens = _mm1k_tail_and_density(weights, mu, t)
+            out.append(t + (tail - (1 - p)) / dual.value(dens) if t > 0 and dens > 0 else t)
+        return out
+    weights = _mm1k_arrival_weights(lambd / mu, k)
+    out = []
+    for p in ps:
+        target = 1 - p
+        if not weights or weights[0] <= target:
+            out.append(0.0)
+            continue
+        lo, hi = 0.0, max(k, 1) / mu
+        while _mm1k_tail_and_density(weights, mu, hi)[0] > target:
+            lo, hi = hi, hi * 2
+        t = 0.5 * (lo + hi)
+        for _ in range(100):
+            tail, dens = _mm1k_tail_and_density(weights, mu, t)
+            if tail > target: lo = t
+            else: hi = t
+            step = (tail - target) / dens if dens > 0 else 0.0
+            t_new = t + step
+            if not (lo < t_new < hi):
+                t_new = 0.5 * (lo + hi)
+            if abs(t_new - t) <= tol * max(1.0, t):
+                t = t_new
+                break
+            t = t_new
+        out.append(t)
+    return out
+
+
+# ----- Interface por modelo -----
+def wq_tail(model_key, param_values, t):
+    """P(Wq > t) para M/M/1, M/M/c ou M/M/1/K, reaproveitando o solver do modelo."""
+    from queue_metrics.models import solve_model
+    res = solve_model(model_key, param_values)
+    lambd, mu = param_values["lambda"], param_values["mu"]
+    if model_key == "M/M/1":
+        return exponential_wq_tail(res["rho"], mu - lambd, t)
+    if model_key == "M/M/c":
+        return exponential_wq_tail(res["erlang_c"], param_values["c"] * mu - lambd, t)
+    if model_key == "M/M/1/K":
+        return mm1k_wq_tail(lambd, mu, param_values["k"], t)
+    raise ValueError(f"Distribuição de espera não disponível para o modelo '{model_key}'.")